@@ -1,4 +1,5 @@
 import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,6 +12,80 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+
+def _to_asyncpg_url(url: str) -> str:
+    """
+    Derive the asyncpg URL from the psycopg2 one
+    
+    asyncpg names the libpq `sslmode` option `ssl` and has no `channel_binding`.
+    """
+    parts = urlsplit(url)
+    query = []
+    for key, value in parse_qsl(parts.query):
+        if key == "sslmode":
+            query.append(("ssl", value))
+        elif key != "channel_binding":
+            query.append((key, value))
+    
+    scheme = parts.scheme.split("+")[0] + "+asyncpg"
+    return urlunsplit((scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+# Async engine URL (asyncpg driver), used by the async routes
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    _to_asyncpg_url(DATABASE_URL) if DATABASE_URL else None
+)
+
+# Connection Pool Configuration (per engine, per worker process)
+# Keep WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW) x 2 engines under the server's connection limit
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds before a connection is replaced
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 3))  # seconds to wait for a connection before 503
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))  # statements slower than this are logged; 0 disables
+
+# Startup Prewarm Configuration
+# Each worker compiles skill matchers, loads numpy, opens DB connections and
+# reaches the embedding provider before /health reports it ready
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "true").lower() == "true"
+PREWARM_DB_CONNECTIONS = int(os.getenv("PREWARM_DB_CONNECTIONS", DB_POOL_SIZE))  # opened per engine; 0 skips
+PREWARM_EMBEDDING_REQUEST = os.getenv("PREWARM_EMBEDDING_REQUEST", "true").lower() == "true"  # one embedding call at startup
+
+# Audit Log Writer Configuration
+# Events are buffered in memory and written in batches off the request path
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 100))  # events per INSERT
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 1.0))  # max seconds an event waits
+AUDIT_MAX_BUFFER = int(os.getenv("AUDIT_MAX_BUFFER", 10000))  # beyond this, events go straight to the spool
+AUDIT_SPOOL_PATH = os.getenv("AUDIT_SPOOL_PATH", "audit_spool.jsonl")  # durable fallback, replayed by the writer thread
+AUDIT_REPLAY_BACKOFF = float(os.getenv("AUDIT_REPLAY_BACKOFF", 5.0))  # seconds before retrying a failed replay, doubling
+AUDIT_REPLAY_MAX_BACKOFF = float(os.getenv("AUDIT_REPLAY_MAX_BACKOFF", 300.0))  # cap on the replay retry delay
+AUDIT_REPLAY_MAX_ATTEMPTS = int(os.getenv("AUDIT_REPLAY_MAX_ATTEMPTS", 5))  # rejected batches then go to <spool>.dead
+
+# Audit Log Partitioning & Retention (monthly partitions on timestamp)
+AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", 2))  # created at startup
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", 12))  # older months are archived; 0 keeps all
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "audit_archive")  # <partition>.jsonl.zst files
+
+# PDF Report Configuration
+REPORT_BATCH_SIZE = int(os.getenv("REPORT_BATCH_SIZE", 25))  # candidates rendered per batch while streaming
+REPORT_MAX_CANDIDATES = int(os.getenv("REPORT_MAX_CANDIDATES", 1000))  # cap for one master report
+REPORT_STORAGE_DIR = os.getenv("REPORT_STORAGE_DIR", "report_artifacts")  # finished background report PDFs
+REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", 2))  # background reports rendered at once per process
+REPORT_JOB_STALE_SECONDS = int(os.getenv("REPORT_JOB_STALE_SECONDS", 3600))  # unfinished jobs older than this are not reused
+REPORT_FRAGMENT_DIR = os.getenv("REPORT_FRAGMENT_DIR", os.path.join(REPORT_STORAGE_DIR, "fragments"))  # cached candidate sections
+REPORT_FRAGMENT_CACHE_MB = int(os.getenv("REPORT_FRAGMENT_CACHE_MB", 500))  # least recently used pruned beyond this; 0 disables
+REPORT_CHART_RENDERER = os.getenv("REPORT_CHART_RENDERER", "vector").lower()  # vector (reportlab shapes) or matplotlib (PNG)
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", 0))  # matplotlib chart processes; 0 = one per CPU, 1 = in-process
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", 2000))  # rendered chart PNGs kept in memory (~15 KB each)
+
+# Admin & Profiling Configuration
+# Profiling is off (and its middleware not installed) unless ADMIN_TOKEN or PROFILE_SAMPLE_RATE is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # X-Admin-Token for /admin endpoints and X-Profile requests
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))  # fraction of requests profiled at random
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))  # stack sampling interval
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")  # collapsed-stack files, one per profiled request
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 200))  # oldest profiles removed beyond this
+
 # HuggingFace API Configuration
 HF_API_KEY = os.getenv("HF_API_KEY")
 
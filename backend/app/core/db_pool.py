@@ -0,0 +1,92 @@
+"""
+Instrumented connection pools
+
+Drop-in QueuePool subclasses that record how long checkouts wait, how many
+connections are in use, and how often the pool overflows or times out.
+Pools are sized from config so that WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+stays within the database connection limit; a short DB_POOL_TIMEOUT makes an
+exhausted pool fail fast instead of queueing requests indefinitely.
+"""
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Thread-safe counters for one pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def record_checkout(self, seconds: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> Dict:
+        """Counters plus the live state of `pool`"""
+        with self._lock:
+            average = self.checkout_seconds_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "pool": self.name,
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "checkout_ms_avg": round(average * 1000, 3),
+                "checkout_ms_max": round(self.checkout_seconds_max * 1000, 3),
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout; `stats` is shared by all instances of the class so it survives pool.recreate()"""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        overflow_before = self._overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        # _overflow counts up from -pool_size as connections are opened;
+        # only a new connection beyond pool_size is an overflow
+        overflowed = self._overflow > overflow_before and self._overflow > 0
+        self.stats.record_checkout(time.perf_counter() - start, overflowed)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    stats = PoolStats("sync")
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats("async")
+
+
+def pool_status(engine) -> Dict:
+    """Stats snapshot for an engine created with one of the instrumented pools"""
+    pool = engine.pool
+    return type(pool).stats.snapshot(pool)
@@ -0,0 +1,371 @@
+"""
+In-process metrics in the Prometheus text format
+
+Counters and histograms are plain Python objects updated under a per-metric
+lock, so recording a sample costs a dict lookup and a few additions. GET
+/metrics renders them, together with values read from the running services
+at scrape time (DB pools, audit writer, report jobs, caches). There is no
+agent or client library: any Prometheus-compatible scraper can read the page.
+
+Metrics are per worker process; the scraper sums them across workers.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast reads up to slow PDF reports
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (labels, value) pairs of one metric
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count, optionally split by labels"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}"
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, optionally split by labels"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager observing the seconds spent inside it"""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            return entry[2] if entry else 0
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items())
+        for key, (counts, total, count) in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(float(bound))})
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(labels)} {count}"
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one run into a histogram labelled by stage
+
+    Each lap(stage) records the time since the previous lap (or creation).
+    """
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.histogram.observe(now - self._last, stage=stage)
+        self._last = now
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered together by /metrics"""
+
+    def __init__(self):
+        self._metrics: List = []
+        # collector() -> [(name, type, documentation, samples)]
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, Samples]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, str, Samples]]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"[Metrics] Collector {collector.__name__} failed: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = Registry()
+
+HTTP_REQUESTS_TOTAL = registry.counter(
+    "http_requests_total", "HTTP requests handled, by method, route and status", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, by method and route", ("method", "route")
+)
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "pipeline_stage_duration_seconds",
+    "Time spent in each stage of an application evaluation "
+    "(parse, skills, embed, scoring, fraud, explain, persist, rank, audit)",
+    ("stage",)
+)
+EMBEDDING_REQUEST_SECONDS = registry.histogram(
+    "embedding_request_duration_seconds", "Embedding provider call latency, by outcome", ("outcome",)
+)
+EMBEDDING_ERRORS_TOTAL = registry.counter(
+    "embedding_errors_total", "Failed embedding provider calls"
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request, by route", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+)
+DB_SECONDS_PER_REQUEST = registry.histogram(
+    "db_time_per_request_seconds", "Time spent in SQL statements per HTTP request, by route", ("route",)
+)
+SLOW_QUERIES_TOTAL = registry.counter(
+    "db_slow_queries_total", "SQL statements slower than SLOW_QUERY_THRESHOLD_MS"
+)
+
+
+# ----------------------------------------------------------------------
+# HTTP middleware
+# ----------------------------------------------------------------------
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+_route_paths: Dict[Callable, str] = {}
+
+
+def route_template(scope) -> str:
+    """Path template of the route that handled the request, e.g. /candidate/{candidate_id}"""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    path = _route_paths.get(endpoint)
+    if path is None:
+        app = scope.get("app")
+        for route in getattr(app, "routes", ()):
+            _route_paths.setdefault(getattr(route, "endpoint", None), getattr(route, "path", UNMATCHED_ROUTE))
+        path = _route_paths.get(endpoint, UNMATCHED_ROUTE)
+    return path
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording the count and latency of every HTTP request
+
+    Labelled by route template rather than raw path, so ids in the URL do
+    not create a series each. Latency runs until the response has been sent,
+    which includes streamed bodies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = route_template(scope)
+            HTTP_REQUESTS_TOTAL.inc(method=scope["method"], route=route, status=status)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route)
+
+
+# ----------------------------------------------------------------------
+# Scrape-time collectors
+# ----------------------------------------------------------------------
+
+def _ratio(hits: float, misses: float) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def _collect_db_pools():
+    from ..database import async_engine, engine
+    from .db_pool import pool_status
+
+    pools = [pool_status(engine), pool_status(async_engine.sync_engine)]
+    connections = [
+        ({"pool": pool["pool"], "state": state}, pool[state]) for pool in pools for state in ("in_use", "idle", "overflow")
+    ]
+    return [
+        ("db_pool_size", "gauge", "Configured connections kept per pool",
+         [({"pool": pool["pool"]}, pool["size"]) for pool in pools]),
+        ("db_pool_connections", "gauge", "Pool connections by state", connections),
+        ("db_pool_checkouts_total", "counter", "Connection checkouts",
+         [({"pool": pool["pool"]}, pool["checkouts"]) for pool in pools]),
+        ("db_pool_checkout_wait_seconds_avg", "gauge", "Average wait for a connection",
+         [({"pool": pool["pool"]}, pool["checkout_ms_avg"] / 1000) for pool in pools]),
+        ("db_pool_checkout_wait_seconds_max", "gauge", "Longest wait for a connection",
+         [({"pool": pool["pool"]}, pool["checkout_ms_max"] / 1000) for pool in pools]),
+        ("db_pool_overflow_events_total", "counter", "Checkouts that opened an overflow connection",
+         [({"pool": pool["pool"]}, pool["overflow_events"]) for pool in pools]),
+        ("db_pool_timeouts_total", "counter", "Checkouts that timed out (answered 503)",
+         [({"pool": pool["pool"]}, pool["timeouts"]) for pool in pools]),
+    ]
+
+
+def _collect_queues():
+    from ..services.audit_writer import audit_writer
+    from ..services.report_jobs import report_job_runner
+
+    return [
+        ("audit_buffer_events", "gauge", "Audit events buffered and not yet written", [({}, audit_writer.pending())]),
+        ("audit_events_written_total", "counter", "Audit events written to the database",
+         [({}, audit_writer.events_written)]),
+        ("audit_events_spooled_total", "counter", "Audit events spooled to disk",
+         [({}, audit_writer.events_spooled)]),
+        ("report_jobs_in_flight", "gauge", "Background report jobs queued or running in this process",
+         [({}, report_job_runner.pending())]),
+    ]
+
+
+def _collect_caches():
+    from ..services.chart_renderer import chart_renderer
+    from ..services.report_fragments import fragment_cache
+
+    charts = chart_renderer.stats()
+    fragments = fragment_cache.stats()
+    # Every chart not served from the cache was rendered
+    counts = {
+        "chart": (charts["cache_hits"], charts["charts_rendered"]),
+        "report_fragment": (fragments["hits"], fragments["misses"]),
+    }
+    return [
+        ("cache_hits_total", "counter", "Cache lookups served from the cache",
+         [({"cache": cache}, hits) for cache, (hits, _) in counts.items()]),
+        ("cache_misses_total", "counter", "Cache lookups that had to compute the value",
+         [({"cache": cache}, misses) for cache, (_, misses) in counts.items()]),
+        ("cache_hit_ratio", "gauge", "Hits / lookups since the worker started",
+         [({"cache": cache}, _ratio(hits, misses)) for cache, (hits, misses) in counts.items()]),
+    ]
+
+
+registry.add_collector(_collect_db_pools)
+registry.add_collector(_collect_queues)
+registry.add_collector(_collect_caches)
+
+
+def render_metrics() -> str:
+    return registry.render()
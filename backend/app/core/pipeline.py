@@ -5,13 +5,17 @@ Integrates all evaluation components for comprehensive candidate assessment
 from ..services.scoring_engine import compute_all_scores
 from ..services.fraud_detection import comprehensive_fraud_analysis
 from ..services.decision_service import make_decision
-from ..services.explanation_agent import explain_decision
-from ..services.xai_explainability import generate_xai_explanation
+from ..services.explanation_agent import explanation_agent
+from ..services.explanation_context import build_explanation_context, expand_explanation
+from ..services.xai_explainability import render_xai_explanation
 from ..services.skill_gap_analysis import analyze_skill_gap, generate_skill_evidence_graph
 from ..services.audit_service import log_evaluation, log_fraud
+from ..services.candidate_summary_service import update_candidate_summary
 from ..models.application import Application
 from ..models.candidate import Candidate
+from .metrics import PIPELINE_STAGE_SECONDS, StageTimer
 from sqlalchemy import desc
+from sqlalchemy.orm import undefer
 import json
 
 
@@ -23,9 +27,10 @@ def run_pipeline(db, job, candidate):
     1. Compute all scores (RFS, DCS, ELC, Composite)
     2. Perform comprehensive fraud detection
     3. Make hiring decision
-    4. Generate explanation
-    5. Log audit trail
-    6. Store application
+    4. Generate explanation (shared context rendered into basic and XAI formats)
+    5. Store application
+    6. Update rankings
+    7. Log audit trail
     
     Args:
         db: Database session
@@ -38,7 +43,9 @@ def run_pipeline(db, job, candidate):
     
     # Step 1: Compute All Scores
     print(f"[Pipeline] Evaluating candidate {candidate.id} for job {job.id}")
+    stages = StageTimer(PIPELINE_STAGE_SECONDS)
     score_results = compute_all_scores(job, candidate)
+    stages.lap("scoring")
     
     rfs = score_results["rfs"]
     dcs = score_results["dcs"]
@@ -51,7 +58,10 @@ def run_pipeline(db, job, candidate):
     print(f"[Pipeline] Scores - RFS: {rfs:.2f}, DCS: {dcs:.2f}, ELC: {elc:.2f}, Composite: {composite:.2f}")
     
     # Step 2: Comprehensive Fraud Detection
-    existing = db.query(Candidate).filter(Candidate.id != candidate.id).all()
+    existing = db.query(Candidate).options(
+        undefer(Candidate.resume_embedding),
+        undefer(Candidate.resume_text)
+    ).filter(Candidate.id != candidate.id).all()
     
     fraud_analysis = comprehensive_fraud_analysis(
         candidate.resume_embedding,
@@ -68,6 +78,7 @@ def run_pipeline(db, job, candidate):
     # Log fraud if detected
     if fraud_flag:
         log_fraud(db, candidate.id, fraud_analysis)
+    stages.lap("fraud")
     
     # Step 3: Make Decision
     decision, decision_reason = make_decision(
@@ -78,21 +89,7 @@ def run_pipeline(db, job, candidate):
     
     print(f"[Pipeline] Decision: {decision} - {decision_reason}")
     
-    # Step 4: Generate Explanation
-    explanation = explain_decision(
-        decision,
-        {
-            "rfs": rfs,
-            "dcs": dcs,
-            "elc": elc,
-            "composite_score": composite
-        },
-        skill_match,
-        exp_details,
-        fraud_analysis
-    )
-    
-    # Step 4.5: Generate Skill Gap Analysis (now considers required vs nice-to-have!)
+    # Step 4: Generate Skill Gap Analysis (now considers required vs nice-to-have!)
     skill_gap = analyze_skill_gap(
         skill_match.get("matched_skills", []),
         skill_match.get("missing_skills", []),
@@ -102,8 +99,9 @@ def run_pipeline(db, job, candidate):
         skill_match  # Pass full skill_match details for enhanced analysis
     )
     
-    # Step 4.6: Generate XAI Explainability
-    xai_explanation = generate_xai_explanation(
+    # Step 4.5: Build the shared explanation context once; the basic and XAI
+    # explanations only render their own sections on top of it
+    explanation_context = build_explanation_context(
         decision,
         {
             "rfs": rfs,
@@ -117,8 +115,11 @@ def run_pipeline(db, job, candidate):
         fraud_analysis,
         skill_gap
     )
+    shared_explanation = explanation_context.to_dict()
+    basic_sections = explanation_agent.render(explanation_context)
+    xai_sections = render_xai_explanation(explanation_context)
     
-    # Step 4.7: Generate Skill Evidence Graph
+    # Step 4.6: Generate Skill Evidence Graph
     skill_graph = generate_skill_evidence_graph(
         skill_match.get("matched_skills", []),
         skill_match.get("missing_skills", []),
@@ -126,6 +127,7 @@ def run_pipeline(db, job, candidate):
         score_results.get("jd_skills", {}).get("technical_skills", []),
         score_results.get("resume_skills", {}).get("technical_skills", [])
     )
+    stages.lap("explain")
     
     # Step 5: Create Application Record
     application = Application(
@@ -141,8 +143,9 @@ def run_pipeline(db, job, candidate):
         decision=decision,
         decision_reason=decision_reason,
         explanation={
-            "basic_explanation": explanation,
-            "xai_explanation": xai_explanation,
+            "context": shared_explanation,
+            "basic_explanation": basic_sections,
+            "xai_explanation": xai_sections,
             "skill_gap_analysis": skill_gap,
             "skill_evidence_graph": skill_graph
         },
@@ -152,13 +155,20 @@ def run_pipeline(db, job, candidate):
     )
     
     db.add(application)
+    db.flush()
+    
+    # Keep the candidate's dashboard summary in step within the same transaction
+    update_candidate_summary(db, application)
+    
     db.commit()
     db.refresh(application)
+    stages.lap("persist")
     
     print(f"[Pipeline] Application {application.id} created")
     
     # Step 6: Update Rankings for this job
     update_application_rankings(db, job.id)
+    stages.lap("rank")
     print(f"[Pipeline] Rankings updated for job {job.id}")
     
     # Step 7: Log Audit Trail
@@ -177,8 +187,9 @@ def run_pipeline(db, job, candidate):
         fraud_analysis,
         decision,
         decision_reason,
-        explanation
+        explanation_agent.compose(shared_explanation, basic_sections)
     )
+    stages.lap("audit")
     
     print(f"[Pipeline] Evaluation complete for application {application.id}")
     
@@ -273,7 +284,7 @@ def get_application_details(db, application_id: int):
         "decision": {
             "final_decision": application.decision,
             "reason": application.decision_reason,
-            "explanation": application.explanation
+            "explanation": expand_explanation(application.explanation)
         }
     }
 
@@ -0,0 +1,146 @@
+"""
+Startup prewarm
+
+Work the first requests after a deploy would otherwise pay for runs when the
+worker starts, in a fixed order:
+
+1. skill_matchers      - compile the skill extraction patterns
+2. similarity          - import numpy and run one similarity computation
+3. db_pool             - open PREWARM_DB_CONNECTIONS connections on both engines
+4. embedding_provider  - create the HuggingFace client and, with
+                         PREWARM_EMBEDDING_REQUEST, send one embedding request
+
+The steps run in the background from the app lifespan so the server starts
+listening immediately. /health answers 503 until every step has finished, so
+load balancers only route traffic to warm workers. A step that fails is logged
+and reported but does not keep the worker out of rotation.
+"""
+import asyncio
+import inspect
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..config import PREWARM_DB_CONNECTIONS, PREWARM_EMBEDDING_REQUEST, PREWARM_ENABLED
+
+
+def _warm_skill_matchers():
+    from ..services.inference_engine import compile_skill_matchers
+    compile_skill_matchers()
+
+
+def _warm_similarity():
+    from ..utils.similarity import cosine_similarity
+    cosine_similarity([1.0, 0.0], [0.5, 0.5])
+
+
+def _warm_sync_pool():
+    from ..database import engine
+
+    connections = []
+    try:
+        for _ in range(min(PREWARM_DB_CONNECTIONS, engine.pool.size())):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()  # back to the pool, still open
+
+
+async def _warm_async_pool():
+    from ..database import async_engine
+
+    connections = []
+    try:
+        for _ in range(min(PREWARM_DB_CONNECTIONS, async_engine.pool.size())):
+            connections.append(await async_engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+async def _warm_db_pool():
+    await asyncio.to_thread(_warm_sync_pool)
+    await _warm_async_pool()
+
+
+def _warm_embedding_provider():
+    from ..services.embedding_service import warm_up
+    warm_up(send_request=PREWARM_EMBEDDING_REQUEST)
+
+
+DEFAULT_STEPS = [
+    ("skill_matchers", _warm_skill_matchers),
+    ("similarity", _warm_similarity),
+    ("db_pool", _warm_db_pool),
+    ("embedding_provider", _warm_embedding_provider),
+]
+
+
+class Prewarmer:
+    """Runs the prewarm steps once per worker and tracks readiness"""
+
+    def __init__(self, steps: List[Tuple[str, Callable]] = None, enabled: bool = PREWARM_ENABLED):
+        self.steps = list(DEFAULT_STEPS if steps is None else steps)
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.ready = not self.enabled
+        self.results: Dict[str, Dict] = {name: {"status": "pending"} for name, _ in self.steps}
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+
+    async def run(self):
+        """Run every step in order; steps that are plain functions run in a thread"""
+        if not self.enabled:
+            self.ready = True
+            return
+
+        self.started_at = time.perf_counter()
+        for name, step in self.steps:
+            self.results[name] = {"status": "running"}
+            start = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(step):
+                    await step()
+                else:
+                    await asyncio.to_thread(step)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.results[name] = {"status": "failed", "error": str(e)}
+                print(f"[Prewarm] {name} failed: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            self.results[name] = {"status": "done", "ms": round(elapsed * 1000, 1)}
+
+        self.seconds = time.perf_counter() - self.started_at
+        self.ready = True
+        failed = [name for name, result in self.results.items() if result["status"] == "failed"]
+        print(f"[Prewarm] Worker warm in {self.seconds:.2f}s" + (f" ({', '.join(failed)} failed)" if failed else ""))
+
+    def status(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "steps": self.results,
+        }
+
+
+# Global instance
+prewarmer = Prewarmer()
+
+
+def start_prewarm() -> asyncio.Task:
+    """Schedule the prewarm on the running event loop (called from the app lifespan)"""
+    prewarmer.reset()
+    return asyncio.create_task(prewarmer.run())
+
+
+async def stop_prewarm(task: asyncio.Task):
+    """Cancel a prewarm still in progress at shutdown"""
+    if not task.done():
+        task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,240 @@
+"""
+Request profiler
+
+Opt-in statistical profiling of single requests. While a profiled request
+runs, a background thread samples the Python stack of every busy thread
+every PROFILE_INTERVAL_MS (event loop and threadpool workers alike, so sync
+routes and run_in_threadpool work are covered). The samples are saved as a
+collapsed-stack file, one "frame;frame;frame count" line per distinct stack,
+which flamegraph.pl, speedscope and inferno read directly.
+
+A request is profiled when it carries `X-Profile: 1` with a valid
+`X-Admin-Token`, or at random with probability PROFILE_SAMPLE_RATE. When
+neither ADMIN_TOKEN nor a sample rate is configured the middleware is not
+installed at all. One request is profiled at a time per worker; other
+requests in flight show up in the samples too, so each profile records how
+many there were.
+
+Profiles are listed and downloaded through /admin/profiles.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..config import ADMIN_TOKEN, PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE
+from ..dependencies import valid_admin_token
+
+# Innermost frames of a thread with nothing to do (condition waits, idle event loop)
+IDLE_FRAMES = {("threading.py", "wait"), ("selectors.py", "select")}
+
+PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def profiling_enabled() -> bool:
+    return bool(ADMIN_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # Paths relative to the package or site-packages keep the labels short
+    for marker in ("/site-packages/", "/app/"):
+        index = filename.rfind(marker)
+        if index != -1:
+            filename = filename[index + 1:] if marker == "/app/" else filename[index + len(marker):]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename})"
+
+
+class StackSampler:
+    """Samples the stacks of all busy threads from a background thread"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=own)
+
+    def sample(self, skip: Optional[int] = None):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+
+class ProfileStore:
+    """Collapsed-stack files and their metadata in PROFILE_DIR"""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """Collapsed-stack file of a profile, or None if it does not exist"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.collapsed")
+        return path if os.path.exists(path) else None
+
+    def save(self, profile_id: str, stacks: Counter, meta: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        lines = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        self._write(f"{profile_id}.collapsed", lines)
+        self._write(f"{profile_id}.json", json.dumps({"profile_id": profile_id, **meta}))
+        self.prune()
+
+    def _write(self, name: str, content: str):
+        handle, partial = tempfile.mkstemp(dir=self.directory, suffix=".partial")
+        with os.fdopen(handle, "w") as output:
+            output.write(content)
+        os.replace(partial, os.path.join(self.directory, name))
+
+    def list(self) -> List[Dict]:
+        """Metadata of every stored profile, newest first"""
+        profiles = []
+        if not os.path.isdir(self.directory):
+            return profiles
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as meta:
+                    profiles.append(json.load(meta))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda profile: profile["started_at"], reverse=True)
+
+    def prune(self) -> int:
+        profiles = self.list()
+        for profile in profiles[self.max_files:]:
+            for suffix in (".collapsed", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, profile["profile_id"] + suffix))
+                except FileNotFoundError:
+                    pass
+        return max(len(profiles) - self.max_files, 0)
+
+
+# Global instance
+profile_store = ProfileStore()
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware profiling the requests selected by header or sample rate
+
+    Profiled responses carry an X-Profile-Id header naming the stored profile.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, store: ProfileStore = None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.store = store or profile_store
+        self._busy = threading.Lock()  # one profile at a time
+        self._in_flight = 0
+
+    def _wanted(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        requested = headers.get(b"x-profile", b"").strip() in (b"1", b"true")
+        if requested and valid_admin_token(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        try:
+            if not self._wanted(scope) or not self._busy.acquire(blocking=False):
+                await self.app(scope, receive, send)
+                return
+            try:
+                await self._profile(scope, receive, send)
+            finally:
+                self._busy.release()
+        finally:
+            self._in_flight -= 1
+
+    async def _profile(self, scope, receive, send):
+        profile_id = uuid.uuid4().hex
+        status = 500
+        most_in_flight = self._in_flight
+
+        async def send_with_id(message):
+            nonlocal status, most_in_flight
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            most_in_flight = max(most_in_flight, self._in_flight)
+            await send(message)
+
+        started_at = datetime.utcnow()
+        sampler = StackSampler()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Joining the sampler and writing files block, so both run off the event loop
+            stacks = await asyncio.to_thread(sampler.stop)
+            path = scope["path"] + (f"?{scope['query_string'].decode('latin-1')}" if scope.get("query_string") else "")
+            meta = {
+                "method": scope["method"],
+                "path": path,
+                "status": status,
+                "started_at": started_at.isoformat(),
+                "duration_ms": round(elapsed * 1000, 1),
+                "samples": sampler.samples,
+                "interval_ms": sampler.interval * 1000,
+                "concurrent_requests": most_in_flight - 1,
+            }
+            await asyncio.to_thread(self._save, profile_id, stacks, meta)
+
+    def _save(self, profile_id: str, stacks: Counter, meta: Dict):
+        try:
+            self.store.save(profile_id, stacks, meta)
+            print(f"[Profiler] {meta['method']} {meta['path']} profiled as {profile_id} "
+                  f"({meta['duration_ms']} ms, {meta['samples']} samples)")
+        except OSError as e:
+            print(f"[Profiler] Could not save profile {profile_id}: {e}")
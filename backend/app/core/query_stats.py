@@ -0,0 +1,125 @@
+"""
+Per-request database query statistics
+
+SQLAlchemy cursor events on both engines time every statement. Statements
+run while handling a request are added to that request's QueryStats, found
+through a context variable; it follows the request into threadpool workers
+(run_in_threadpool, sync routes and dependencies) and into the async
+engine's greenlets. QueryStatsMiddleware then reports the totals:
+
+- X-DB-Query-Count / X-DB-Time-Ms response headers. Statements run after the
+  headers were sent (streamed responses) are only in the metrics.
+- db_queries_per_request / db_time_per_request_seconds histograms per route,
+  which make N+1 query patterns visible on /metrics.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with the request
+that ran them. Only the parameter names and types are logged, never their
+values.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from ..config import SLOW_QUERY_THRESHOLD_MS
+from .metrics import DB_QUERIES_PER_REQUEST, DB_SECONDS_PER_REQUEST, SLOW_QUERIES_TOTAL, route_template
+
+# Longest statement text written to the slow query log
+MAX_LOGGED_STATEMENT = 2000
+
+
+class QueryStats:
+    """Statement count and total database time of one request"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()  # statements may run in several threads
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def redact_parameters(parameters, executemany: bool = False) -> str:
+    """Parameter names and types only, e.g. {'email_1': 'str'}"""
+    if not parameters:
+        return "none"
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return str({name: type(value).__name__ for name, value in parameters.items()})
+    return str([type(value).__name__ for value in parameters])
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(elapsed)
+
+    if SLOW_QUERY_THRESHOLD_MS > 0 and elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        SLOW_QUERIES_TOTAL.inc()
+        text = " ".join(statement.split())[:MAX_LOGGED_STATEMENT]
+        where = f" in {stats.label}" if stats is not None and stats.label else ""
+        print(f"[SQL] Slow query ({elapsed * 1000:.1f} ms){where}: {text} "
+              f"| parameters: {redact_parameters(parameters, executemany)}")
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    """Time every statement executed on a (sync) engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware collecting the query statistics of each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+        token = _current.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            route = route_template(scope)
+            DB_QUERIES_PER_REQUEST.observe(stats.count, route=route)
+            DB_SECONDS_PER_REQUEST.observe(stats.seconds, route=route)
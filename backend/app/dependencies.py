@@ -1,4 +1,10 @@
-from .database import SessionLocal
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from .config import ADMIN_TOKEN
+from .database import SessionLocal, AsyncSessionLocal
 
 def get_db():
     db = SessionLocal()
@@ -6,3 +12,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def valid_admin_token(token: Optional[str]) -> bool:
+    """True if token matches ADMIN_TOKEN; always False while ADMIN_TOKEN is unset"""
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not valid_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
@@ -1,17 +1,49 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .database import Base, engine
-from .routes import company_routes, job_routes, application_routes, candidate_routes, analytics_routes
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import exc as sa_exc
+from .config import DB_POOL_TIMEOUT
+from .core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from .core.prewarm import prewarmer, start_prewarm, stop_prewarm
+from .core.profiler import ProfilerMiddleware, profiling_enabled
+from .core.query_stats import QueryStatsMiddleware
+from .routes import company_routes, job_routes, application_routes, candidate_routes, analytics_routes, health_routes, admin_routes
+from .services.audit_partitions import ensure_partitions
+from .services.audit_writer import start_audit_writer, stop_audit_writer
+from .services.chart_renderer import shutdown_chart_renderer
+from .services.report_jobs import shutdown_report_jobs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run the audit writer for the lifetime of the worker and prewarm it in the background
+
+    Background reports finish and the audit buffer flushes on shutdown.
+    """
+    try:
+        ensure_partitions()
+    except Exception as e:
+        # Events still land in audit_logs_default until the partitions exist
+        print(f"[Audit] Could not create audit log partitions: {e}")
+    start_audit_writer()
+    prewarm = start_prewarm()
+    yield
+    await stop_prewarm(prewarm)
+    shutdown_report_jobs()
+    shutdown_chart_renderer()
+    stop_audit_writer()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Agentic AI Hiring Platform",
     description="AI-powered talent evaluation system with explainable decisions",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend integration
@@ -23,6 +55,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (X-Profile header or PROFILE_SAMPLE_RATE); not installed when off
+if profiling_enabled():
+    app.add_middleware(ProfilerMiddleware)
+
+# Per-request SQL statement count and time (X-DB-Query-Count / X-DB-Time-Ms)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request counts and latency per route, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(sa_exc.TimeoutError)
+async def pool_exhausted_handler(request: Request, exc: sa_exc.TimeoutError):
+    """Fail fast when no database connection frees up within DB_POOL_TIMEOUT"""
+    print(f"[Database] Connection pool exhausted on {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry shortly"},
+        headers={"Retry-After": str(max(1, int(DB_POOL_TIMEOUT)))}
+    )
+
 @app.get("/", tags=["Root"])
 async def root():
     """Welcome endpoint with API information"""
@@ -43,6 +95,7 @@ async def root():
             "documentation": "/docs",
             "alternative_docs": "/redoc",
             "health": "/health",
+            "metrics": "/metrics",
             "companies": "/company",
             "jobs": "/job",
             "applications": "/apply",
@@ -53,16 +106,30 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint for monitoring"""
+    """Health check endpoint for monitoring; 503 until the worker has finished prewarming"""
+    if not prewarmer.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "prewarm": prewarmer.status()},
+            headers={"Retry-After": "1"}
+        )
     return {
         "status": "healthy",
         "service": "Agentic AI Hiring Platform",
-        "version": "2.0.0"
+        "version": "2.0.0",
+        "prewarm": prewarmer.status()
     }
 
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus-style metrics of this worker: request latency, pipeline stages, embedding calls, caches, queues and DB pools"""
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 # Include routers
 app.include_router(company_routes.router)
 app.include_router(job_routes.router)
 app.include_router(application_routes.router)
 app.include_router(candidate_routes.router)
 app.include_router(analytics_routes.router)
+app.include_router(health_routes.router)
+app.include_router(admin_routes.router)
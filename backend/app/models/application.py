@@ -1,11 +1,34 @@
-from sqlalchemy import Column, Integer, Float, Boolean, String, Text, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Index, Integer, Float, Boolean, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from .application_detail import ApplicationDetail
+
+
+def _detail_field(name):
+    """Expose an ApplicationDetail payload as a plain attribute of Application"""
+    def getter(self):
+        return getattr(self.detail, name) if self.detail is not None else None
+
+    def setter(self, value):
+        if self.detail is None:
+            self.detail = ApplicationDetail()
+        setattr(self.detail, name, value)
+
+    return property(getter, setter)
+
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Keyset pagination: newest first on (created_at, id)
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        # Per-job listings: non-fraud applications by score, and by rank
+        Index("ix_applications_job_fraud_score", "job_id", "fraud_flag", "composite_score"),
+        Index("ix_applications_job_rank", "job_id", "rank"),
+        # A candidate's applications, newest first
+        Index("ix_applications_candidate_created", "candidate_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
@@ -23,22 +46,36 @@ class Application(Base):
     # Fraud Detection
     similarity_index = Column(Float)
     fraud_flag = Column(Boolean, default=False, index=True)
-    fraud_details = Column(JSONB, nullable=True)
 
     # Decision
     decision = Column(String, index=True)
     decision_reason = Column(Text)
-    explanation = Column(JSONB, nullable=True)  # Store detailed explanation
 
     # Status
     status = Column(String, default="evaluated", index=True)
     
-    # Additional Details
-    skill_match = Column(JSONB, nullable=True)  # Store skill matching details
-    experience_details = Column(JSONB, nullable=True)
-    
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     job = relationship("Job", back_populates="applications")
     candidate = relationship("Candidate", back_populates="applications")
+    detail = relationship(ApplicationDetail, uselist=False, cascade="all, delete-orphan")
+    
+    # Heavy payloads, stored compressed in application_details and loaded on access
+    explanation = _detail_field("explanation")
+    fraud_details = _detail_field("fraud_details")
+    skill_match = _detail_field("skill_match")
+    experience_details = _detail_field("experience_details")
+
+    def to_dict(self) -> dict:
+        """
+        Column values plus the detail payloads, as API responses return them
+
+        The payloads are properties, which FastAPI does not serialize from ORM
+        objects; load Application.detail eagerly before calling this on many rows.
+        """
+        data = {column.key: getattr(self, column.key) for column in self.__table__.columns}
+        for name in ("explanation", "fraud_details", "skill_match", "experience_details"):
+            data[name] = getattr(self, name)
+        return data
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from datetime import datetime
+from ..database import Base
+from ..utils.serialization import CompressedMsgPack
+
+
+class ApplicationDetail(Base):
+    """
+    Heavy per-application payloads, kept out of the applications heap
+
+    Loaded only through Application.detail, so list and ranking queries over
+    applications never read these blobs.
+    """
+    __tablename__ = "application_details"
+
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+
+    explanation = Column(CompressedMsgPack, nullable=True)  # Shared context + rendered explanations
+    fraud_details = Column(CompressedMsgPack, nullable=True)
+    skill_match = Column(CompressedMsgPack, nullable=True)  # Skill matching details
+    experience_details = Column(CompressedMsgPack, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
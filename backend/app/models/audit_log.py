@@ -1,16 +1,49 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, DDL, Index, Integer, String, DateTime, event
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 from ..database import Base
 
 class AuditLog(Base):
+    """
+    Audit trail, range-partitioned by month on timestamp
+    
+    Monthly partitions are created ahead of time by
+    app.services.audit_partitions; rows outside them land in
+    audit_logs_default. The primary key includes timestamp because
+    PostgreSQL requires the partition key in every unique constraint.
+    """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Event-type reports over a time window
+        Index("ix_audit_logs_event_type_timestamp", "event_type", "timestamp"),
+        # A job's evaluation history, newest first
+        Index("ix_audit_logs_job_id_timestamp", "job_id", "timestamp"),
+        # An application's / candidate's history, newest first
+        Index("ix_audit_logs_entity", "entity_type", "entity_id", "timestamp"),
+        # Containment (@>) searches inside details
+        Index("ix_audit_logs_details", "details", postgresql_using="gin", postgresql_ops={"details": "jsonb_path_ops"}),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     event_type = Column(String)  # application_evaluation, job_creation, fraud_detection, etc.
     entity_type = Column(String)  # application, job, candidate, company
     entity_id = Column(Integer)
     user_id = Column(Integer, nullable=True)
     action = Column(String)  # create, update, delete, evaluate, flag, override
-    details = Column(Text)  # JSON string with detailed information
+    details = Column(JSONB)  # Event payload
+    
+    # Promoted from details so reports can filter and group without reading the payload
+    job_id = Column(Integer, nullable=True)
+    decision = Column(String, nullable=True)
+    
     ip_address = Column(String, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True)
+
+
+# A partitioned table accepts no rows until it has a partition to route them to
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT")
+)
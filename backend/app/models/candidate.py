@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from ..database import Base
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Keyset pagination: newest first on (created_at, id)
+        Index("ix_candidates_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -14,10 +18,14 @@ class Candidate(Base):
     linkedin = Column(String, nullable=True)
     github = Column(String, nullable=True)
     experience = Column(Integer, default=0)
-    resume_text = Column(Text, nullable=False)
-    resume_embedding = Column(JSONB)
-    skills_extracted = Column(JSONB)  # Store extracted skills from resume
+    
+    # Bulky content is deferred: loaded only when accessed or requested with
+    # undefer()/undefer_group("content"), so listings fetch ids and names only
+    resume_text = deferred(Column(Text, nullable=False), group="content")
+    resume_embedding = deferred(Column(JSONB), group="content")
+    skills_extracted = deferred(Column(JSONB), group="content")  # Store extracted skills from resume
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     applications = relationship("Application", back_populates="candidate")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from ..database import Base
+
+
+class CandidateSummary(Base):
+    """
+    Per-candidate rollup of their best application, maintained by the pipeline
+
+    Lets dashboards filter, count and page candidates without scanning every
+    application.
+    """
+    __tablename__ = "candidate_summary"
+
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    best_application_id = Column(Integer, ForeignKey("applications.id", ondelete="SET NULL"), nullable=True)
+    best_score = Column(Float, index=True)  # Composite score of the best application
+    decision = Column(String, index=True)  # Decision of the best application
+    status = Column(String, index=True)  # Selected / Rejected / Pending
+    tier = Column(String, index=True)  # Excellent / Good / Average / Poor
+    total_applications = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    candidate = relationship("Candidate")
+    best_application = relationship("Application")
@@ -10,6 +10,7 @@ class Company(Base):
     name = Column(String, nullable=False, index=True)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     jobs = relationship("Job", back_populates="company")
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression, deferred
 from datetime import datetime
 from ..database import Base
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination: newest first on (created_at, id)
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
@@ -14,10 +18,17 @@ class Job(Base):
     salary = Column(String)
     employment_type = Column(String, nullable=True)  # Full-time, Part-time, Contract, etc.
     required_experience = Column(Integer, default=0)
-    jd_text = Column(Text, nullable=False)
-    jd_embedding = Column(JSONB)
-    skills_extracted = Column(JSONB)  # Store extracted skills from JD
+    
+    # Bulky content is deferred: loaded only when accessed or requested with
+    # undefer()/undefer_group("content")
+    jd_text = deferred(Column(Text, nullable=False), group="content")
+    jd_embedding = deferred(Column(JSONB), group="content")
+    skills_extracted = deferred(Column(JSONB), group="content")  # Store extracted skills from JD
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Populated per query with with_expression(); None unless requested
+    application_count = query_expression()
     
     # Relationships
     company = relationship("Company", back_populates="jobs")
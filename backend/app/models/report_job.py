@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from ..database import Base
+
+
+class ReportJob(Base):
+    """
+    A master report generated in the background
+
+    Jobs are deduplicated on (params_hash, data_fingerprint): the same
+    parameters against unchanged data reuse the queued, running or
+    finished job instead of rendering the report again.
+    """
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        Index("ix_report_jobs_params_fingerprint", "params_hash", "data_fingerprint"),
+    )
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex, handed to clients
+    report_type = Column(String, nullable=False, default="master")
+    params = Column(JSONB, nullable=False)  # normalized request parameters
+    params_hash = Column(String(64), nullable=False)
+    data_fingerprint = Column(String(64), nullable=False)  # state of the data the report was built from
+    status = Column(String, nullable=False, default="queued", index=True)  # queued / running / completed / failed / expired
+    file_path = Column(String, nullable=True)  # artifact under REPORT_STORAGE_DIR once completed
+    file_size = Column(Integer, nullable=True)
+    candidate_count = Column(Integer, nullable=True)
+    next_cursor = Column(String, nullable=True)  # cursor for the following page of candidates
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,39 @@
+"""
+Admin Routes - Operator tools, guarded by the X-Admin-Token header
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from ..config import PROFILE_SAMPLE_RATE
+from ..core.profiler import profile_store, profiling_enabled
+from ..dependencies import require_admin
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+def list_profiles():
+    """
+    Request profiles stored by this worker's host, newest first
+    
+    Profile a request by sending it with `X-Profile: 1` and `X-Admin-Token`;
+    the response's X-Profile-Id names the profile.
+    """
+    return {
+        "enabled": profiling_enabled(),
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "profiles": profile_store.list()
+    }
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str):
+    """
+    Collapsed-stack file of one profile
+    
+    One `frame;frame;... count` line per sampled stack, for flamegraph.pl,
+    speedscope or inferno.
+    """
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.collapsed")
@@ -1,15 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from ..dependencies import get_db
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, selectinload, undefer
+from sqlalchemy import func, desc, cast, Numeric, select
+from ..config import REPORT_MAX_CANDIDATES
+from ..dependencies import get_db, get_async_db
 from ..models.application import Application
+from ..models.application_detail import ApplicationDetail
 from ..models.candidate import Candidate
 from ..models.job import Job
 from ..models.company import Company
-from ..services.pdf_report_service import master_report_generator
-from typing import List, Dict, Any
-from io import BytesIO
+from ..models.candidate_summary import CandidateSummary
+from ..models.report_job import ReportJob
+from ..schemas.report_schema import ReportJobCreate, ReportJobResponse
+from ..services.explanation_context import expand_explanation
+from ..services.master_report_data import fragment_hashes, load_report_page, report_batches, report_summaries
+from ..services.report_jobs import normalize_params, report_job_runner
+from ..utils.pagination import InvalidCursor, decode_cursor
+from typing import List, Dict, Any, Optional
+import os
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -27,7 +36,7 @@ def get_xai_explanation(application_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Application not found")
     
     # Extract XAI explanation from stored explanation
-    full_explanation = application.explanation or {}
+    full_explanation = expand_explanation(application.explanation)
     xai_explanation = full_explanation.get("xai_explanation", {})
     
     if not xai_explanation:
@@ -116,31 +125,32 @@ def get_skill_evidence_graph(application_id: int, db: Session = Depends(get_db))
 
 
 @router.get("/job/{job_id}/rankings")
-def get_job_application_rankings(
+async def get_job_application_rankings(
     job_id: int,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get ranked list of all applications for a job
     
     Returns applications sorted by rank (best to worst)
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get all applications ordered by rank
-    applications = db.query(Application).filter(
-        Application.job_id == job_id
-    ).order_by(Application.rank.asc()).limit(limit).all()
+    # Applications ordered by rank, each with its candidate
+    result = await db.execute(
+        select(Application, Candidate).join(
+            Candidate, Candidate.id == Application.candidate_id
+        ).where(
+            Application.job_id == job_id
+        ).order_by(Application.rank.asc()).limit(limit)
+    )
     
-    # Enrich with candidate info
     rankings = []
-    for app in applications:
-        candidate = db.query(Candidate).filter(Candidate.id == app.candidate_id).first()
-        
+    for app, candidate in result.all():
         rankings.append({
             "rank": app.rank,
             "application_id": app.id,
@@ -188,15 +198,20 @@ def get_top_candidates(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get top N non-fraud applications
-    top_apps = db.query(Application).filter(
+    # Get top N non-fraud applications with their candidates joined in
+    top_apps = db.query(Application).join(
+        Candidate, Candidate.id == Application.candidate_id
+    ).options(
+        contains_eager(Application.candidate),
+        selectinload(Application.detail).load_only(ApplicationDetail.skill_match)
+    ).filter(
         Application.job_id == job_id,
         Application.fraud_flag == False
     ).order_by(Application.rank.asc()).limit(top_n).all()
     
     top_candidates = []
     for app in top_apps:
-        candidate = db.query(Candidate).filter(Candidate.id == app.candidate_id).first()
+        candidate = app.candidate
         
         # Get skill match summary
         skill_match = app.skill_match or {}
@@ -237,6 +252,10 @@ def get_top_candidates(
     }
 
 
+SCORE_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+HISTOGRAM_BUCKETS = 10
+
+
 @router.get("/job/{job_id}/statistics")
 def get_job_statistics(job_id: int, db: Session = Depends(get_db)):
     """
@@ -246,55 +265,97 @@ def get_job_statistics(job_id: int, db: Session = Depends(get_db)):
         - Total applications
         - Decision breakdown
         - Average scores
+        - Composite score percentiles and histogram
         - Ranking distribution
+    
+    Every figure is aggregated in the database; no application rows are loaded.
     """
     job = db.query(Job).filter(Job.id == job_id).first()
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    all_apps = db.query(Application).filter(Application.job_id == job_id).all()
+    # Counts and score sums per decision in one pass
+    decision_rows = db.query(
+        Application.decision,
+        func.count(Application.id).label("total"),
+        func.sum(func.coalesce(Application.composite_score, 0)).label("composite"),
+        func.sum(func.coalesce(Application.rfs, 0)).label("rfs"),
+        func.sum(func.coalesce(Application.dcs, 0)).label("dcs"),
+        func.sum(func.coalesce(Application.elc, 0)).label("elc"),
+        func.count(Application.id).filter(Application.fraud_flag == True).label("fraud"),
+    ).filter(
+        Application.job_id == job_id
+    ).group_by(Application.decision).all()
+    
+    total = sum(row.total for row in decision_rows)
     
-    if not all_apps:
+    if not total:
         return {
             "job_id": job_id,
             "message": "No applications yet"
         }
     
-    # Calculate statistics
-    total = len(all_apps)
+    decisions = {row.decision or "Unknown": row.total for row in decision_rows}
     
-    # Decision counts
-    decisions = {}
-    for app in all_apps:
-        decision = app.decision or "Unknown"
-        decisions[decision] = decisions.get(decision, 0) + 1
+    def _average(column):
+        return round(sum(getattr(row, column) or 0 for row in decision_rows) / total, 4)
     
-    # Average scores
-    avg_composite = sum(app.composite_score or 0 for app in all_apps) / total
-    avg_rfs = sum(app.rfs or 0 for app in all_apps) / total
-    avg_dcs = sum(app.dcs or 0 for app in all_apps) / total
-    avg_elc = sum(app.elc or 0 for app in all_apps) / total
+    fraud_count = sum(row.fraud for row in decision_rows)
     
-    # Fraud statistics
-    fraud_count = sum(1 for app in all_apps if app.fraud_flag)
+    # Percentiles of the composite score (NULL scores are ignored)
+    percentile_values = db.query(
+        func.percentile_cont(list(SCORE_PERCENTILES)).within_group(Application.composite_score)
+    ).filter(
+        Application.job_id == job_id
+    ).scalar()
+    
+    percentiles = {
+        f"p{int(p * 100)}": round(value, 4) if value is not None else None
+        for p, value in zip(SCORE_PERCENTILES, percentile_values or [None] * len(SCORE_PERCENTILES))
+    }
+    
+    # Composite score histogram over [0, 1]; a perfect 1.0 falls in the last bucket
+    bucket = func.least(
+        func.width_bucket(Application.composite_score, 0.0, 1.0, HISTOGRAM_BUCKETS),
+        HISTOGRAM_BUCKETS
+    ).label("bucket")
+    bucket_counts = dict(
+        db.query(bucket, func.count(Application.id)).filter(
+            Application.job_id == job_id,
+            Application.composite_score.isnot(None)
+        ).group_by(bucket).all()
+    )
+    
+    width = 1.0 / HISTOGRAM_BUCKETS
+    histogram = [
+        {
+            "range": f"{(i - 1) * width:.1f}-{i * width:.1f}",
+            "count": bucket_counts.get(i, 0)
+        }
+        for i in range(1, HISTOGRAM_BUCKETS + 1)
+    ]
     
     # Top candidate
-    top_candidate_app = db.query(Application).filter(
+    top_candidate = db.query(
+        Candidate.name,
+        Application.rank,
+        Application.composite_score,
+        Application.decision
+    ).join(
+        Candidate, Candidate.id == Application.candidate_id
+    ).filter(
         Application.job_id == job_id,
         Application.fraud_flag == False
     ).order_by(Application.rank.asc()).first()
     
     top_candidate_info = None
-    if top_candidate_app:
-        top_candidate = db.query(Candidate).filter(
-            Candidate.id == top_candidate_app.candidate_id
-        ).first()
+    if top_candidate:
         top_candidate_info = {
             "name": top_candidate.name,
-            "rank": top_candidate_app.rank,
-            "score": top_candidate_app.composite_score,
-            "decision": top_candidate_app.decision
+            "rank": top_candidate.rank,
+            "score": top_candidate.composite_score,
+            "decision": top_candidate.decision
         }
     
     return {
@@ -306,11 +367,13 @@ def get_job_statistics(job_id: int, db: Session = Depends(get_db)):
         "total_applications": total,
         "decision_breakdown": decisions,
         "average_scores": {
-            "composite": round(avg_composite, 4),
-            "rfs": round(avg_rfs, 4),
-            "dcs": round(avg_dcs, 4),
-            "elc": round(avg_elc, 4)
+            "composite": _average("composite"),
+            "rfs": _average("rfs"),
+            "dcs": _average("dcs"),
+            "elc": _average("elc")
         },
+        "score_percentiles": percentiles,
+        "score_histogram": histogram,
         "fraud_statistics": {
             "total_fraud": fraud_count,
             "fraud_percentage": round(fraud_count / total * 100, 2)
@@ -331,14 +394,21 @@ def get_candidate_applications(candidate_id: int, db: Session = Depends(get_db))
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    applications = db.query(Application).filter(
+    # Jobs and companies joined in, so the query count does not grow with the applications
+    applications = db.query(Application).join(
+        Job, Job.id == Application.job_id
+    ).outerjoin(
+        Company, Company.id == Job.company_id
+    ).options(
+        contains_eager(Application.job).contains_eager(Job.company)
+    ).filter(
         Application.candidate_id == candidate_id
     ).order_by(desc(Application.created_at)).all()
     
     applications_data = []
     for app in applications:
-        job = db.query(Job).filter(Job.id == app.job_id).first()
-        company = db.query(Company).filter(Company.id == job.company_id).first() if job else None
+        job = app.job
+        company = job.company
         
         applications_data.append({
             "application_id": app.id,
@@ -369,12 +439,12 @@ def get_candidate_applications(candidate_id: int, db: Session = Depends(get_db))
 
 
 @router.get("/candidates/dashboard")
-def get_candidates_dashboard(
+async def get_candidates_dashboard(
     skip: int = 0,
     limit: int = 100,
     tier_filter: str = None,
     status_filter: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get comprehensive candidates dashboard with all details
@@ -382,72 +452,124 @@ def get_candidates_dashboard(
     Returns: total candidates, statistics, and detailed candidate information
     including tier classification, applications, scores, and decisions
     
+    Served from the candidate_summary rollup maintained by the pipeline, so
+    the cost does not grow with the number of applications.
+    
     Query Parameters:
     - tier_filter: Filter by tier (Excellent/Good/Average/Poor)
     - status_filter: Filter by status (Selected/Rejected/Pending)
     - skip: Pagination offset
     - limit: Maximum results (default 100)
     """
+    filters = [CandidateSummary.total_applications > 0]
+    if tier_filter:
+        filters.append(CandidateSummary.tier == tier_filter)
+    if status_filter:
+        filters.append(CandidateSummary.status == status_filter)
+    
+    # Statistics: one GROUP BY over the summary rows
+    rounded_score = func.round(cast(CandidateSummary.best_score, Numeric), 2)
+    groups = (await db.execute(
+        select(
+            CandidateSummary.status,
+            CandidateSummary.tier,
+            CandidateSummary.decision,
+            func.count().label("candidates"),
+            func.sum(rounded_score).label("score_sum")
+        ).where(*filters).group_by(
+            CandidateSummary.status,
+            CandidateSummary.tier,
+            CandidateSummary.decision
+        )
+    )).all()
+    
+    by_status = {"Selected": 0, "Rejected": 0, "Pending": 0}
+    by_tier = {"Excellent": 0, "Good": 0, "Average": 0, "Poor": 0}
+    by_decision = {
+        "Fast-Track Selected": 0,
+        "Selected": 0,
+        "Hire-Pooled": 0,
+        "Rejected": 0,
+        "Review Required": 0
+    }
+    total_candidates = 0
+    score_sum = 0.0
+    for group in groups:
+        total_candidates += group.candidates
+        score_sum += float(group.score_sum or 0)
+        if group.status in by_status:
+            by_status[group.status] += group.candidates
+        if group.tier in by_tier:
+            by_tier[group.tier] += group.candidates
+        if group.decision in by_decision:
+            by_decision[group.decision] += group.candidates
     
-    def get_tier(score: float) -> str:
-        """Classify candidate into tier based on composite score"""
-        if score >= 0.85:
-            return "Excellent"
-        elif score >= 0.70:
-            return "Good"
-        elif score >= 0.50:
-            return "Average"
-        else:
-            return "Poor"
-    
-    def get_status(decision: str) -> str:
-        """Convert decision to status"""
-        if decision in ["Fast-Track Selected", "Selected"]:
-            return "Selected"
-        elif decision == "Rejected":
-            return "Rejected"
-        else:
-            return "Pending"
-    
-    # Get all candidates with their applications
-    candidates = db.query(Candidate).all()
-    
-    # Build comprehensive candidate data
-    candidates_data = []
-    
-    for candidate in candidates:
-        # Get all applications for this candidate
-        applications = db.query(Application).filter(
-            Application.candidate_id == candidate.id
-        ).all()
-        
-        if not applications:
-            continue  # Skip candidates with no applications
-        
-        # Get best application (highest score)
-        best_app = max(applications, key=lambda x: x.composite_score)
-        
-        # Get job and company details
-        job = db.query(Job).filter(Job.id == best_app.job_id).first()
-        company = db.query(Company).filter(Company.id == job.company_id).first() if job else None
-        
-        # Calculate tier and status
-        tier = get_tier(best_app.composite_score)
-        status = get_status(best_app.decision)
+    stats = {
+        "total_candidates": total_candidates,
+        "by_status": {
+            "selected": by_status["Selected"],
+            "rejected": by_status["Rejected"],
+            "pending": by_status["Pending"]
+        },
+        "by_tier": {
+            "excellent": by_tier["Excellent"],
+            "good": by_tier["Good"],
+            "average": by_tier["Average"],
+            "poor": by_tier["Poor"]
+        },
+        "by_decision": {
+            "fast_track": by_decision["Fast-Track Selected"],
+            "selected": by_decision["Selected"],
+            "hire_pooled": by_decision["Hire-Pooled"],
+            "rejected": by_decision["Rejected"],
+            "review_required": by_decision["Review Required"]
+        },
+        "average_score": round(score_sum / total_candidates, 2) if total_candidates > 0 else 0
+    }
+    
+    # Page of candidates with their best application, job and company in one query
+    rows = (await db.execute(
+        select(
+            CandidateSummary,
+            Candidate.name,
+            Candidate.email,
+            Candidate.mobile,
+            Candidate.experience,
+            Application,
+            Job.role,
+            Company.id.label("company_id"),
+            Company.name.label("company_name")
+        ).join(
+            Candidate, Candidate.id == CandidateSummary.candidate_id
+        ).join(
+            Application, Application.id == CandidateSummary.best_application_id
+        ).outerjoin(
+            Job, Job.id == Application.job_id
+        ).outerjoin(
+            Company, Company.id == Job.company_id
+        ).where(*filters).order_by(
+            rounded_score.desc(),
+            CandidateSummary.candidate_id.asc()
+        ).offset(skip).limit(limit)
+    )).all()
+    
+    paginated_data = []
+    for row in rows:
+        summary = row.CandidateSummary
+        best_app = row.Application
         
-        # Build candidate entry
-        candidate_entry = {
-            "candidate_id": candidate.id,
-            "candidate_name": candidate.name,
-            "email": candidate.email,
-            "mobile": candidate.mobile,
-            "experience": candidate.experience,
-            "total_applications": len(applications),
+        paginated_data.append({
+            "candidate_id": summary.candidate_id,
+            "candidate_name": row.name,
+            "email": row.email,
+            "mobile": row.mobile,
+            "experience": row.experience,
+            "total_applications": summary.total_applications,
             "best_application": {
                 "application_id": best_app.id,
-                "job_role": job.role if job else "Unknown",
-                "company_name": company.name if company else "Unknown",
-                "company_id": company.id if company else None,
+                "job_role": row.role or "Unknown",
+                "company_name": row.company_name or "Unknown",
+                "company_id": row.company_id,
                 "applied_date": best_app.created_at.isoformat()
             },
             "scores": {
@@ -458,51 +580,11 @@ def get_candidates_dashboard(
                 "elc": round(best_app.elc, 2)
             },
             "decision": best_app.decision,
-            "status": status,
-            "tier": tier,
+            "status": summary.status,
+            "tier": summary.tier,
             "rank": best_app.rank,
             "fraud_flag": best_app.fraud_flag
-        }
-        
-        # Apply filters
-        if tier_filter and tier != tier_filter:
-            continue
-        if status_filter and status != status_filter:
-            continue
-        
-        candidates_data.append(candidate_entry)
-    
-    # Sort by composite score (highest first)
-    candidates_data.sort(key=lambda x: x["scores"]["composite_score"], reverse=True)
-    
-    # Calculate statistics
-    total_candidates = len(candidates_data)
-    
-    stats = {
-        "total_candidates": total_candidates,
-        "by_status": {
-            "selected": len([c for c in candidates_data if c["status"] == "Selected"]),
-            "rejected": len([c for c in candidates_data if c["status"] == "Rejected"]),
-            "pending": len([c for c in candidates_data if c["status"] == "Pending"])
-        },
-        "by_tier": {
-            "excellent": len([c for c in candidates_data if c["tier"] == "Excellent"]),
-            "good": len([c for c in candidates_data if c["tier"] == "Good"]),
-            "average": len([c for c in candidates_data if c["tier"] == "Average"]),
-            "poor": len([c for c in candidates_data if c["tier"] == "Poor"])
-        },
-        "by_decision": {
-            "fast_track": len([c for c in candidates_data if c["decision"] == "Fast-Track Selected"]),
-            "selected": len([c for c in candidates_data if c["decision"] == "Selected"]),
-            "hire_pooled": len([c for c in candidates_data if c["decision"] == "Hire-Pooled"]),
-            "rejected": len([c for c in candidates_data if c["decision"] == "Rejected"]),
-            "review_required": len([c for c in candidates_data if c["decision"] == "Review Required"])
-        },
-        "average_score": round(sum(c["scores"]["composite_score"] for c in candidates_data) / total_candidates, 2) if total_candidates > 0 else 0
-    }
-    
-    # Apply pagination
-    paginated_data = candidates_data[skip:skip + limit]
+        })
     
     return {
         "statistics": stats,
@@ -524,6 +606,7 @@ def get_candidates_dashboard(
 def generate_master_pdf_report(
     limit: int = 50,
     skip: int = 0,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -539,179 +622,127 @@ def generate_master_pdf_report(
     - Score visualizations
     - Fraud detection results
     
+    The PDF is streamed: the title page and summary are sent first, then
+    candidates are rendered and sent in batches, so memory use stays flat
+    and the download starts immediately even for large reports. Candidate
+    sections are cached and only re-rendered when the candidate's data
+    changes.
+    
     Query Parameters:
-    - limit: Maximum number of candidates to include (default: 50, max: 100)
+    - limit: Maximum number of candidates to include (default: 50, max: REPORT_MAX_CANDIDATES, 1000)
     - skip: Number of candidates to skip (default: 0)
+    - cursor: Cursor of the next batch (from the X-Next-Cursor header of the previous report)
     
     Returns:
     - PDF file (application/pdf)
+    - X-Next-Cursor header when more candidates remain
     
     Example:
     GET /analytics/master-report/pdf?limit=20
     """
     # Limit the maximum
-    if limit > 100:
-        limit = 100
+    if limit > REPORT_MAX_CANDIDATES:
+        limit = REPORT_MAX_CANDIDATES
     
-    # Get all candidates with pagination
-    all_candidates = db.query(Candidate).order_by(Candidate.created_at.desc()).offset(skip).limit(limit).all()
+    # Get candidates newest-first, paged by (created_at, id)
+    try:
+        candidates, next_cursor = load_report_page(db, limit, skip=skip, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not all_candidates:
+    if not candidates:
         raise HTTPException(status_code=404, detail="No candidates found")
     
-    # Build comprehensive data for each candidate
-    candidates_master_data = []
+    summaries = report_summaries(db, candidates)
     
-    for candidate in all_candidates:
-        # Get all applications for this candidate
-        applications = db.query(Application).filter(
-            Application.candidate_id == candidate.id
-        ).order_by(Application.composite_score.desc()).all()
-        
-        # Build application details with analytics
-        application_details = []
-        for app in applications:
-            job = db.query(Job).filter(Job.id == app.job_id).first()
-            company = None
-            if job:
-                company = db.query(Company).filter(Company.id == job.company_id).first()
-            
-            # Extract XAI explanation
-            full_explanation = app.explanation or {}
-            xai_explanation = full_explanation.get("xai_explanation", {})
-            skill_gap = full_explanation.get("skill_gap_analysis", {})
-            skill_graph = full_explanation.get("skill_evidence_graph", {})
-            
-            application_info = {
-                "application_id": app.id,
-                "applied_at": app.created_at.isoformat() if app.created_at else None,
-                "status": app.status,
-                
-                # Job Details
-                "job_details": {
-                    "job_id": job.id if job else None,
-                    "role": job.role if job else None,
-                    "location": job.location if job else None,
-                    "salary": job.salary if job else None,
-                    "employment_type": job.employment_type if job else None,
-                    "required_experience": job.required_experience if job else None,
-                    "company_name": company.name if company else None,
-                } if job else None,
-                
-                # Company Details
-                "company_details": {
-                    "company_id": company.id if company else None,
-                    "company_name": company.name if company else None,
-                    "company_description": company.description if company else None,
-                } if company else None,
-                
-                # Scores
-                "scores": {
-                    "role_fit_score": app.rfs,
-                    "domain_competency_score": app.dcs,
-                    "experience_level_compatibility": app.elc,
-                    "composite_score": app.composite_score,
-                    "rank": app.rank,
-                    "rank_description": f"Ranked #{app.rank}" if app.rank else "Not ranked yet"
-                },
-                
-                # Decision
-                "decision": {
-                    "status": app.decision if app.decision else "Pending",
-                    "reason": app.decision_reason,
-                    "detailed_explanation": app.explanation
-                },
-                
-                # Fraud Detection
-                "fraud_detection": {
-                    "fraud_flag": app.fraud_flag,
-                    "similarity_index": app.similarity_index,
-                    "fraud_details": app.fraud_details
-                },
-                
-                # Skill Analysis
-                "skill_analysis": {
-                    "skill_match": app.skill_match,
-                    "experience_details": app.experience_details
-                },
-                
-                # XAI Explanation
-                "xai_explanation": xai_explanation,
-                
-                # Skill Gap Analysis
-                "skill_gap_analysis": skill_gap,
-                
-                # Skill Evidence Graph
-                "skill_evidence_graph": skill_graph
-            }
-            
-            application_details.append(application_info)
-        
-        # Calculate summary statistics for this candidate
-        total_applications = len(applications)
-        selected_count = sum(1 for app in applications if app.decision == "Selected")
-        rejected_count = sum(1 for app in applications if app.decision == "Rejected")
-        pending_count = sum(1 for app in applications if not app.decision or app.decision == "Pending")
-        
-        avg_composite_score = None
-        if applications:
-            scores = [app.composite_score for app in applications if app.composite_score is not None]
-            if scores:
-                avg_composite_score = sum(scores) / len(scores)
-        
-        best_application = None
-        if applications:
-            scored_apps = [app for app in applications if app.composite_score is not None]
-            if scored_apps:
-                best_app = max(scored_apps, key=lambda x: x.composite_score)
-                best_job = db.query(Job).filter(Job.id == best_app.job_id).first()
-                best_application = {
-                    "application_id": best_app.id,
-                    "job_role": best_job.role if best_job else None,
-                    "composite_score": best_app.composite_score,
-                    "decision": best_app.decision,
-                    "rank": best_app.rank
-                }
-        
-        # Build master data for this candidate
-        candidate_master = {
-            "candidate_profile": {
-                "candidate_id": candidate.id,
-                "name": candidate.name,
-                "email": candidate.email,
-                "mobile": candidate.mobile,
-                "linkedin": candidate.linkedin,
-                "github": candidate.github,
-                "years_of_experience": candidate.experience,
-                "skills": candidate.skills_extracted.get("technical_skills", []) if candidate.skills_extracted else [],
-                "profile_created_at": candidate.created_at.isoformat() if candidate.created_at else None
-            },
-            
-            "application_summary": {
-                "total_applications": total_applications,
-                "selected": selected_count,
-                "rejected": rejected_count,
-                "pending": pending_count,
-                "average_composite_score": round(avg_composite_score, 2) if avg_composite_score else None,
-                "best_application": best_application
-            },
-            
-            "applications": application_details
-        }
-        
-        candidates_master_data.append(candidate_master)
+    headers = {
+        "Content-Disposition": f"attachment; filename=master_candidate_report_{skip}_{limit}.pdf"
+    }
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
     
-    # Generate PDF
-    try:
-        pdf_buffer = master_report_generator.generate_master_report(candidates_master_data)
-        
-        # Return as streaming response
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=master_candidate_report_{skip}_{limit}.pdf"
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
+    hashes = fragment_hashes(db, [candidate.id for candidate in candidates])
+    
+    # reportlab is only loaded once a report is actually requested
+    from ..services.pdf_report_service import master_report_generator
+    
+    return StreamingResponse(
+        master_report_generator.stream_cached_master_report(summaries, hashes, report_batches),
+        media_type="application/pdf",
+        headers=headers
+    )
+
+
+def _report_job_response(job: ReportJob, deduplicated: bool = False) -> ReportJobResponse:
+    return ReportJobResponse(
+        report_id=job.id,
+        status=job.status,
+        deduplicated=deduplicated,
+        params=job.params,
+        candidate_count=job.candidate_count,
+        file_size=job.file_size,
+        next_cursor=job.next_cursor,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        status_url=f"/analytics/reports/{job.id}",
+        file_url=f"/analytics/reports/{job.id}/file" if job.status == "completed" else None
+    )
+
+
+@router.post("/reports", response_model=ReportJobResponse, status_code=202)
+def create_report_job(request: ReportJobCreate, db: Session = Depends(get_db)):
+    """
+    🆕 Queue a master PDF report to be generated in the background
+    
+    Same parameters as GET /analytics/master-report/pdf. Returns immediately
+    with the job; poll status_url until the status is completed, then
+    download file_url.
+    
+    Identical requests are deduplicated: while the candidates and
+    applications behind the report are unchanged, the queued, running or
+    finished job is returned (deduplicated: true) instead of a new one.
+    """
+    if request.cursor:
+        try:
+            decode_cursor(request.cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    job, created = report_job_runner.submit(db, normalize_params(request.limit, request.skip, request.cursor))
+    return _report_job_response(job, deduplicated=not created)
+
+
+@router.get("/reports/{report_id}", response_model=ReportJobResponse)
+def get_report_job(report_id: str, db: Session = Depends(get_db)):
+    """Status of a background report job"""
+    job = db.get(ReportJob, report_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return _report_job_response(job)
+
+
+@router.get("/reports/{report_id}/file")
+def download_report_file(report_id: str, db: Session = Depends(get_db)):
+    """
+    Download the PDF of a completed background report
+    
+    409 while the report is still being generated or if it failed; 410 once
+    it has been superseded by a report built from newer data.
+    """
+    job = db.get(ReportJob, report_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if job.status == "expired" or (job.status == "completed" and not os.path.exists(job.file_path or "")):
+        raise HTTPException(status_code=410, detail="Report expired, request it again")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Report is {job.status}")
+    
+    headers = {"X-Next-Cursor": job.next_cursor} if job.next_cursor else None
+    return FileResponse(
+        job.file_path,
+        media_type="application/pdf",
+        filename=f"master_candidate_report_{job.params['skip']}_{job.params['limit']}.pdf",
+        headers=headers
+    )
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
-from ..dependencies import get_db
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, undefer_group
+from typing import Optional
+from ..database import SessionLocal
+from ..dependencies import get_db, get_async_db
 from ..models.candidate import Candidate
 from ..models.job import Job
 from ..models.company import Company
@@ -9,10 +14,40 @@ from ..services.embedding_service import get_embedding
 from ..services.resume_parser_agent import parse_resume_pdf
 from ..services.inference_engine import extract_skills_from_text
 from ..services.audit_service import AuditService
+from ..services.explanation_context import expand_explanation
+from ..core.metrics import PIPELINE_STAGE_SECONDS
 from ..core.pipeline import run_pipeline, get_application_details
+from ..utils.pagination import keyset_page, count_rows
 
 router = APIRouter(prefix="/apply", tags=["Application"])
 
+
+def _evaluate_application(job_id: int, candidate_id: int) -> dict:
+    """
+    Run the (synchronous) hiring pipeline for one application
+    
+    Called from a worker thread with its own session, so scoring and fraud
+    checks never block the event loop.
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(Job).options(undefer_group("content")).filter(Job.id == job_id).one()
+        candidate = db.query(Candidate).options(
+            undefer_group("content")
+        ).filter(Candidate.id == candidate_id).one()
+        
+        application = run_pipeline(db, job, candidate)
+        
+        return {
+            "application_id": application.id,
+            "decision": application.decision,
+            "composite_score": application.composite_score,
+            "explanation": expand_explanation(application.explanation)
+        }
+    finally:
+        db.close()
+
+
 @router.post("/{company_id}")
 async def apply(
     company_id: int,
@@ -23,7 +58,7 @@ async def apply(
     github: str = Form(""),
     experience: int = Form(...),
     resume_pdf: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit job application by uploading resume as PDF
@@ -36,36 +71,43 @@ async def apply(
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
     
     # Verify company exists
-    company = db.query(Company).filter(Company.id == company_id).first()
+    company = await db.get(Company, company_id)
     if not company:
         raise HTTPException(status_code=404, detail=f"Company ID {company_id} not found")
     
     # Find the job for this company
-    job = db.query(Job).filter(Job.company_id == company_id).first()
+    job = (await db.execute(
+        select(Job).where(Job.company_id == company_id).limit(1)
+    )).scalars().first()
     
     if not job:
         raise HTTPException(status_code=404, detail=f"No job found for Company ID {company_id}")
     
     # Check for duplicate email
-    existing_candidate = db.query(Candidate).filter(Candidate.email == email).first()
+    existing_candidate = (await db.execute(
+        select(Candidate).where(Candidate.email == email).limit(1)
+    )).scalars().first()
     if existing_candidate:
         # Check if already applied to this job
-        existing_application = db.query(Application).filter(
-            Application.job_id == job.id,
-            Application.candidate_id == existing_candidate.id
-        ).first()
+        existing_application_id = (await db.execute(
+            select(Application.id).where(
+                Application.job_id == job.id,
+                Application.candidate_id == existing_candidate.id
+            ).limit(1)
+        )).scalar()
         
-        if existing_application:
+        if existing_application_id:
             raise HTTPException(
                 status_code=400, 
-                detail=f"You have already applied to this job. Application ID: {existing_application.id}"
+                detail=f"You have already applied to this job. Application ID: {existing_application_id}"
             )
     
     # Read PDF content
     pdf_content = await resume_pdf.read()
     
-    # Parse PDF to extract text
-    parsed_resume = parse_resume_pdf(pdf_content)
+    # Parse PDF to extract text (CPU and network work runs off the event loop)
+    with PIPELINE_STAGE_SECONDS.time(stage="parse"):
+        parsed_resume = await run_in_threadpool(parse_resume_pdf, pdf_content)
     
     if not parsed_resume["success"]:
         raise HTTPException(status_code=400, detail=f"Failed to parse PDF: {parsed_resume.get('error')}")
@@ -73,10 +115,12 @@ async def apply(
     resume_text = parsed_resume["resume_text"]
     
     # Extract skills
-    skills_data = extract_skills_from_text(resume_text)
+    with PIPELINE_STAGE_SECONDS.time(stage="skills"):
+        skills_data = await run_in_threadpool(extract_skills_from_text, resume_text)
     
     # Generate embedding
-    emb = get_embedding(resume_text)
+    with PIPELINE_STAGE_SECONDS.time(stage="embed"):
+        emb = await run_in_threadpool(get_embedding, resume_text)
 
     # Create or update candidate record
     if existing_candidate:
@@ -95,23 +139,22 @@ async def apply(
         )
 
         db.add(candidate)
-        db.commit()
-        db.refresh(candidate)
+        await db.commit()
         
         # Log candidate registration
-        AuditService.log_candidate_registration(db, candidate.id, email)
+        AuditService.log_candidate_registration(None, candidate.id, email)
 
     # Run the hiring pipeline
-    application = run_pipeline(db, job, candidate)
+    evaluation = await run_in_threadpool(_evaluate_application, job.id, candidate.id)
 
     return {
-        "application_id": application.id,
+        "application_id": evaluation["application_id"],
         "candidate_id": candidate.id,
         "job_id": job.id,
         "company_id": company_id,
-        "decision": application.decision,
-        "composite_score": application.composite_score,
-        "explanation": application.explanation,
+        "decision": evaluation["decision"],
+        "composite_score": evaluation["composite_score"],
+        "explanation": evaluation["explanation"],
         "message": "Application evaluated successfully",
         "pages_parsed": parsed_resume.get("page_count"),
         "skills_detected": skills_data["skill_count"]
@@ -137,7 +180,7 @@ def get_application_history(application_id: int, db: Session = Depends(get_db)):
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    history = AuditService.get_application_history(db, application_id)
+    history = AuditService.get_application_history(db, application_id, since=application.created_at)
     
     return {
         "application_id": application_id,
@@ -152,10 +195,16 @@ def list_applications(
     fraud_flag: bool = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact",
     db: Session = Depends(get_db)
 ):
-    """List applications with optional filtering"""
-    query = db.query(Application)
+    """
+    List applications with optional filtering
+    
+    Pages newest-first; pass `next_cursor` back as `cursor` for the next page.
+    """
+    query = db.query(Application).options(selectinload(Application.detail))
     
     if decision:
         query = query.filter(Application.decision == decision)
@@ -163,13 +212,19 @@ def list_applications(
     if fraud_flag is not None:
         query = query.filter(Application.fraud_flag == fraud_flag)
     
-    applications = query.order_by(Application.created_at.desc()).offset(skip).limit(limit).all()
-    total = query.count()
+    try:
+        total = count_rows(db, query, count)
+        applications, next_cursor = keyset_page(query, Application, limit, cursor=cursor, skip=skip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "total": total,
         "showing": len(applications),
         "skip": skip,
         "limit": limit,
-        "applications": applications
+        "next_cursor": next_cursor,
+        "applications": [
+            {**app.to_dict(), "explanation": expand_explanation(app.explanation)} for app in applications
+        ]
     }
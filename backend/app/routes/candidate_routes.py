@@ -2,7 +2,7 @@
 Candidate Routes - Manage candidate information and history
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, undefer, undefer_group
 from typing import List, Optional
 from ..dependencies import get_db
 from ..models.candidate import Candidate
@@ -10,6 +10,8 @@ from ..models.application import Application
 from ..models.job import Job
 from ..models.company import Company
 from ..services.audit_service import AuditService
+from ..services.explanation_context import expand_explanation
+from ..utils.pagination import keyset_page, count_rows
 
 router = APIRouter(prefix="/candidate", tags=["Candidate"])
 
@@ -17,7 +19,9 @@ router = APIRouter(prefix="/candidate", tags=["Candidate"])
 @router.get("/{candidate_id}")
 def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
     """Get candidate details by ID"""
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = db.query(Candidate).options(
+        undefer_group("content")
+    ).filter(Candidate.id == candidate_id).first()
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
@@ -33,7 +37,9 @@ def get_candidate_applications(candidate_id: int, db: Session = Depends(get_db))
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    applications = db.query(Application).filter(
+    applications = db.query(Application).options(
+        selectinload(Application.detail)
+    ).filter(
         Application.candidate_id == candidate_id
     ).all()
     
@@ -44,7 +50,9 @@ def get_candidate_applications(candidate_id: int, db: Session = Depends(get_db))
             "email": candidate.email
         },
         "total_applications": len(applications),
-        "applications": applications
+        "applications": [
+            {**app.to_dict(), "explanation": expand_explanation(app.explanation)} for app in applications
+        ]
     }
 
 
@@ -56,7 +64,7 @@ def get_candidate_history(candidate_id: int, db: Session = Depends(get_db)):
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    history = AuditService.get_candidate_history(db, candidate_id)
+    history = AuditService.get_candidate_history(db, candidate_id, since=candidate.created_at)
     
     return {
         "candidate_id": candidate_id,
@@ -68,7 +76,9 @@ def get_candidate_history(candidate_id: int, db: Session = Depends(get_db)):
 @router.get("/search/by-email")
 def search_candidate_by_email(email: str, db: Session = Depends(get_db)):
     """Search for candidate by email"""
-    candidate = db.query(Candidate).filter(Candidate.email == email).first()
+    candidate = db.query(Candidate).options(
+        undefer_group("content")
+    ).filter(Candidate.email == email).first()
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
@@ -80,113 +90,113 @@ def search_candidate_by_email(email: str, db: Session = Depends(get_db)):
 def list_candidates(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact",
     db: Session = Depends(get_db)
 ):
-    """List all candidates with pagination"""
-    candidates = db.query(Candidate).offset(skip).limit(limit).all()
-    total = db.query(Candidate).count()
+    """
+    List all candidates with pagination
+    
+    Pages newest-first; pass `next_cursor` back as `cursor` for the next page.
+    """
+    query = db.query(Candidate)
+    
+    try:
+        total = count_rows(db, query, count)
+        candidates, next_cursor = keyset_page(
+            query.options(undefer_group("content")), Candidate, limit, cursor=cursor, skip=skip
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "total": total,
         "showing": len(candidates),
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "candidates": candidates
     }
 
 
-@router.get("/{candidate_id}/master")
-def get_candidate_master_details(candidate_id: int, db: Session = Depends(get_db)):
-    """
-    Master Endpoint - Get complete candidate profile with all details:
-    - Personal information (name, email, mobile, linkedin, github, experience)
-    - Skills extracted from resume
-    - All applications with detailed information
-    - Each application includes:
-        - Job details (role, location, salary, company)
-        - All scores (RFS, DCS, ELC, Composite Score)
-        - Ranking among applicants
-        - Decision (Selected/Rejected/Pending)
-        - Decision reason and explanation
-        - Fraud detection details
-        - Skill match analysis
-        - Application status
-    """
-    # Get candidate details
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-    
-    # Get all applications with job and company details
-    applications = db.query(Application).filter(
-        Application.candidate_id == candidate_id
-    ).all()
+# Everything the master views render, loaded in a fixed number of queries
+# (one per relationship level) instead of one query per application/job
+MASTER_LOAD_OPTIONS = (
+    undefer(Candidate.resume_text),
+    undefer(Candidate.skills_extracted),
+    selectinload(Candidate.applications).selectinload(Application.job).options(
+        undefer(Job.jd_text),
+        undefer(Job.skills_extracted),
+        selectinload(Job.company)
+    ),
+    selectinload(Candidate.applications).selectinload(Application.detail),
+)
+
+
+def _build_application_info(app: Application) -> dict:
+    """Build the master view of a single application from eager-loaded relations"""
+    job = app.job
+    company = job.company if job else None
     
-    # Build comprehensive application details
-    application_details = []
-    for app in applications:
-        job = db.query(Job).filter(Job.id == app.job_id).first()
-        company = None
-        if job:
-            company = db.query(Company).filter(Company.id == job.company_id).first()
+    return {
+        "application_id": app.id,
+        "applied_at": app.created_at.isoformat() if app.created_at else None,
+        "status": app.status,
         
-        application_info = {
-            "application_id": app.id,
-            "applied_at": app.created_at.isoformat() if app.created_at else None,
-            "status": app.status,
-            
-            # Job Details
-            "job_details": {
-                "job_id": job.id if job else None,
-                "role": job.role if job else None,
-                "location": job.location if job else None,
-                "salary": job.salary if job else None,
-                "employment_type": job.employment_type if job else None,
-                "required_experience": job.required_experience if job else None,
-                "job_description": job.jd_text if job else None,
-                "required_skills": job.skills_extracted if job else None,
-            } if job else None,
-            
-            # Company Details
-            "company_details": {
-                "company_id": company.id if company else None,
-                "company_name": company.name if company else None,
-                "company_description": company.description if company else None,
-            } if company else None,
-            
-            # Scores
-            "scores": {
-                "role_fit_score": app.rfs,
-                "domain_competency_score": app.dcs,
-                "experience_level_compatibility": app.elc,
-                "composite_score": app.composite_score,
-                "rank": app.rank,
-                "rank_description": f"Ranked #{app.rank}" if app.rank else "Not ranked yet"
-            },
-            
-            # Decision
-            "decision": {
-                "status": app.decision if app.decision else "Pending",
-                "reason": app.decision_reason,
-                "detailed_explanation": app.explanation
-            },
-            
-            # Fraud Detection
-            "fraud_detection": {
-                "fraud_flag": app.fraud_flag,
-                "similarity_index": app.similarity_index,
-                "fraud_details": app.fraud_details
-            },
-            
-            # Skill Analysis
-            "skill_analysis": {
-                "skill_match": app.skill_match,
-                "experience_details": app.experience_details
-            }
-        }
+        # Job Details
+        "job_details": {
+            "job_id": job.id,
+            "role": job.role,
+            "location": job.location,
+            "salary": job.salary,
+            "employment_type": job.employment_type,
+            "required_experience": job.required_experience,
+            "job_description": job.jd_text,
+            "required_skills": job.skills_extracted,
+        } if job else None,
         
-        application_details.append(application_info)
+        # Company Details
+        "company_details": {
+            "company_id": company.id,
+            "company_name": company.name,
+            "company_description": company.description,
+        } if company else None,
+        
+        # Scores
+        "scores": {
+            "role_fit_score": app.rfs,
+            "domain_competency_score": app.dcs,
+            "experience_level_compatibility": app.elc,
+            "composite_score": app.composite_score,
+            "rank": app.rank,
+            "rank_description": f"Ranked #{app.rank}" if app.rank else "Not ranked yet"
+        },
+        
+        # Decision
+        "decision": {
+            "status": app.decision if app.decision else "Pending",
+            "reason": app.decision_reason,
+            "detailed_explanation": expand_explanation(app.explanation)
+        },
+        
+        # Fraud Detection
+        "fraud_detection": {
+            "fraud_flag": app.fraud_flag,
+            "similarity_index": app.similarity_index,
+            "fraud_details": app.fraud_details
+        },
+        
+        # Skill Analysis
+        "skill_analysis": {
+            "skill_match": app.skill_match,
+            "experience_details": app.experience_details
+        }
+    }
+
+
+def _build_candidate_master(candidate: Candidate) -> dict:
+    """Build the master view of a candidate from eager-loaded applications"""
+    applications = sorted(candidate.applications, key=lambda app: app.id)
     
     # Calculate summary statistics
     total_applications = len(applications)
@@ -194,28 +204,24 @@ def get_candidate_master_details(candidate_id: int, db: Session = Depends(get_db
     rejected_count = sum(1 for app in applications if app.decision == "Rejected")
     pending_count = sum(1 for app in applications if not app.decision or app.decision == "Pending")
     
+    scored_apps = [app for app in applications if app.composite_score is not None]
+    
     avg_composite_score = None
-    if applications:
-        scores = [app.composite_score for app in applications if app.composite_score is not None]
-        if scores:
-            avg_composite_score = sum(scores) / len(scores)
+    if scored_apps:
+        avg_composite_score = sum(app.composite_score for app in scored_apps) / len(scored_apps)
     
     best_application = None
-    if applications:
-        scored_apps = [app for app in applications if app.composite_score is not None]
-        if scored_apps:
-            best_app = max(scored_apps, key=lambda x: x.composite_score)
-            best_job = db.query(Job).filter(Job.id == best_app.job_id).first()
-            best_application = {
-                "application_id": best_app.id,
-                "job_role": best_job.role if best_job else None,
-                "composite_score": best_app.composite_score,
-                "decision": best_app.decision,
-                "rank": best_app.rank
-            }
+    if scored_apps:
+        best_app = max(scored_apps, key=lambda x: x.composite_score)
+        best_application = {
+            "application_id": best_app.id,
+            "job_role": best_app.job.role if best_app.job else None,
+            "composite_score": best_app.composite_score,
+            "decision": best_app.decision,
+            "rank": best_app.rank
+        }
     
-    # Build master response
-    master_data = {
+    return {
         "candidate_profile": {
             "candidate_id": candidate.id,
             "name": candidate.name,
@@ -238,16 +244,43 @@ def get_candidate_master_details(candidate_id: int, db: Session = Depends(get_db
             "best_application": best_application
         },
         
-        "applications": application_details
+        "applications": [_build_application_info(app) for app in applications]
     }
+
+
+@router.get("/{candidate_id}/master")
+def get_candidate_master_details(candidate_id: int, db: Session = Depends(get_db)):
+    """
+    Master Endpoint - Get complete candidate profile with all details:
+    - Personal information (name, email, mobile, linkedin, github, experience)
+    - Skills extracted from resume
+    - All applications with detailed information
+    - Each application includes:
+        - Job details (role, location, salary, company)
+        - All scores (RFS, DCS, ELC, Composite Score)
+        - Ranking among applicants
+        - Decision (Selected/Rejected/Pending)
+        - Decision reason and explanation
+        - Fraud detection details
+        - Skill match analysis
+        - Application status
+    """
+    candidate = db.query(Candidate).options(*MASTER_LOAD_OPTIONS).filter(
+        Candidate.id == candidate_id
+    ).first()
     
-    return master_data
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    return _build_candidate_master(candidate)
 
 
 @router.get("/master/all")
 def get_all_candidates_master_details(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact",
     db: Session = Depends(get_db)
 ):
     """
@@ -260,14 +293,22 @@ def get_all_candidates_master_details(
     Query Parameters:
     - skip: Number of candidates to skip (default: 0)
     - limit: Maximum number of candidates to return (default: 100, max: 500)
+    - cursor: `next_cursor` from the previous page (newest candidates first)
+    - count: exact | approximate | none - how total_candidates is computed
     """
     # Limit the maximum number of candidates that can be fetched at once
     if limit > 500:
         limit = 500
     
-    # Get all candidates with pagination
-    all_candidates = db.query(Candidate).offset(skip).limit(limit).all()
-    total_candidates = db.query(Candidate).count()
+    # Get candidates with pagination; applications, jobs and companies are
+    # loaded alongside in one query per level
+    try:
+        total_candidates = count_rows(db, db.query(Candidate), count)
+        all_candidates, next_cursor = keyset_page(
+            db.query(Candidate).options(*MASTER_LOAD_OPTIONS), Candidate, limit, cursor=cursor, skip=skip
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     if not all_candidates:
         return {
@@ -275,137 +316,11 @@ def get_all_candidates_master_details(
             "showing": 0,
             "skip": skip,
             "limit": limit,
+            "next_cursor": None,
             "candidates": []
         }
     
-    # Build comprehensive data for each candidate
-    candidates_master_data = []
-    
-    for candidate in all_candidates:
-        # Get all applications for this candidate
-        applications = db.query(Application).filter(
-            Application.candidate_id == candidate.id
-        ).all()
-        
-        # Build application details
-        application_details = []
-        for app in applications:
-            job = db.query(Job).filter(Job.id == app.job_id).first()
-            company = None
-            if job:
-                company = db.query(Company).filter(Company.id == job.company_id).first()
-            
-            application_info = {
-                "application_id": app.id,
-                "applied_at": app.created_at.isoformat() if app.created_at else None,
-                "status": app.status,
-                
-                # Job Details
-                "job_details": {
-                    "job_id": job.id if job else None,
-                    "role": job.role if job else None,
-                    "location": job.location if job else None,
-                    "salary": job.salary if job else None,
-                    "employment_type": job.employment_type if job else None,
-                    "required_experience": job.required_experience if job else None,
-                    "job_description": job.jd_text if job else None,
-                    "required_skills": job.skills_extracted if job else None,
-                } if job else None,
-                
-                # Company Details
-                "company_details": {
-                    "company_id": company.id if company else None,
-                    "company_name": company.name if company else None,
-                    "company_description": company.description if company else None,
-                } if company else None,
-                
-                # Scores
-                "scores": {
-                    "role_fit_score": app.rfs,
-                    "domain_competency_score": app.dcs,
-                    "experience_level_compatibility": app.elc,
-                    "composite_score": app.composite_score,
-                    "rank": app.rank,
-                    "rank_description": f"Ranked #{app.rank}" if app.rank else "Not ranked yet"
-                },
-                
-                # Decision
-                "decision": {
-                    "status": app.decision if app.decision else "Pending",
-                    "reason": app.decision_reason,
-                    "detailed_explanation": app.explanation
-                },
-                
-                # Fraud Detection
-                "fraud_detection": {
-                    "fraud_flag": app.fraud_flag,
-                    "similarity_index": app.similarity_index,
-                    "fraud_details": app.fraud_details
-                },
-                
-                # Skill Analysis
-                "skill_analysis": {
-                    "skill_match": app.skill_match,
-                    "experience_details": app.experience_details
-                }
-            }
-            
-            application_details.append(application_info)
-        
-        # Calculate summary statistics for this candidate
-        total_applications = len(applications)
-        selected_count = sum(1 for app in applications if app.decision == "Selected")
-        rejected_count = sum(1 for app in applications if app.decision == "Rejected")
-        pending_count = sum(1 for app in applications if not app.decision or app.decision == "Pending")
-        
-        avg_composite_score = None
-        if applications:
-            scores = [app.composite_score for app in applications if app.composite_score is not None]
-            if scores:
-                avg_composite_score = sum(scores) / len(scores)
-        
-        best_application = None
-        if applications:
-            scored_apps = [app for app in applications if app.composite_score is not None]
-            if scored_apps:
-                best_app = max(scored_apps, key=lambda x: x.composite_score)
-                best_job = db.query(Job).filter(Job.id == best_app.job_id).first()
-                best_application = {
-                    "application_id": best_app.id,
-                    "job_role": best_job.role if best_job else None,
-                    "composite_score": best_app.composite_score,
-                    "decision": best_app.decision,
-                    "rank": best_app.rank
-                }
-        
-        # Build master data for this candidate
-        candidate_master = {
-            "candidate_profile": {
-                "candidate_id": candidate.id,
-                "name": candidate.name,
-                "email": candidate.email,
-                "mobile": candidate.mobile,
-                "linkedin": candidate.linkedin,
-                "github": candidate.github,
-                "years_of_experience": candidate.experience,
-                "skills": candidate.skills_extracted,
-                "resume_text": candidate.resume_text,
-                "profile_created_at": candidate.created_at.isoformat() if candidate.created_at else None
-            },
-            
-            "application_summary": {
-                "total_applications": total_applications,
-                "selected": selected_count,
-                "rejected": rejected_count,
-                "pending": pending_count,
-                "average_composite_score": round(avg_composite_score, 2) if avg_composite_score else None,
-                "best_application": best_application
-            },
-            
-            "applications": application_details
-        }
-        
-        candidates_master_data.append(candidate_master)
+    candidates_master_data = [_build_candidate_master(candidate) for candidate in all_candidates]
     
     # Calculate global statistics
     total_applications_all = sum(c["application_summary"]["total_applications"] for c in candidates_master_data)
@@ -418,6 +333,7 @@ def get_all_candidates_master_details(
         "showing": len(candidates_master_data),
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "global_statistics": {
             "total_applications": total_applications_all,
             "total_selected": total_selected_all,
@@ -0,0 +1,21 @@
+"""
+Health Routes - Runtime diagnostics for monitoring
+"""
+from fastapi import APIRouter
+from ..database import engine, async_engine
+from ..core.db_pool import pool_status
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/db")
+def get_db_pool_status():
+    """
+    Connection pool metrics for both engines
+    
+    Per pool: size, in-use/idle connections, current overflow, checkout
+    count with average/max wait, overflow events and checkout timeouts.
+    """
+    return {
+        "pools": [pool_status(engine), pool_status(async_engine.sync_engine)]
+    }
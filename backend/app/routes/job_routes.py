@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..dependencies import get_db
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, selectinload, undefer, with_expression
+from sqlalchemy import func, select
+from ..dependencies import get_db, get_async_db
 from ..models.job import Job
 from ..models.application import Application
 from ..models.company import Company
@@ -9,11 +11,18 @@ from ..services.embedding_service import get_embedding
 from ..services.jd_parser_agent import parse_jd_pdf
 from ..services.inference_engine import extract_skills_from_text
 from ..services.audit_service import AuditService
+from ..services.explanation_context import expand_explanation
 from ..schemas.job_schema import JobListResponse
+from ..utils.pagination import keyset_page, count_rows
 from typing import List, Optional
 
 router = APIRouter(prefix="/job", tags=["Job"])
 
+# Applications per job as a correlated subquery, so a job listing stays one query
+APPLICATION_COUNT = select(func.count(Application.id)).where(
+    Application.job_id == Job.id
+).correlate(Job).scalar_subquery()
+
 @router.post("/create-with-company")
 async def create_job_with_company(
     # Company details
@@ -26,7 +35,7 @@ async def create_job_with_company(
     employment_type: str = Form("Full-time"),
     required_experience: int = Form(...),
     jd_pdf: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new company and job posting in a single API call
@@ -39,7 +48,9 @@ async def create_job_with_company(
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
     
     # Step 1: Create or get company
-    existing_company = db.query(Company).filter(Company.name == company_name).first()
+    existing_company = (await db.execute(
+        select(Company).where(Company.name == company_name)
+    )).scalars().first()
     
     if existing_company:
         company = existing_company
@@ -47,13 +58,13 @@ async def create_job_with_company(
     else:
         company = Company(name=company_name, description=company_description)
         db.add(company)
-        db.commit()
-        db.refresh(company)
+        await db.commit()
+        await db.refresh(company)
         company_status = "created"
     
-    # Step 2: Read and parse PDF
+    # Step 2: Read and parse PDF (CPU and network work runs off the event loop)
     pdf_content = await jd_pdf.read()
-    parsed_jd = parse_jd_pdf(pdf_content)
+    parsed_jd = await run_in_threadpool(parse_jd_pdf, pdf_content)
     
     if not parsed_jd["success"]:
         raise HTTPException(status_code=400, detail=f"Failed to parse PDF: {parsed_jd.get('error')}")
@@ -61,10 +72,10 @@ async def create_job_with_company(
     jd_text = parsed_jd["jd_text"]
     
     # Step 3: Extract skills from JD
-    skills_data = extract_skills_from_text(jd_text)
+    skills_data = await run_in_threadpool(extract_skills_from_text, jd_text)
     
     # Step 4: Generate embedding
-    emb = get_embedding(jd_text)
+    emb = await run_in_threadpool(get_embedding, jd_text)
 
     # Step 5: Create job record
     job = Job(
@@ -80,11 +91,11 @@ async def create_job_with_company(
     )
 
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
     
     # Step 6: Log job creation
-    AuditService.log_job_creation(db, job.id, company.id, role)
+    AuditService.log_job_creation(None, job.id, company.id, role)
     
     return {
         "company": {
@@ -123,7 +134,7 @@ async def create_job(
     employment_type: str = Form("Full-time"),
     required_experience: int = Form(...),
     jd_pdf: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new job posting by uploading JD as PDF
@@ -136,7 +147,7 @@ async def create_job(
     pdf_content = await jd_pdf.read()
     
     # Parse PDF to extract text
-    parsed_jd = parse_jd_pdf(pdf_content)
+    parsed_jd = await run_in_threadpool(parse_jd_pdf, pdf_content)
     
     if not parsed_jd["success"]:
         raise HTTPException(status_code=400, detail=f"Failed to parse PDF: {parsed_jd.get('error')}")
@@ -144,10 +155,10 @@ async def create_job(
     jd_text = parsed_jd["jd_text"]
     
     # Extract skills from JD
-    skills_data = extract_skills_from_text(jd_text)
+    skills_data = await run_in_threadpool(extract_skills_from_text, jd_text)
     
     # Generate embedding
-    emb = get_embedding(jd_text)
+    emb = await run_in_threadpool(get_embedding, jd_text)
 
     # Create job record with embeddings and skills
     job = Job(
@@ -163,11 +174,11 @@ async def create_job(
     )
 
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
+    await db.refresh(job)
     
     # Log job creation
-    AuditService.log_job_creation(db, job.id, company_id, role)
+    AuditService.log_job_creation(None, job.id, company_id, role)
     
     return {
         "job": {
@@ -197,14 +208,16 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
     Get detailed job information by ID
     Returns full job details including JD text for candidate review
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = db.query(Job).outerjoin(Job.company).options(
+        undefer(Job.jd_text),
+        undefer(Job.skills_extracted),
+        contains_eager(Job.company),
+        with_expression(Job.application_count, APPLICATION_COUNT)
+    ).filter(Job.id == job_id).first()
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get application statistics
-    application_count = db.query(Application).filter(Application.job_id == job_id).count()
-    
     return {
         "id": job.id,
         "company_id": job.company_id,
@@ -217,30 +230,64 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
         "required_experience": job.required_experience,
         "jd_text": job.jd_text,
         "created_at": job.created_at.isoformat(),
-        "application_count": application_count,
+        "application_count": job.application_count,
         "skills_required": job.skills_extracted.get("all_skills", []) if job.skills_extracted else [],
         "technical_skills": job.skills_extracted.get("technical_skills", []) if job.skills_extracted else [],
         "soft_skills": job.skills_extracted.get("soft_skills", []) if job.skills_extracted else []
     }
 
 
+# Decision value -> key in the company statistics block
+DECISION_STAT_KEYS = {
+    "Fast-Track Selected": "fast_track",
+    "Selected": "selected",
+    "Hire-Pooled": "hire_pooled",
+    "Rejected": "rejected",
+    "Review Required": "review_required",
+}
+
+# Sortable columns for the company application list
+APPLICATION_SORT_COLUMNS = {
+    "created_at": Application.created_at,
+    "composite_score": Application.composite_score,
+    "rank": Application.rank,
+    "id": Application.id,
+}
+
+
 @router.get("/{company_id}/applications")
 def get_company_applications(
     company_id: int,
     status_filter: str = None,
+    skip: int = 0,
+    limit: int = 100,
+    sort_by: str = "created_at",
+    order: str = "desc",
     db: Session = Depends(get_db)
 ):
-    """Get all applications for all jobs of a specific company"""
+    """
+    Get applications for all jobs of a specific company
+    
+    Statistics come from a single GROUP BY over the company's applications;
+    the list itself is sorted and paginated in the database.
+    """
+    if sort_by not in APPLICATION_SORT_COLUMNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort_by must be one of: {', '.join(APPLICATION_SORT_COLUMNS)}"
+        )
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    
     # Verify company exists
     company = db.query(Company).filter(Company.id == company_id).first()
     
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    # Get all jobs for this company
-    jobs = db.query(Job).filter(Job.company_id == company_id).all()
+    total_jobs = db.query(func.count(Job.id)).filter(Job.company_id == company_id).scalar()
     
-    if not jobs:
+    if not total_jobs:
         return {
             "company": {
                 "id": company.id,
@@ -248,59 +295,59 @@ def get_company_applications(
             },
             "total_applications": 0,
             "total_jobs": 0,
-            "statistics": {
-                "fast_track": 0,
-                "selected": 0,
-                "hire_pooled": 0,
-                "rejected": 0,
-                "review_required": 0
-            },
+            "statistics": {key: 0 for key in DECISION_STAT_KEYS.values()},
+            "skip": skip,
+            "limit": limit,
+            "showing": 0,
             "applications": []
         }
     
-    # Get all job IDs for this company
-    job_ids = [job.id for job in jobs]
+    # Decision breakdown across all jobs in one grouped query
+    decision_counts = dict(
+        db.query(Application.decision, func.count(Application.id)).join(
+            Job, Job.id == Application.job_id
+        ).filter(
+            Job.company_id == company_id
+        ).group_by(Application.decision).all()
+    )
     
-    # Query applications for all jobs of this company
-    query = db.query(Application).filter(Application.job_id.in_(job_ids))
+    stats = {key: decision_counts.get(decision, 0) for decision, key in DECISION_STAT_KEYS.items()}
+    
+    if status_filter:
+        total_applications = decision_counts.get(status_filter, 0)
+    else:
+        total_applications = sum(decision_counts.values())
+    
+    # Requested page of applications, with their detail payloads in one more query
+    query = db.query(Application).options(selectinload(Application.detail)).join(
+        Job, Job.id == Application.job_id
+    ).filter(Job.company_id == company_id)
     
     if status_filter:
         query = query.filter(Application.decision == status_filter)
     
-    applications = query.all()
-    
-    # Statistics across all jobs
-    stats = {
-        "fast_track": db.query(Application).filter(
-            Application.job_id.in_(job_ids),
-            Application.decision == "Fast-Track Selected"
-        ).count(),
-        "selected": db.query(Application).filter(
-            Application.job_id.in_(job_ids),
-            Application.decision == "Selected"
-        ).count(),
-        "hire_pooled": db.query(Application).filter(
-            Application.job_id.in_(job_ids),
-            Application.decision == "Hire-Pooled"
-        ).count(),
-        "rejected": db.query(Application).filter(
-            Application.job_id.in_(job_ids),
-            Application.decision == "Rejected"
-        ).count(),
-        "review_required": db.query(Application).filter(
-            Application.job_id.in_(job_ids),
-            Application.decision == "Review Required"
-        ).count(),
-    }
+    sort_column = APPLICATION_SORT_COLUMNS[sort_by]
+    if order == "desc":
+        query = query.order_by(sort_column.desc().nullslast(), Application.id.desc())
+    else:
+        query = query.order_by(sort_column.asc().nullslast(), Application.id.asc())
+    
+    applications = [
+        {**app.to_dict(), "explanation": expand_explanation(app.explanation)}
+        for app in query.offset(skip).limit(limit).all()
+    ]
     
     return {
         "company": {
             "id": company.id,
             "name": company.name
         },
-        "total_applications": len(applications),
-        "total_jobs": len(jobs),
+        "total_applications": total_applications,
+        "total_jobs": total_jobs,
         "statistics": stats,
+        "skip": skip,
+        "limit": limit,
+        "showing": len(applications),
         "applications": applications
     }
 
@@ -312,11 +359,16 @@ def list_jobs(
     employment_type: str = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact",
     db: Session = Depends(get_db)
 ):
     """
     List all available jobs with filtering options
     Returns job listings with company information for candidate browsing
+    
+    Pass `next_cursor` from the previous response as `cursor` to page through
+    results; `count` selects an exact, approximate or no total.
     """
     query = db.query(Job).join(Company)
     
@@ -329,17 +381,22 @@ def list_jobs(
     if employment_type:
         query = query.filter(Job.employment_type == employment_type)
     
-    # Order by most recent first
-    query = query.order_by(Job.created_at.desc())
+    # Most recent first, paged by (created_at, id); company and application
+    # count come back in the same row as each job
+    page_query = query.options(
+        undefer(Job.skills_extracted),
+        contains_eager(Job.company),
+        with_expression(Job.application_count, APPLICATION_COUNT)
+    )
     
-    total = query.count()
-    jobs = query.offset(skip).limit(limit).all()
+    try:
+        total = count_rows(db, query, count)
+        jobs, next_cursor = keyset_page(page_query, Job, limit, cursor=cursor, skip=skip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Enrich job data with company info and application counts
     jobs_data = []
     for job in jobs:
-        application_count = db.query(Application).filter(Application.job_id == job.id).count()
-        
         jobs_data.append({
             "id": job.id,
             "role": job.role,
@@ -350,7 +407,7 @@ def list_jobs(
             "employment_type": job.employment_type,
             "required_experience": job.required_experience,
             "created_at": job.created_at.isoformat(),
-            "application_count": application_count,
+            "application_count": job.application_count,
             "skills_preview": job.skills_extracted.get("all_skills", [])[:5] if job.skills_extracted else []
         })
     
@@ -359,5 +416,6 @@ def list_jobs(
         "showing": len(jobs_data),
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "jobs": jobs_data
     }
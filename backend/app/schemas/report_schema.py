@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class ReportJobCreate(BaseModel):
+    limit: int = Field(50, ge=1)  # capped at REPORT_MAX_CANDIDATES
+    skip: int = Field(0, ge=0)
+    cursor: Optional[str] = None  # X-Next-Cursor / next_cursor of a previous report
+
+
+class ReportJobResponse(BaseModel):
+    report_id: str
+    status: str  # queued / running / completed / failed / expired
+    deduplicated: bool = False  # an existing job for the same parameters and data was returned
+    params: dict
+    candidate_count: Optional[int] = None
+    file_size: Optional[int] = None
+    next_cursor: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    status_url: str
+    file_url: Optional[str] = None  # set once the report is completed
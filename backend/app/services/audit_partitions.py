@@ -0,0 +1,205 @@
+"""
+Audit Partitions - Monthly partition maintenance and retention for audit_logs
+
+audit_logs is range-partitioned on timestamp, one partition per calendar month
+(audit_logs_YYYY_MM) plus audit_logs_default for anything outside them.
+Queries that filter on timestamp only scan the months they cover.
+
+- ensure_partitions() creates the current month and the next
+  AUDIT_PARTITION_MONTHS_AHEAD months; it runs at startup and from
+  manage_audit_partitions.py.
+- apply_retention() detaches months older than AUDIT_RETENTION_MONTHS,
+  exports each to AUDIT_ARCHIVE_DIR as zstd-compressed JSONL and drops it.
+"""
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from ..config import AUDIT_ARCHIVE_DIR, AUDIT_PARTITION_MONTHS_AHEAD, AUDIT_RETENTION_MONTHS
+from ..database import engine
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+PARTITION_NAME = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+ARCHIVE_BATCH_ROWS = 5000
+
+
+def month_start(value: datetime) -> datetime:
+    """Midnight on the first day of value's month"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """First day of the month `months` after value's month (negative goes back)"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def is_partition_table(name: str) -> bool:
+    """True for audit_logs child tables, which the models do not describe"""
+    return name == DEFAULT_PARTITION or bool(PARTITION_NAME.match(name))
+
+
+def _month_of(name: str) -> Optional[datetime]:
+    match = PARTITION_NAME.match(name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def list_partitions(conn) -> List[Dict]:
+    """Attached monthly partitions, oldest first, with the planner's row estimate"""
+    rows = conn.execute(text("""
+        SELECT child.relname, child.reltuples
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = CAST(:parent AS regclass)
+    """), {"parent": PARENT_TABLE}).all()
+
+    partitions = []
+    for name, estimate in rows:
+        month = _month_of(name)
+        if month:
+            partitions.append({
+                "name": name,
+                "start": month,
+                "end": add_months(month, 1),
+                "rows_estimate": max(int(estimate), 0),
+            })
+    return sorted(partitions, key=lambda p: p["start"])
+
+
+def _detached_partitions(conn) -> List[str]:
+    """Monthly tables left detached by an interrupted retention run"""
+    rows = conn.execute(text("""
+        SELECT tablename FROM pg_tables
+        WHERE schemaname = current_schema()
+          AND tablename LIKE 'audit\\_logs\\_%'
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_inherits
+              WHERE pg_inherits.inhrelid = to_regclass(pg_tables.tablename)
+          )
+    """)).scalars().all()
+    return sorted(name for name in rows if PARTITION_NAME.match(name))
+
+
+def create_partition(conn, month: datetime) -> bool:
+    """
+    Create and attach the partition for `month`; False if it already exists
+
+    Rows for that month already sitting in the default partition are moved
+    into the new table first, otherwise ATTACH would be rejected. The default
+    partition is locked against writes for the duration, so run this inside
+    a transaction.
+    """
+    name = partition_name(month)
+    # Taken before the existence check so concurrent workers starting up queue here
+    conn.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        return False
+
+    bounds = {"start": month, "end": add_months(month, 1)}
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE timestamp >= :start AND timestamp < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), bounds).rowcount
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+    ))
+
+    print(f"[Audit] Created partition {name}" + (f" ({moved} rows moved from default)" if moved else ""))
+    return True
+
+
+def ensure_partitions(months_ahead: int = AUDIT_PARTITION_MONTHS_AHEAD, now: Optional[datetime] = None) -> List[str]:
+    """Create any missing partitions from the current month to `months_ahead` months out"""
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        with engine.begin() as conn:
+            if create_partition(conn, month):
+                created.append(partition_name(month))
+    return created
+
+
+def archive_table(conn, name: str, archive_dir: str) -> Dict:
+    """Stream every row of `name` to <archive_dir>/<name>.jsonl.zst; returns the path and row count"""
+    import zstandard
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.jsonl.zst")
+    partial = f"{path}.partial"
+
+    rows = 0
+    result = conn.execution_options(stream_results=True, yield_per=ARCHIVE_BATCH_ROWS).execute(
+        text(f"SELECT * FROM {name} ORDER BY timestamp, id")
+    )
+    with open(partial, "wb") as raw:
+        with zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False) as archive:
+            for row in result.mappings():
+                line = json.dumps(
+                    {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+                )
+                archive.write(line.encode("utf-8") + b"\n")
+                rows += 1
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial, path)
+
+    return {"partition": name, "rows": rows, "archive": path}
+
+
+def apply_retention(
+    retention_months: int = AUDIT_RETENTION_MONTHS,
+    archive_dir: str = AUDIT_ARCHIVE_DIR,
+    now: Optional[datetime] = None,
+    dry_run: bool = False
+) -> List[Dict]:
+    """
+    Archive and drop monthly partitions that ended more than `retention_months` ago
+
+    Each partition is detached first (its own short transaction), then
+    exported and dropped. A partition is only dropped once its archive file
+    is fully written; if the export fails the detached table is kept and
+    picked up by the next run. retention_months <= 0 keeps everything.
+    """
+    if retention_months <= 0:
+        return []
+
+    cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+
+    with engine.connect() as conn:
+        expired = [p["name"] for p in list_partitions(conn) if p["end"] <= cutoff]
+        leftover = [name for name in _detached_partitions(conn) if add_months(_month_of(name), 1) <= cutoff]
+
+    if dry_run:
+        return [{"partition": name, "rows": None, "archive": None} for name in leftover + expired]
+
+    for name in expired:
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        print(f"[Audit] Detached partition {name}")
+
+    archived = []
+    for name in sorted(set(leftover + expired)):
+        with engine.connect() as conn:
+            result = archive_table(conn, name, archive_dir)
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE {name}"))
+        print(f"[Audit] Archived {result['rows']} rows from {name} to {result['archive']}")
+        archived.append(result)
+
+    return archived
@@ -1,12 +1,18 @@
 """
 Audit Service - Comprehensive logging and tracking of all hiring decisions
 Ensures transparency, compliance, and data-driven insights
+
+The log_* methods only queue the event; audit_writer persists it in batches
+off the request path and never touch `db`; it is still accepted so callers
+need not change, and may be None (the async routes have no sync session).
 """
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Dict, Optional, List
-import json
 from ..models.audit_log import AuditLog
+from .audit_partitions import month_start
+from .audit_writer import audit_writer
 
 
 class AuditService:
@@ -14,7 +20,7 @@ class AuditService:
     
     @staticmethod
     def log_application_evaluation(
-        db: Session,
+        db: Optional[Session],
         application_id: int,
         job_id: int,
         candidate_id: int,
@@ -23,12 +29,12 @@ class AuditService:
         decision: str,
         decision_reason: str,
         explanation: Dict
-    ) -> AuditLog:
+    ) -> None:
         """
         Log a complete application evaluation
         
         Args:
-            db: Database session
+            db: Unused, may be None
             application_id: ID of the application
             job_id: ID of the job
             candidate_id: ID of the candidate
@@ -38,16 +44,17 @@ class AuditService:
             decision_reason: Reason for decision
             explanation: Detailed explanation
             
-        Returns:
-            Created audit log entry
+        The event is queued and written asynchronously by audit_writer.
         """
-        audit_entry = AuditLog(
+        audit_writer.submit(
             event_type="application_evaluation",
             entity_type="application",
             entity_id=application_id,
-            user_id=None,  # System-generated
+            user_id=None,
             action="evaluate",
-            details=json.dumps({
+            job_id=job_id,
+            decision=decision,
+            details={
                 "job_id": job_id,
                 "candidate_id": candidate_id,
                 "scores": scores,
@@ -55,141 +62,119 @@ class AuditService:
                 "decision": decision,
                 "decision_reason": decision_reason,
                 "explanation": explanation
-            }),
-            ip_address=None,
-            timestamp=datetime.utcnow()
+            }
         )
-        
-        db.add(audit_entry)
-        db.commit()
-        db.refresh(audit_entry)
-        
-        return audit_entry
     
     @staticmethod
     def log_job_creation(
-        db: Session,
+        db: Optional[Session],
         job_id: int,
         company_id: int,
         role: str,
         user_id: Optional[int] = None
-    ) -> AuditLog:
+    ) -> None:
         """Log job posting creation"""
-        audit_entry = AuditLog(
+        audit_writer.submit(
             event_type="job_creation",
             entity_type="job",
             entity_id=job_id,
             user_id=user_id,
             action="create",
-            details=json.dumps({
+            details={
                 "company_id": company_id,
                 "role": role,
                 "created_at": datetime.utcnow().isoformat()
-            }),
-            timestamp=datetime.utcnow()
+            }
         )
-        
-        db.add(audit_entry)
-        db.commit()
-        db.refresh(audit_entry)
-        
-        return audit_entry
     
     @staticmethod
     def log_candidate_registration(
-        db: Session,
+        db: Optional[Session],
         candidate_id: int,
         email: str
-    ) -> AuditLog:
+    ) -> None:
         """Log candidate registration"""
-        audit_entry = AuditLog(
+        audit_writer.submit(
             event_type="candidate_registration",
             entity_type="candidate",
             entity_id=candidate_id,
             user_id=None,
             action="create",
-            details=json.dumps({
+            details={
                 "email": email,
                 "registered_at": datetime.utcnow().isoformat()
-            }),
-            timestamp=datetime.utcnow()
+            }
         )
-        
-        db.add(audit_entry)
-        db.commit()
-        db.refresh(audit_entry)
-        
-        return audit_entry
     
     @staticmethod
     def log_fraud_detection(
-        db: Session,
+        db: Optional[Session],
         candidate_id: int,
         fraud_details: Dict
-    ) -> AuditLog:
+    ) -> None:
         """Log fraud detection event"""
-        audit_entry = AuditLog(
+        audit_writer.submit(
             event_type="fraud_detection",
             entity_type="candidate",
             entity_id=candidate_id,
             user_id=None,
             action="flag",
-            details=json.dumps({
+            details={
                 "fraud_analysis": fraud_details,
                 "flagged_at": datetime.utcnow().isoformat()
-            }),
-            timestamp=datetime.utcnow()
+            }
         )
+    
+    @staticmethod
+    def _since(query, since: Optional[datetime]):
+        """
+        Skip events before `since` (an entity's created_at)
         
-        db.add(audit_entry)
-        db.commit()
-        db.refresh(audit_entry)
-        
-        return audit_entry
+        Rounded down to the start of the month so only the partitions from
+        that month on are scanned, without risking clock skew between hosts.
+        """
+        if since is None:
+            return query
+        return query.filter(AuditLog.timestamp >= month_start(since))
     
     @staticmethod
     def get_application_history(
         db: Session,
-        application_id: int
+        application_id: int,
+        since: Optional[datetime] = None
     ) -> List[AuditLog]:
         """Retrieve complete audit history for an application"""
-        return db.query(AuditLog).filter(
+        query = db.query(AuditLog).filter(
             AuditLog.entity_type == "application",
             AuditLog.entity_id == application_id
-        ).order_by(AuditLog.timestamp.desc()).all()
+        )
+        return AuditService._since(query, since).order_by(AuditLog.timestamp.desc()).all()
     
     @staticmethod
     def get_candidate_history(
         db: Session,
-        candidate_id: int
+        candidate_id: int,
+        since: Optional[datetime] = None
     ) -> List[AuditLog]:
         """Retrieve complete audit history for a candidate"""
-        return db.query(AuditLog).filter(
+        query = db.query(AuditLog).filter(
             AuditLog.entity_type == "candidate",
             AuditLog.entity_id == candidate_id
-        ).order_by(AuditLog.timestamp.desc()).all()
+        )
+        return AuditService._since(query, since).order_by(AuditLog.timestamp.desc()).all()
     
     @staticmethod
     def get_job_applications_audit(
         db: Session,
-        job_id: int
+        job_id: int,
+        since: Optional[datetime] = None
     ) -> List[AuditLog]:
         """Retrieve all application evaluations for a specific job"""
-        logs = db.query(AuditLog).filter(
+        query = db.query(AuditLog).filter(
+            AuditLog.job_id == job_id,
             AuditLog.event_type == "application_evaluation"
-        ).all()
-        
-        # Filter by job_id in details
-        job_logs = []
-        for log in logs:
-            try:
-                details = json.loads(log.details)
-                if details.get("job_id") == job_id:
-                    job_logs.append(log)
-            except:
-                continue
-        
-        return sorted(job_logs, key=lambda x: x.timestamp, reverse=True)
+        )
+        return AuditService._since(query, since).order_by(AuditLog.timestamp.desc()).all()
     
     @staticmethod
     def get_fraud_flags(
@@ -201,41 +186,59 @@ class AuditService:
             AuditLog.event_type == "fraud_detection"
         ).order_by(AuditLog.timestamp.desc()).limit(limit).all()
     
+    @staticmethod
+    def search_events(
+        db: Session,
+        match: Dict,
+        event_type: Optional[str] = None,
+        limit: int = 100
+    ) -> List[AuditLog]:
+        """
+        Find events whose details contain `match`
+        
+        Uses JSONB containment (@>), served by the GIN index on details, e.g.
+        {"fraud_analysis": {"fraud_flag": True}} or {"decision_reason": "..."}.
+        """
+        query = db.query(AuditLog).filter(AuditLog.details.contains(match))
+        if event_type:
+            query = query.filter(AuditLog.event_type == event_type)
+        return query.order_by(AuditLog.timestamp.desc()).limit(limit).all()
+    
     @staticmethod
     def generate_audit_report(
         db: Session,
         start_date: datetime,
         end_date: datetime
     ) -> Dict:
-        """Generate comprehensive audit report for a time period"""
-        logs = db.query(AuditLog).filter(
+        """
+        Generate comprehensive audit report for a time period
+        
+        A single GROUP BY over (event_type, decision) in the database; only
+        the handful of aggregate rows come back, however many events exist.
+        """
+        rows = db.query(
+            AuditLog.event_type,
+            AuditLog.decision,
+            func.count()
+        ).filter(
             AuditLog.timestamp >= start_date,
             AuditLog.timestamp <= end_date
-        ).all()
+        ).group_by(AuditLog.event_type, AuditLog.decision).all()
         
-        # Aggregate statistics
         event_counts = {}
-        for log in logs:
-            event_type = log.event_type
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-        
-        # Decision distribution
         decisions = {}
-        for log in logs:
-            if log.event_type == "application_evaluation":
-                try:
-                    details = json.loads(log.details)
-                    decision = details.get("decision", "unknown")
-                    decisions[decision] = decisions.get(decision, 0) + 1
-                except:
-                    continue
+        for event_type, decision, count in rows:
+            event_counts[event_type] = event_counts.get(event_type, 0) + count
+            if event_type == "application_evaluation":
+                decision = decision or "unknown"
+                decisions[decision] = decisions.get(decision, 0) + count
         
         return {
             "period": {
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat()
             },
-            "total_events": len(logs),
+            "total_events": sum(event_counts.values()),
             "event_breakdown": event_counts,
             "decision_distribution": decisions,
             "fraud_flags": event_counts.get("fraud_detection", 0),
@@ -246,40 +249,33 @@ class AuditService:
     
     @staticmethod
     def log_decision_override(
-        db: Session,
+        db: Optional[Session],
         application_id: int,
         original_decision: str,
         new_decision: str,
         user_id: int,
         reason: str
-    ) -> AuditLog:
+    ) -> None:
         """Log when a human overrides an AI decision"""
-        audit_entry = AuditLog(
+        audit_writer.submit(
             event_type="decision_override",
             entity_type="application",
             entity_id=application_id,
             user_id=user_id,
             action="override",
-            details=json.dumps({
+            details={
                 "original_decision": original_decision,
                 "new_decision": new_decision,
                 "reason": reason,
                 "overridden_at": datetime.utcnow().isoformat()
-            }),
-            timestamp=datetime.utcnow()
+            }
         )
-        
-        db.add(audit_entry)
-        db.commit()
-        db.refresh(audit_entry)
-        
-        return audit_entry
 
 
 # Easy access functions
-def log_evaluation(db: Session, application_id: int, job_id: int, candidate_id: int,
+def log_evaluation(db: Optional[Session], application_id: int, job_id: int, candidate_id: int,
                    scores: Dict, fraud_analysis: Dict, decision: str, 
-                   decision_reason: str, explanation: Dict) -> AuditLog:
+                   decision_reason: str, explanation: Dict) -> None:
     """Log application evaluation"""
     return AuditService.log_application_evaluation(
         db, application_id, job_id, candidate_id, scores, 
@@ -287,6 +283,6 @@ def log_evaluation(db: Session, application_id: int, job_id: int, candidate_id:
     )
 
 
-def log_fraud(db: Session, candidate_id: int, fraud_details: Dict) -> AuditLog:
+def log_fraud(db: Optional[Session], candidate_id: int, fraud_details: Dict) -> None:
     """Log fraud detection"""
     return AuditService.log_fraud_detection(db, candidate_id, fraud_details)
@@ -0,0 +1,407 @@
+"""
+Audit Writer - Batched, asynchronous persistence of audit events
+
+AuditService hands events to an in-process buffer instead of writing them on
+the request path. A background thread drains the buffer with one multi-row
+INSERT per batch, whenever AUDIT_BATCH_SIZE events are waiting or
+AUDIT_FLUSH_INTERVAL seconds have passed since the last flush.
+
+Events that cannot be written (database unavailable, buffer overflow, or a
+failed final flush at shutdown) are appended to the AUDIT_SPOOL_PATH JSONL
+file. The writer thread replays the spool when it starts and again whenever
+it finds spooled events, backing off from AUDIT_REPLAY_BACKOFF up to
+AUDIT_REPLAY_MAX_BACKOFF seconds while replays keep failing. A batch the
+database rejects AUDIT_REPLAY_MAX_ATTEMPTS times (rather than being
+unreachable) moves to AUDIT_SPOOL_PATH.dead for manual inspection.
+
+Every worker process shares the spool, so appends and the hand-off to a
+replay take an exclusive flock on AUDIT_SPOOL_PATH.lock, and a replay file
+stays flocked while it is replayed. Replay files left by a worker that died
+mid-replay are unlocked and get picked up by the next replay.
+"""
+import atexit
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from ..config import (
+    AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL, AUDIT_MAX_BUFFER, AUDIT_REPLAY_BACKOFF,
+    AUDIT_REPLAY_MAX_ATTEMPTS, AUDIT_REPLAY_MAX_BACKOFF, AUDIT_SPOOL_PATH
+)
+from ..database import engine
+from ..models.audit_log import AuditLog
+
+# The database could not be reached; retrying later does not count as an attempt
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, OSError)
+
+
+class AuditWriter:
+    """Buffers audit events and writes them to audit_logs in batches"""
+
+    def __init__(
+        self,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        max_buffer: int = AUDIT_MAX_BUFFER,
+        spool_path: str = AUDIT_SPOOL_PATH,
+        replay_backoff: float = AUDIT_REPLAY_BACKOFF,
+        replay_max_backoff: float = AUDIT_REPLAY_MAX_BACKOFF,
+        replay_max_attempts: int = AUDIT_REPLAY_MAX_ATTEMPTS
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        # Absolute, so the spool, its lock and dead letters stay put if the cwd changes
+        self.spool_path = os.path.abspath(spool_path)
+        self.dead_letter_path = f"{self.spool_path}.dead"
+        self.replay_backoff = replay_backoff
+        self.replay_max_backoff = replay_max_backoff
+        self.replay_max_attempts = replay_max_attempts
+
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # one batch in flight at a time
+        self._spool_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._atexit_registered = False
+        self._replay_delay = 0.0
+        self._next_replay = 0.0  # time.monotonic() of the next spool replay
+        self._replay_pending = False  # the last replay left events in the spool
+
+        self.events_written = 0
+        self.events_spooled = 0
+        self.events_dead_lettered = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the flush thread; it first replays anything spooled by a previous run"""
+        with self._condition:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+        if not self._atexit_registered:
+            # Scripts that never run the app lifespan still get a final flush
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+        print(f"[Audit] Writer started (batch={self.batch_size}, interval={self.flush_interval}s)")
+
+    def stop(self, timeout: float = 10.0):
+        """Flush whatever is buffered and stop the thread; unwritten events go to the spool"""
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify_all()
+
+        if thread:
+            thread.join(timeout)
+        self._thread = None
+
+        if not self.flush():
+            self._spool(self._drain())
+        print(f"[Audit] Writer stopped ({self.events_written} written, {self.events_spooled} spooled)")
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        event_type: str,
+        entity_type: str,
+        entity_id: int,
+        action: str,
+        details: Dict,
+        user_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        job_id: Optional[int] = None,
+        decision: Optional[str] = None
+    ):
+        """
+        Queue one audit event; returns immediately
+
+        `details` is serialised on the writer thread, so callers must not
+        mutate it after submitting. `job_id` and `decision` fill the promoted
+        report columns. If the flush thread is not running (a script that never
+        ran the app lifespan, or a crashed thread) it is started; any spool
+        replay happens on that thread, never here.
+        """
+        event = {
+            "event_type": event_type,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "ip_address": ip_address,
+            "job_id": job_id,
+            "decision": decision,
+            "timestamp": datetime.utcnow(),
+        }
+
+        if not self.running:
+            self.start()
+
+        with self._condition:
+            if len(self._buffer) >= self.max_buffer:
+                overflow = True
+            else:
+                overflow = False
+                self._buffer.append(event)
+                if len(self._buffer) >= self.batch_size:
+                    self._condition.notify()
+
+        if overflow:
+            print(f"[Audit] Buffer full ({self.max_buffer} events), spooling to disk")
+            self._spool([event])
+
+    def pending(self) -> int:
+        """Number of buffered events not yet written"""
+        with self._condition:
+            return len(self._buffer)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def flush(self) -> bool:
+        """
+        Write every buffered event now, in batches of batch_size
+
+        Returns False if a batch could not be written; that batch is spooled
+        and the remaining events stay buffered for the next attempt.
+        """
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return True
+                try:
+                    self._insert(batch)
+                except Exception as e:
+                    print(f"[Audit] Failed to write {len(batch)} events: {e}")
+                    self._spool(batch)
+                    return False
+
+    def _run(self):
+        while True:
+            self._retry_spool()
+            with self._condition:
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                stopping = self._stopping
+
+            self.flush()
+            if stopping:
+                return
+
+    def _drain(self, limit: Optional[int] = None) -> List[Dict]:
+        with self._condition:
+            count = len(self._buffer) if limit is None else min(limit, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _retry_spool(self):
+        """Replay the spool if it holds events, backing off while replays keep failing"""
+        if time.monotonic() < self._next_replay or not self._spool_waiting():
+            return
+        try:
+            self.replay_spool()
+        except Exception as e:
+            print(f"[Audit] Spool replay failed: {e}")
+            self._replay_pending = True
+
+        if self._replay_pending:
+            self._replay_delay = min(max(self._replay_delay * 2, self.replay_backoff), self.replay_max_backoff)
+            print(f"[Audit] Retrying the spool in {self._replay_delay:.0f}s")
+        else:
+            self._replay_delay = 0.0
+        self._next_replay = time.monotonic() + self._replay_delay
+
+    def _insert(self, batch: List[Dict]):
+        """One executemany INSERT; SQLAlchemy sends it as multi-row VALUES"""
+        with engine.begin() as conn:
+            conn.execute(AuditLog.__table__.insert(), batch)
+        self.events_written += len(batch)
+
+    # ------------------------------------------------------------------
+    # Durable fallback
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked_spool(self):
+        """Exclusive across this process's threads and every other worker process"""
+        with self._spool_lock:
+            with open(f"{self.spool_path}.lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _append(self, path: str, events: List[Dict]):
+        with self._locked_spool():
+            with open(path, "a", encoding="utf-8") as spool:
+                for event in events:
+                    spool.write(json.dumps(
+                        {**event, "timestamp": event["timestamp"].isoformat()}, default=str
+                    ) + "\n")
+
+    def _spool(self, events: List[Dict]):
+        if not events:
+            return
+        self._append(self.spool_path, events)
+        self.events_spooled += len(events)
+
+    def _dead_letter(self, events: List[Dict]):
+        if not events:
+            return
+        self._append(self.dead_letter_path, events)
+        self.events_dead_lettered += len(events)
+        print(f"[Audit] {len(events)} events failed {self.replay_max_attempts} replays, "
+              f"moved to {self.dead_letter_path}")
+
+    def _replay_glob(self) -> str:
+        return f"{glob.escape(self.spool_path)}.*.replay"
+
+    def _spool_waiting(self) -> bool:
+        return os.path.exists(self.spool_path) or bool(glob.glob(self._replay_glob()))
+
+    @staticmethod
+    def _claim(path: str):
+        """Open and flock a replay file, or None if another worker is replaying it"""
+        try:
+            handle = open(path, encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return None
+        if os.fstat(handle.fileno()).st_nlink == 0:
+            handle.close()  # replayed and removed while we waited
+            return None
+        return handle
+
+    def replay_spool(self) -> int:
+        """
+        Insert events left in the spool by earlier failures; returns how many
+
+        The spool is renamed to a name unique to this call under the lock, so
+        when several workers replay at once exactly one of them gets each
+        event. Unlocked replay files of a worker that died mid-replay are
+        claimed too.
+        """
+        claimed = []
+        with self._locked_spool():
+            for path in glob.glob(self._replay_glob()):
+                handle = self._claim(path)
+                if handle:
+                    claimed.append((path, handle))
+
+            replay_path = f"{self.spool_path}.{os.getpid()}.{uuid.uuid4().hex}.replay"
+            try:
+                os.replace(self.spool_path, replay_path)
+            except FileNotFoundError:
+                pass  # nothing spooled, or another worker took it
+            else:
+                claimed.append((replay_path, self._claim(replay_path)))
+
+        replayed = 0
+        pending = False
+        for path, handle in claimed:
+            try:
+                count, retry = self._replay_file(handle)
+                replayed += count
+                pending = pending or retry
+                os.remove(path)  # still flocked, so no other worker can claim it now
+            finally:
+                handle.close()
+
+        self._replay_pending = pending
+        if replayed:
+            print(f"[Audit] Replayed {replayed} spooled events")
+        return replayed
+
+    def _replay_file(self, handle) -> Tuple[int, bool]:
+        """Insert one claimed replay file; returns (events written, events re-spooled)"""
+        events = []
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+                event["timestamp"] = datetime.fromisoformat(event["timestamp"])
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"[Audit] Unreadable spool line moved to {self.dead_letter_path}: {e}")
+                with self._locked_spool(), open(self.dead_letter_path, "a", encoding="utf-8") as dead:
+                    dead.write(line if line.endswith("\n") else line + "\n")
+                continue
+            event.setdefault("job_id", None)
+            event.setdefault("decision", None)
+            events.append(event)
+
+        replayed = 0
+        retry, dead = [], []
+        unreachable = False
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            if unreachable:
+                retry.extend(batch)
+                continue
+            try:
+                self._insert([{key: value for key, value in event.items() if key != "attempts"} for event in batch])
+                replayed += len(batch)
+            except TRANSIENT_ERRORS as e:
+                print(f"[Audit] Spool replay failed, database unreachable: {e}")
+                unreachable = True
+                retry.extend(batch)
+            except Exception as e:
+                print(f"[Audit] Spool replay rejected {len(batch)} events: {e}")
+                for event in batch:
+                    event["attempts"] = event.get("attempts", 0) + 1
+                    (dead if event["attempts"] >= self.replay_max_attempts else retry).append(event)
+
+        self._spool(retry)
+        self._dead_letter(dead)
+        return replayed, bool(retry)
+
+
+# Global instance
+audit_writer = AuditWriter()
+
+
+def start_audit_writer():
+    """Start the background flush thread"""
+    audit_writer.start()
+
+
+def stop_audit_writer():
+    """Flush pending events and stop the background thread"""
+    audit_writer.stop()
+
+
+def flush_audit_events() -> bool:
+    """Write all buffered events synchronously"""
+    return audit_writer.flush()
@@ -0,0 +1,144 @@
+"""
+Candidate Summary Service - Incremental per-candidate rollups
+Keeps candidate_summary in step with applications so dashboards can be served
+from one row per candidate instead of re-reading every application
+"""
+from sqlalchemy import case, func, select, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+from ..models.application import Application
+from ..models.candidate_summary import CandidateSummary
+
+# (minimum composite score, tier), checked in order
+TIER_THRESHOLDS = [
+    (0.85, "Excellent"),
+    (0.70, "Good"),
+    (0.50, "Average"),
+]
+DEFAULT_TIER = "Poor"
+
+SELECTED_DECISIONS = ["Fast-Track Selected", "Selected"]
+
+
+def get_tier(score: float) -> str:
+    """Classify candidate into tier based on composite score"""
+    for threshold, tier in TIER_THRESHOLDS:
+        if score >= threshold:
+            return tier
+    return DEFAULT_TIER
+
+
+def get_status(decision: str) -> str:
+    """Convert decision to status"""
+    if decision in SELECTED_DECISIONS:
+        return "Selected"
+    elif decision == "Rejected":
+        return "Rejected"
+    else:
+        return "Pending"
+
+
+def tier_expression(score_column):
+    """SQL equivalent of get_tier()"""
+    return case(
+        *[(score_column >= threshold, tier) for threshold, tier in TIER_THRESHOLDS],
+        else_=DEFAULT_TIER
+    )
+
+
+def status_expression(decision_column):
+    """SQL equivalent of get_status()"""
+    return case(
+        (decision_column.in_(SELECTED_DECISIONS), "Selected"),
+        (decision_column == "Rejected", "Rejected"),
+        else_="Pending"
+    )
+
+
+def update_candidate_summary(db: Session, application: Application) -> None:
+    """
+    Fold a newly evaluated application into its candidate's summary row
+
+    Single upsert: the application count is incremented and the best-application
+    fields are replaced only when the new score beats the stored one. Does not
+    commit; the caller owns the transaction.
+    """
+    score = application.composite_score or 0.0
+    
+    stmt = insert(CandidateSummary).values(
+        candidate_id=application.candidate_id,
+        best_application_id=application.id,
+        best_score=score,
+        decision=application.decision,
+        status=get_status(application.decision),
+        tier=get_tier(score),
+        total_applications=1,
+        updated_at=datetime.utcnow()
+    )
+    
+    excluded = stmt.excluded
+    is_better = func.coalesce(CandidateSummary.best_score, -1.0) < excluded.best_score
+    
+    def keep_best(column):
+        return case((is_better, getattr(excluded, column.key)), else_=column)
+    
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CandidateSummary.candidate_id],
+        set_={
+            "total_applications": CandidateSummary.total_applications + 1,
+            "best_application_id": keep_best(CandidateSummary.best_application_id),
+            "best_score": keep_best(CandidateSummary.best_score),
+            "decision": keep_best(CandidateSummary.decision),
+            "status": keep_best(CandidateSummary.status),
+            "tier": keep_best(CandidateSummary.tier),
+            "updated_at": excluded.updated_at
+        }
+    )
+    db.execute(stmt)
+
+
+def rebuild_candidate_summaries(db: Session) -> int:
+    """
+    Recompute every summary row from the applications table
+
+    Used to backfill existing data; the pipeline keeps rows current afterwards.
+    Returns the number of summary rows written.
+    """
+    score = func.coalesce(Application.composite_score, 0.0)
+    
+    ranked = select(
+        Application.candidate_id,
+        Application.id.label("best_application_id"),
+        score.label("best_score"),
+        Application.decision,
+        func.count().over(partition_by=Application.candidate_id).label("total_applications"),
+        func.row_number().over(
+            partition_by=Application.candidate_id,
+            order_by=(score.desc(), Application.id.asc())
+        ).label("position")
+    ).subquery()
+    
+    best = select(
+        ranked.c.candidate_id,
+        ranked.c.best_application_id,
+        ranked.c.best_score,
+        ranked.c.decision,
+        status_expression(ranked.c.decision),
+        tier_expression(ranked.c.best_score),
+        ranked.c.total_applications,
+        literal(datetime.utcnow())
+    ).where(ranked.c.position == 1)
+    
+    db.query(CandidateSummary).delete(synchronize_session=False)
+    result = db.execute(
+        insert(CandidateSummary).from_select(
+            [
+                "candidate_id", "best_application_id", "best_score", "decision",
+                "status", "tier", "total_applications", "updated_at"
+            ],
+            best
+        )
+    )
+    db.commit()
+    return result.rowcount
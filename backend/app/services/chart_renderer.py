@@ -0,0 +1,226 @@
+"""
+Chart Renderer - Score charts for PDF reports, rendered in a process pool
+
+matplotlib is slow and its pyplot state machine is not thread-safe, so the
+master report used to draw every application's chart serially on the
+request thread. Charts are now described by a hashable key (the four
+scores as rounded percentages, exactly what the chart shows) and rendered
+to PNG bytes by worker processes, a whole report batch at a time.
+
+Rendered PNGs are kept in an LRU cache by key: applications with the same
+rounded scores share one image, and repeat reports skip rendering
+altogether.
+
+CHART_RENDER_WORKERS sets the pool size (0 = one per CPU); with 1 worker,
+or if the pool cannot be started, charts are rendered in-process.
+
+With REPORT_CHART_RENDERER=vector (the default) the PNG path is skipped
+entirely: draw_score_chart() builds the same chart from reportlab.graphics
+shapes, which the PDF stores as a few hundred bytes of vector operators.
+benchmark_charts.py compares the two.
+"""
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+from ..config import CHART_CACHE_SIZE, CHART_RENDER_WORKERS
+
+if TYPE_CHECKING:
+    from reportlab.graphics.shapes import Drawing
+
+ScoreKey = Tuple[float, float, float, float]
+
+SCORE_FIELDS = ['role_fit_score', 'domain_competency_score', 'experience_level_compatibility', 'composite_score']
+SCORE_LABELS = ['RFS', 'DCS', 'ELC', 'Composite']
+BAR_COLORS = ['#3498db', '#2ecc71', '#f39c12', '#e74c3c']
+
+
+def score_key(scores: Dict) -> ScoreKey:
+    """Cache key for a score chart: each score as a percentage rounded to the label's precision"""
+    return tuple(round((scores.get(field) or 0) * 100, 1) for field in SCORE_FIELDS)
+
+
+def render_score_chart(key: ScoreKey) -> bytes:
+    """
+    Draw the score breakdown bar chart as PNG bytes
+
+    Runs in the worker processes, so it uses matplotlib's object API on a
+    private Figure instead of pyplot's global state.
+    """
+    from io import BytesIO
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6, 2.5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    bars = ax.barh(SCORE_LABELS, key, color=BAR_COLORS)
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width, bar.get_y() + bar.get_height()/2,
+                f'{width:.1f}%',
+                ha='left', va='center', fontsize=9, fontweight='bold')
+
+    ax.set_xlim(0, 100)
+    ax.set_xlabel('Score (%)', fontsize=10, fontweight='bold')
+    ax.set_title('Score Breakdown', fontsize=11, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+    fig.tight_layout()
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+# Vector chart geometry (points), matching the 5 x 2 inch image it replaces
+CHART_WIDTH = 5 * 72
+CHART_HEIGHT = 2 * 72
+PLOT_LEFT = 52
+PLOT_RIGHT = CHART_WIDTH - 34  # room for a "100.0%" label
+PLOT_BOTTOM = 30
+PLOT_TOP = CHART_HEIGHT - 20
+BAR_FILL = 0.8  # share of each row the bar covers
+
+
+def draw_score_chart(key: ScoreKey) -> "Drawing":
+    """The score breakdown bar chart as a reportlab vector Drawing (same layout as the PNG)"""
+    from reportlab.graphics.shapes import Drawing, Line, Rect, String
+    from reportlab.lib import colors
+
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    plot_width = PLOT_RIGHT - PLOT_LEFT
+    row_height = (PLOT_TOP - PLOT_BOTTOM) / len(SCORE_LABELS)
+
+    drawing.add(String((PLOT_LEFT + PLOT_RIGHT) / 2, CHART_HEIGHT - 12, 'Score Breakdown',
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+
+    # Vertical grid lines and x axis ticks every 20%
+    for tick in range(0, 101, 20):
+        x = PLOT_LEFT + plot_width * tick / 100
+        drawing.add(Line(x, PLOT_BOTTOM, x, PLOT_TOP, strokeColor=colors.lightgrey, strokeWidth=0.5))
+        drawing.add(String(x, PLOT_BOTTOM - 10, str(tick), fontName='Helvetica', fontSize=8, textAnchor='middle'))
+    drawing.add(String((PLOT_LEFT + PLOT_RIGHT) / 2, 2, 'Score (%)',
+                       fontName='Helvetica-Bold', fontSize=10, textAnchor='middle'))
+
+    # Bars bottom-up in label order, as matplotlib's barh draws them
+    for index, (label, value, color) in enumerate(zip(SCORE_LABELS, key, BAR_COLORS)):
+        y = PLOT_BOTTOM + row_height * index
+        bar_y = y + row_height * (1 - BAR_FILL) / 2
+        bar_height = row_height * BAR_FILL
+        width = plot_width * min(max(value, 0), 100) / 100
+        drawing.add(Rect(PLOT_LEFT, bar_y, width, bar_height,
+                         fillColor=colors.HexColor(color), strokeColor=None))
+        middle = y + row_height / 2 - 3
+        drawing.add(String(PLOT_LEFT - 4, middle, label, fontName='Helvetica', fontSize=8, textAnchor='end'))
+        drawing.add(String(PLOT_LEFT + width + 2, middle, f'{value:.1f}%', fontName='Helvetica-Bold', fontSize=9))
+
+    drawing.add(Rect(PLOT_LEFT, PLOT_BOTTOM, plot_width, PLOT_TOP - PLOT_BOTTOM,
+                     fillColor=None, strokeColor=colors.black, strokeWidth=0.8))
+    return drawing
+
+
+def _warm_worker():
+    """Pay matplotlib's import cost once per worker, not on the first chart"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends import backend_agg  # noqa: F401
+
+
+class ChartRenderer:
+    """Renders score charts in a process pool with an LRU cache of PNG bytes"""
+
+    def __init__(self, workers: int = CHART_RENDER_WORKERS, cache_size: int = CHART_CACHE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[ScoreKey, bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+        self.charts_rendered = 0
+        self.cache_hits = 0
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the parent runs threads (audit writer, server) that fork would copy mid-state
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+                print(f"[Charts] Started renderer pool with {self.workers} workers")
+            return self._pool
+
+    def render_many(self, keys: Iterable[ScoreKey]) -> Dict[ScoreKey, bytes]:
+        """PNG bytes for every key; uncached charts are rendered in parallel"""
+        keys = list(dict.fromkeys(keys))
+        charts = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    charts[key] = self._cache[key]
+            self.cache_hits += len(charts)
+
+        missing = [key for key in keys if key not in charts]
+        if missing:
+            rendered = self._render(missing)
+            charts.update(rendered)
+            with self._cache_lock:
+                self.charts_rendered += len(rendered)
+                for key, png in rendered.items():
+                    self._cache[key] = png
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return charts
+
+    def render(self, key: ScoreKey) -> bytes:
+        return self.render_many([key])[key]
+
+    def _render(self, keys) -> Dict[ScoreKey, bytes]:
+        pool = self._get_pool()
+        if pool is not None and len(keys) > 1:
+            try:
+                chunksize = max(1, len(keys) // (self.workers * 4))
+                return dict(zip(keys, pool.map(render_score_chart, keys, chunksize=chunksize)))
+            except BrokenProcessPool as e:
+                print(f"[Charts] Renderer pool failed, rendering in-process: {e}")
+                self.shutdown()
+        return {key: render_score_chart(key) for key in keys}
+
+    def shutdown(self):
+        """Stop the worker processes (a new pool starts on the next render)"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            print("[Charts] Renderer pool stopped")
+
+    def stats(self) -> Dict:
+        with self._cache_lock:
+            cached = len(self._cache)
+        return {
+            "workers": self.workers,
+            "cached_charts": cached,
+            "charts_rendered": self.charts_rendered,
+            "cache_hits": self.cache_hits,
+        }
+
+
+# Global instance
+chart_renderer = ChartRenderer()
+
+
+def shutdown_chart_renderer():
+    chart_renderer.shutdown()
@@ -1,11 +1,38 @@
-from huggingface_hub import InferenceClient
-import numpy as np
+import threading
+import time
 from ..config import HF_API_KEY
+from ..core.metrics import EMBEDDING_ERRORS_TOTAL, EMBEDDING_REQUEST_SECONDS
 
-# HuggingFace Inference Client - handles routing automatically to correct endpoints
-client = InferenceClient(token=HF_API_KEY)
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
+# HuggingFace Inference Client - handles routing automatically to correct endpoints.
+# Created on first use: huggingface_hub takes longer to import than the rest of the app.
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from huggingface_hub import InferenceClient
+                _client = InferenceClient(token=HF_API_KEY)
+    return _client
+
+
+def warm_up(send_request: bool = True):
+    """
+    Create the client ahead of the first embedding
+    
+    With send_request, one short embedding is also requested so the HTTPS
+    connection (shared by every later call) and the provider's model are ready.
+    """
+    get_client()
+    if send_request:
+        get_embedding("warm up")
+
+
 def get_embedding(text: str, max_retries: int = 3):
     """
     Generate embeddings for a given text using HuggingFace Inference API.
@@ -14,9 +41,18 @@ def get_embedding(text: str, max_retries: int = 3):
     if not text or not text.strip():
         raise ValueError("Text input cannot be empty")
     
+    import numpy as np
+    
     try:
         # Use sentence_similarity task for embeddings
-        embedding = client.feature_extraction(text, model=MODEL_NAME)
+        start = time.perf_counter()
+        try:
+            embedding = get_client().feature_extraction(text, model=MODEL_NAME)
+        except Exception:
+            EMBEDDING_REQUEST_SECONDS.observe(time.perf_counter() - start, outcome="error")
+            EMBEDDING_ERRORS_TOTAL.inc()
+            raise
+        EMBEDDING_REQUEST_SECONDS.observe(time.perf_counter() - start, outcome="success")
         
         # Handle different response formats
         if isinstance(embedding, np.ndarray):
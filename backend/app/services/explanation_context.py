@@ -0,0 +1,366 @@
+"""
+Explanation Context - Shared evaluation facts behind every explanation format
+Computed once per application; the basic explanation and the XAI explanation
+are both rendered from it instead of re-deriving the same facts independently
+"""
+from typing import Dict, List, Any, Optional
+
+
+class ExplanationContext:
+    """Strengths, weaknesses, key factors, confidence and analyses for one evaluation"""
+
+    def __init__(
+        self,
+        decision: str,
+        scores: Dict,
+        skill_match: Dict,
+        experience_details: Dict,
+        fraud_analysis: Dict,
+        skill_gap: Dict = None
+    ):
+        """
+        Args:
+            decision: Final decision (Fast-Track Selected, Selected, etc.)
+            scores: Dictionary with rfs, dcs, elc, composite_score and breakdown
+            skill_match: Skill matching details
+            experience_details: Experience compatibility details
+            fraud_analysis: Fraud detection results
+            skill_gap: Skill gap analysis (optional)
+        """
+        self.decision = decision
+        self.scores = scores or {}
+        self.skill_match = skill_match or {}
+        self.experience_details = experience_details or {}
+        self.fraud_analysis = fraud_analysis or {}
+        self.skill_gap = skill_gap
+
+        # Values several sections depend on
+        self.match_percentage = (
+            self.skill_match.get("match_percentage")
+            or self.skill_match.get("overall_match_percentage", 0)
+        )
+        self.matched_count = self.skill_match.get(
+            "matched_count", len(self.skill_match.get("matched_skills", []))
+        )
+        self.extra_skills = (
+            self.skill_match.get("extra_skills")
+            or self.skill_match.get("candidate_extras", [])
+        )
+
+        self.strengths = self._identify_strengths()
+        self.weaknesses = self._identify_weaknesses()
+        self.key_factors = self._identify_key_factors()
+        self.confidence = self._calculate_confidence()
+        self.skill_analysis = self._analyze_skills()
+        self.experience_analysis = self._analyze_experience()
+        self.fraud_assessment = self._assess_fraud()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shared sections, stored once per application"""
+        return {
+            "decision": self.decision,
+            "strengths": self.strengths,
+            "weaknesses": self.weaknesses,
+            "key_factors": self.key_factors,
+            "confidence": self.confidence,
+            "skill_analysis": self.skill_analysis,
+            "experience_analysis": self.experience_analysis,
+            "fraud_assessment": self.fraud_assessment
+        }
+
+    def _identify_strengths(self) -> List[str]:
+        """Identify candidate strengths"""
+        strengths = []
+        scores = self.scores
+        exp_details = self.experience_details
+
+        if scores.get("rfs", 0) >= 0.80:
+            strengths.append(f"Excellent role fit with {scores['rfs']:.0%} semantic alignment")
+
+        if scores.get("dcs", 0) >= 0.75:
+            strengths.append(f"Excellent technical skill match ({scores['dcs']:.1%})")
+
+        if self.match_percentage >= 70:
+            strengths.append(f"Strong skill match: {self.matched_count} required skills present")
+
+        if scores.get("elc", 0) >= 0.8 or exp_details.get("percentage_match", 0) >= 100:
+            strengths.append(f"Meets experience requirements ({exp_details.get('candidate', 0)} years)")
+
+        if len(self.extra_skills) > 5:
+            strengths.append(f"Additional {len(self.extra_skills)} relevant skills beyond requirements")
+
+        if scores.get("composite_score", 0) >= 0.80:
+            strengths.append("Overall strong candidate profile")
+
+        return strengths if strengths else ["Candidate shows basic qualifications"]
+
+    def _identify_weaknesses(self) -> List[str]:
+        """Identify candidate weaknesses / areas for improvement"""
+        weaknesses = []
+        scores = self.scores
+        exp_details = self.experience_details
+
+        if scores.get("rfs", 0) < 0.60:
+            weaknesses.append(f"Limited role alignment ({scores.get('rfs', 0):.0%} fit)")
+
+        if scores.get("dcs", 0) < 0.60:
+            weaknesses.append(f"Skill gap in technical requirements ({scores.get('dcs', 0):.1%})")
+
+        # Missing required skills (prioritize over nice-to-have)
+        missing_required = self.skill_match.get("missing_required", [])
+        if missing_required:
+            weaknesses.append(f"Missing required skills: {', '.join(missing_required[:3])}")
+        else:
+            missing_skills = self.skill_match.get("missing_skills", [])
+            if missing_skills:
+                weaknesses.append(f"Missing skills: {', '.join(missing_skills[:3])}")
+
+        gap = exp_details.get("gap", 0)
+        if gap > 0:
+            weaknesses.append(f"Experience gap: {gap} years below requirement")
+        elif exp_details.get("overqualified", False):
+            weaknesses.append("Significantly overqualified - may affect retention")
+
+        if self.match_percentage < 50:
+            weaknesses.append(f"Only {self.match_percentage}% of required skills present")
+
+        return weaknesses if weaknesses else ["No significant weaknesses identified"]
+
+    def _identify_key_factors(self) -> List[Dict]:
+        """Identify the most important factors in the decision"""
+        factors = []
+        scores = self.scores
+        fraud = self.fraud_analysis
+
+        if fraud.get("fraud_flag", False):
+            factors.append({
+                "factor": "Fraud Detection",
+                "value": fraud.get("overall_risk", "unknown"),
+                "impact": "critical",
+                "description": f"Potential duplication detected ({fraud.get('similarity_index', 0):.0%} similarity)",
+                "weight": "Automatic Disqualification"
+            })
+
+        composite = scores.get("composite_score", 0)
+        factors.append({
+            "factor": "Overall Competency",
+            "value": f"{composite:.0%}",
+            "impact": "high",
+            "description": "Combined evaluation across all criteria",
+            "weight": "100% of total score"
+        })
+
+        dcs = scores.get("dcs", 0)
+        factors.append({
+            "factor": "Skill Match",
+            "value": f"{dcs:.0%}",
+            "impact": "high" if dcs >= 0.7 else "medium",
+            "description": "Technical competency alignment",
+            "weight": "40% of total score"
+        })
+
+        exp_details = self.experience_details
+        if scores.get("elc", 0) == 0 or exp_details.get("percentage_match", 0) < 75:
+            factors.append({
+                "factor": "Experience",
+                "value": "Insufficient",
+                "impact": "high",
+                "description": f"Candidate has {exp_details.get('candidate', 0)} years "
+                               f"(requires {exp_details.get('required', 0)})",
+                "weight": "20% of total score"
+            })
+
+        rfs = scores.get("rfs", 0)
+        if rfs >= 0.8:
+            factors.append({
+                "factor": "Strong Semantic Alignment",
+                "value": f"{rfs:.0%}",
+                "impact": "high",
+                "description": f"Resume and JD have {rfs:.1%} semantic similarity",
+                "weight": "40% of total score"
+            })
+
+        return factors[:5]
+
+    def _calculate_confidence(self) -> Dict:
+        """Calculate confidence level in the decision"""
+        composite = self.scores.get("composite_score", 0)
+
+        if composite >= 0.85 or composite <= 0.50:
+            level = "high"
+            confidence_score = 0.9
+        elif composite >= 0.75 or composite <= 0.60:
+            level = "medium"
+            confidence_score = 0.7
+        else:
+            level = "low"
+            confidence_score = 0.5
+
+        # Adjust based on skill match clarity
+        if self.match_percentage >= 80 or self.match_percentage <= 30:
+            confidence_score += 0.05
+
+        if self.fraud_analysis.get("fraud_flag", False):
+            label = "High - Fraud Detected"
+        elif composite >= 0.85:
+            label = "Very High - Strong Match"
+        elif composite >= 0.70:
+            label = "High - Good Match"
+        elif composite >= 0.50:
+            label = "Medium - Moderate Match"
+        else:
+            label = "High - Clear Mismatch"
+
+        return {
+            "level": level,
+            "score": min(round(confidence_score, 2), 1.0),
+            "label": label,
+            "explanation": "Decision confidence based on score clarity and skill alignment"
+        }
+
+    def _analyze_skills(self) -> Dict:
+        """Skill analysis shared by both explanation formats"""
+        matched = self.skill_match.get("matched_skills", [])
+        missing = self.skill_match.get("missing_skills", [])
+        total_required = self.skill_match.get("total_jd_skills") or (self.matched_count + len(missing))
+
+        if self.match_percentage >= 80:
+            analysis = f"Excellent skill coverage: {self.matched_count} of {total_required} required skills demonstrated."
+        elif self.match_percentage >= 60:
+            analysis = f"Good skill coverage: {self.matched_count} of {total_required} required skills present."
+        elif self.match_percentage >= 40:
+            analysis = f"Moderate skill coverage: {self.matched_count} of {total_required} required skills found."
+        else:
+            analysis = f"Limited skill coverage: Only {self.matched_count} of {total_required} required skills identified."
+
+        if not missing:
+            criticality = "None - All required skills present"
+        else:
+            missing_ratio = len(missing) / total_required if total_required > 0 else 1
+            if missing_ratio >= 0.7:
+                criticality = "High - Most required skills are missing"
+            elif missing_ratio >= 0.4:
+                criticality = "Medium - Several key skills are missing"
+            else:
+                criticality = "Low - Only some skills are missing"
+
+        return {
+            "match_percentage": self.match_percentage,
+            "overall_match": f"{self.skill_match.get('match_score', 0):.1%}",
+            "matched_skills": matched[:10],
+            "missing_skills": missing[:10],
+            "extra_skills": self.extra_skills[:10],
+            "matched_count": len(matched),
+            "missing_count": len(missing),
+            "total_required": total_required,
+            "total_candidate": self.skill_match.get("total_resume_skills", 0),
+            "missing_criticality": criticality,
+            "analysis": analysis
+        }
+
+    def _analyze_experience(self) -> Dict:
+        """Experience analysis shared by both explanation formats"""
+        exp_details = self.experience_details
+        required = exp_details.get("required", 0)
+        candidate = exp_details.get("candidate", 0)
+        gap = exp_details.get("gap", 0)
+
+        if candidate >= required:
+            status = "Meets or exceeds requirements"
+            detail = f"Candidate has {candidate} years, meeting the {required} year requirement"
+        elif candidate >= required * 0.75:
+            status = "Close to requirements"
+            detail = f"Candidate has {candidate} years, approaching the {required} year requirement"
+        else:
+            status = "Below requirements"
+            detail = f"Candidate has {candidate} years, {abs(gap)} years short of the {required} year requirement"
+
+        return {
+            "required_years": required,
+            "candidate_years": candidate,
+            "gap_years": gap,
+            "status": status,
+            "explanation": detail,
+            "overqualified": exp_details.get("overqualified", False),
+            "underqualified": exp_details.get("underqualified", False),
+            "match_percentage": exp_details.get("percentage_match", 0)
+        }
+
+    def _assess_fraud(self) -> Dict:
+        """Fraud assessment shared by both explanation formats"""
+        fraud = self.fraud_analysis
+        similarity = fraud.get("similarity_index", 0)
+
+        if not fraud.get("fraud_flag", False):
+            return {
+                "status": "clean",
+                "fraud_detected": False,
+                "risk_level": "none",
+                "similarity_to_existing": f"{similarity:.1%}",
+                "message": "No fraud indicators detected"
+            }
+
+        risk_level = fraud.get("overall_risk", "low")
+        risk_factors = fraud.get("risk_factors", [])
+
+        messages = []
+        if "high_embedding_similarity" in risk_factors:
+            messages.append(f"High similarity to existing resume ({similarity:.0%})")
+        if "text_duplication" in risk_factors:
+            messages.append("Potential text duplication detected")
+        if "email_duplication" in risk_factors:
+            messages.append("Email address already exists in system")
+        if "template_placeholder" in risk_factors:
+            messages.append("Resume contains template placeholders")
+
+        return {
+            "status": "flagged",
+            "fraud_detected": True,
+            "risk_level": risk_level,
+            "similarity_to_existing": f"{similarity:.1%}",
+            "risk_factors": risk_factors,
+            "messages": messages,
+            "recommendation": "Manual review required" if risk_level in ["high", "medium"] else "Proceed with caution"
+        }
+
+
+def build_explanation_context(
+    decision: str,
+    scores: Dict,
+    skill_match: Dict,
+    experience_details: Dict,
+    fraud_analysis: Dict,
+    skill_gap: Dict = None
+) -> ExplanationContext:
+    """Compute the shared explanation context for one evaluation"""
+    return ExplanationContext(
+        decision, scores, skill_match, experience_details, fraud_analysis, skill_gap
+    )
+
+
+def expand_explanation(stored: Optional[Dict]) -> Dict:
+    """
+    Rebuild full basic and XAI explanations from a stored explanation payload
+
+    Payloads written by the pipeline keep the shared "context" once and only the
+    format-specific sections under "basic_explanation" / "xai_explanation".
+    Older payloads that already hold both full explanations are returned as-is.
+    """
+    if not stored or "context" not in stored:
+        return stored or {}
+
+    # Imported here: both renderers import this module
+    from .explanation_agent import explanation_agent
+    from .xai_explainability import compose_xai_explanation
+
+    context = stored["context"]
+    skill_gap = stored.get("skill_gap_analysis")
+
+    expanded = {key: value for key, value in stored.items() if key != "context"}
+    expanded["basic_explanation"] = explanation_agent.compose(
+        context, stored.get("basic_explanation", {})
+    )
+    expanded["xai_explanation"] = compose_xai_explanation(
+        context, stored.get("xai_explanation", {}), skill_gap
+    )
+    return expanded
@@ -2,8 +2,8 @@
 Inference Engine for NLP-based skill extraction and analysis
 """
 import re
+import threading
 from typing import List, Dict, Set, Tuple
-import requests
 from ..config import HF_API_KEY
 
 # Enhanced skill synonym mapping - normalize to consistent terms
@@ -199,6 +199,24 @@ class InferenceEngine:
     def __init__(self):
         self.hf_api_key = HF_API_KEY
         self.ner_model_url = "https://api-inference.huggingface.co/models/dslim/bert-base-NER"
+        self._skill_matchers = None
+        self._skill_matchers_lock = threading.Lock()
+    
+    def compile_skill_matchers(self) -> Tuple[List[Tuple[str, re.Pattern]], List[Tuple[str, re.Pattern]]]:
+        """
+        Word-boundary patterns for every known technical and soft skill
+        
+        Compiled once per process (at startup prewarm, or on first use)
+        instead of on every extraction.
+        """
+        if self._skill_matchers is None:
+            with self._skill_matchers_lock:
+                if self._skill_matchers is None:
+                    self._skill_matchers = (
+                        [(skill, re.compile(r'\b' + re.escape(skill) + r'\b')) for skill in TECHNICAL_SKILLS],
+                        [(skill, re.compile(r'\b' + re.escape(skill) + r'\b')) for skill in SOFT_SKILLS]
+                    )
+        return self._skill_matchers
         
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """
@@ -211,13 +229,13 @@ class InferenceEngine:
             Dictionary with technical_skills, soft_skills, and all_skills
         """
         text_lower = text.lower()
+        technical_matchers, soft_matchers = self.compile_skill_matchers()
         
         # Extract technical skills
         technical_found = set()
-        for skill in TECHNICAL_SKILLS:
+        for skill, pattern in technical_matchers:
             # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
+            if pattern.search(text_lower):
                 # Filter out noise terms
                 if skill.lower() not in NOISE_TERMS:
                     # For short skills (2-3 chars), check whitelist
@@ -229,9 +247,8 @@ class InferenceEngine:
         
         # Extract soft skills
         soft_found = set()
-        for skill in SOFT_SKILLS:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
+        for skill, pattern in soft_matchers:
+            if pattern.search(text_lower):
                 soft_found.add(skill)
         
         # Extract potential custom skills (capitalized words, acronyms)
@@ -646,6 +663,11 @@ class InferenceEngine:
 inference_engine = InferenceEngine()
 
 
+def compile_skill_matchers():
+    """Compile the skill patterns ahead of the first extraction"""
+    return inference_engine.compile_skill_matchers()
+
+
 def extract_skills_from_text(text: str) -> Dict[str, List[str]]:
     """Extract skills from text"""
     return inference_engine.extract_skills(text)
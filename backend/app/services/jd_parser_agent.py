@@ -1,4 +1,3 @@
-import PyPDF2
 from io import BytesIO
 from typing import Dict, Any
 from ..utils.text_cleaner import clean_text
@@ -13,6 +12,8 @@ def parse_jd_pdf(pdf_content: bytes) -> Dict[str, Any]:
     Returns:
         Dictionary containing parsed JD information
     """
+    import PyPDF2
+    
     try:
         pdf_file = BytesIO(pdf_content)
         pdf_reader = PyPDF2.PdfReader(pdf_file)
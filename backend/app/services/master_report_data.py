@@ -0,0 +1,248 @@
+"""
+Master Report Data - Loads what the master PDF report renders
+
+Shared by the streaming /analytics/master-report/pdf route and the
+background report jobs: a keyset page of candidates, their summary rows
+for the title page and executive summary, a hash of each candidate's rows
+for the fragment cache, and the full per-candidate payloads loaded lazily
+in batches.
+"""
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, selectinload, undefer
+
+from ..config import REPORT_BATCH_SIZE, REPORT_MAX_CANDIDATES
+from ..database import SessionLocal
+from ..models.application import Application
+from ..models.candidate import Candidate
+from ..models.company import Company  # noqa: F401 - Job.company must be mapped before the load options below
+from ..models.job import Job
+from ..utils.pagination import keyset_page
+from .explanation_context import expand_explanation
+
+
+def load_report_page(db: Session, limit: int, skip: int = 0, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """
+    Candidates (id, name, created_at) in the report, newest-first, and the next cursor
+    
+    limit is capped at REPORT_MAX_CANDIDATES; raises ValueError for a bad cursor.
+    """
+    return keyset_page(
+        db.query(Candidate.id, Candidate.name, Candidate.created_at),
+        Candidate, min(limit, REPORT_MAX_CANDIDATES), cursor=cursor, skip=skip
+    )
+
+
+# What the PDF renders for each candidate: applications with their detail
+# payloads, jobs and companies, one query per relationship level
+REPORT_LOAD_OPTIONS = (
+    undefer(Candidate.skills_extracted),
+    selectinload(Candidate.applications).selectinload(Application.job).selectinload(Job.company),
+    selectinload(Candidate.applications).selectinload(Application.detail),
+)
+
+
+def _summarize_applications(applications) -> Dict[str, Any]:
+    """Per-candidate application_summary from rows with id, job_role, composite_score, decision, rank"""
+    scored = [app for app in applications if app.composite_score is not None]
+    average = sum(app.composite_score for app in scored) / len(scored) if scored else None
+    
+    best_application = None
+    if scored:
+        best = max(scored, key=lambda app: app.composite_score)
+        best_application = {
+            "application_id": best.id,
+            "job_role": best.job_role,
+            "composite_score": best.composite_score,
+            "decision": best.decision,
+            "rank": best.rank
+        }
+    
+    return {
+        "total_applications": len(applications),
+        "selected": sum(1 for app in applications if app.decision == "Selected"),
+        "rejected": sum(1 for app in applications if app.decision == "Rejected"),
+        "pending": sum(1 for app in applications if not app.decision or app.decision == "Pending"),
+        "average_composite_score": round(average, 2) if average else None,
+        "best_application": best_application
+    }
+
+
+def report_summaries(db: Session, candidates) -> List[Dict[str, Any]]:
+    """Title page / executive summary input for every candidate, from one column-only query"""
+    rows = db.query(
+        Application.candidate_id,
+        Application.id,
+        Application.composite_score,
+        Application.decision,
+        Application.rank,
+        Job.role.label("job_role")
+    ).outerjoin(Job, Job.id == Application.job_id).filter(
+        Application.candidate_id.in_([candidate.id for candidate in candidates])
+    ).all()
+    
+    by_candidate: Dict[int, list] = {}
+    for row in rows:
+        by_candidate.setdefault(row.candidate_id, []).append(row)
+    
+    return [
+        {
+            "candidate_profile": {"candidate_id": candidate.id, "name": candidate.name},
+            "application_summary": _summarize_applications(by_candidate.get(candidate.id, []))
+        }
+        for candidate in candidates
+    ]
+
+
+def _build_report_application(app: Application) -> Dict[str, Any]:
+    """Report view of one application from eager-loaded relations"""
+    job = app.job
+    company = job.company if job else None
+    
+    # Extract XAI explanation
+    full_explanation = expand_explanation(app.explanation)
+    
+    return {
+        "application_id": app.id,
+        "applied_at": app.created_at.isoformat() if app.created_at else None,
+        "status": app.status,
+        
+        # Job Details
+        "job_details": {
+            "job_id": job.id,
+            "role": job.role,
+            "location": job.location,
+            "salary": job.salary,
+            "employment_type": job.employment_type,
+            "required_experience": job.required_experience,
+            "company_name": company.name if company else None,
+        } if job else None,
+        
+        # Company Details
+        "company_details": {
+            "company_id": company.id,
+            "company_name": company.name,
+            "company_description": company.description,
+        } if company else None,
+        
+        # Scores
+        "scores": {
+            "role_fit_score": app.rfs,
+            "domain_competency_score": app.dcs,
+            "experience_level_compatibility": app.elc,
+            "composite_score": app.composite_score,
+            "rank": app.rank,
+            "rank_description": f"Ranked #{app.rank}" if app.rank else "Not ranked yet"
+        },
+        
+        # Decision
+        "decision": {
+            "status": app.decision if app.decision else "Pending",
+            "reason": app.decision_reason,
+            "detailed_explanation": full_explanation
+        },
+        
+        # Fraud Detection
+        "fraud_detection": {
+            "fraud_flag": app.fraud_flag,
+            "similarity_index": app.similarity_index,
+            "fraud_details": app.fraud_details
+        },
+        
+        # Skill Analysis
+        "skill_analysis": {
+            "skill_match": app.skill_match,
+            "experience_details": app.experience_details
+        },
+        
+        "xai_explanation": full_explanation.get("xai_explanation", {}),
+        "skill_gap_analysis": full_explanation.get("skill_gap_analysis", {}),
+        "skill_evidence_graph": full_explanation.get("skill_evidence_graph", {})
+    }
+
+
+def _build_report_candidate(candidate: Candidate) -> Dict[str, Any]:
+    """Report view of one candidate, applications best-first"""
+    applications = sorted(
+        candidate.applications,
+        key=lambda app: app.composite_score if app.composite_score is not None else float("-inf"),
+        reverse=True
+    )
+    summary_rows = [
+        SimpleNamespace(
+            id=app.id,
+            job_role=app.job.role if app.job else None,
+            composite_score=app.composite_score,
+            decision=app.decision,
+            rank=app.rank
+        )
+        for app in applications
+    ]
+    
+    return {
+        "candidate_profile": {
+            "candidate_id": candidate.id,
+            "name": candidate.name,
+            "email": candidate.email,
+            "mobile": candidate.mobile,
+            "linkedin": candidate.linkedin,
+            "github": candidate.github,
+            "years_of_experience": candidate.experience,
+            "skills": candidate.skills_extracted.get("technical_skills", []) if candidate.skills_extracted else [],
+            "profile_created_at": candidate.created_at.isoformat() if candidate.created_at else None
+        },
+        "application_summary": _summarize_applications(summary_rows),
+        "applications": [_build_report_application(app) for app in applications]
+    }
+
+
+def report_batches(candidate_ids: List[int]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Load and build the report candidates REPORT_BATCH_SIZE at a time
+    
+    Runs while the response streams, after the request's session has been
+    released, so it uses a session of its own. The identity map is cleared
+    after every batch so loaded rows do not accumulate.
+    """
+    db = SessionLocal()
+    try:
+        for start in range(0, len(candidate_ids), REPORT_BATCH_SIZE):
+            batch_ids = candidate_ids[start:start + REPORT_BATCH_SIZE]
+            loaded = {
+                candidate.id: candidate
+                for candidate in db.query(Candidate).options(*REPORT_LOAD_OPTIONS).filter(Candidate.id.in_(batch_ids))
+            }
+            yield [_build_report_candidate(loaded[i]) for i in batch_ids if i in loaded]
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+def fragment_hashes(db: Session, candidate_ids: List[int]) -> Dict[int, str]:
+    """
+    Hash of everything a candidate's report section is built from
+
+    Covers the candidate row and, for each application, its row, its
+    details and its job and company rows, through their ids and updated_at
+    stamps only, so the detail blobs are never read. It is computed in the
+    database, so candidates whose cached section is still valid are never
+    loaded.
+    """
+    rows = db.execute(text("""
+        SELECT c.id, md5(
+            concat_ws('|', c.id, c.updated_at) || coalesce(string_agg(
+                concat_ws('|', a.id, a.updated_at, d.updated_at, j.id, j.updated_at, co.id, co.updated_at),
+                ';' ORDER BY a.id
+            ), '')
+        )
+        FROM candidates c
+        LEFT JOIN applications a ON a.candidate_id = c.id
+        LEFT JOIN application_details d ON d.application_id = a.id
+        LEFT JOIN jobs j ON j.id = a.job_id
+        LEFT JOIN companies co ON co.id = j.company_id
+        WHERE c.id = ANY(:ids)
+        GROUP BY c.id
+    """), {"ids": list(candidate_ids)}).all()
+    return {candidate_id: digest for candidate_id, digest in rows}
@@ -9,13 +9,22 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak,
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
 import numpy as np
 from io import BytesIO
 from datetime import datetime
+from typing import Iterator
 import json
+import tempfile
+from ..config import REPORT_BATCH_SIZE, REPORT_CHART_RENDERER
+from .chart_renderer import chart_renderer, draw_score_chart, score_key
+from .report_fragments import fragment_cache
+from ..utils.pdf_stream import PdfStreamWriter
+
+# Rendered batches stay in memory up to this size, then spill to disk
+REPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Applications shown in detail (with a score chart) per candidate
+APPLICATIONS_PER_CANDIDATE = 3
 
 class MasterReportGenerator:
     """Generate comprehensive PDF reports for candidates"""
@@ -98,39 +107,162 @@ class MasterReportGenerator:
         if output_path is None:
             output_path = BytesIO()
         
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=letter,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.5*inch
+        batches = (
+            candidates_data[start:start + REPORT_BATCH_SIZE]
+            for start in range(0, len(candidates_data), REPORT_BATCH_SIZE)
         )
+        chunks = self.stream_master_report(candidates_data, batches)
+        
+        if isinstance(output_path, str):
+            with open(output_path, "wb") as output_file:
+                for chunk in chunks:
+                    output_file.write(chunk)
+        else:
+            for chunk in chunks:
+                output_path.write(chunk)
         
-        story = []
+        if isinstance(output_path, BytesIO):
+            output_path.seek(0)
         
-        # Add title page
-        story.extend(self._create_title_page(len(candidates_data)))
+        return output_path
+    
+    def stream_master_report(self, candidate_summaries, candidate_batches) -> Iterator[bytes]:
+        """
+        Generate the master report as a stream of PDF bytes
         
-        # Add executive summary
-        story.extend(self._create_executive_summary(candidates_data))
+        The title page and executive summary are rendered first, then each
+        candidate's section is rendered as its own small document into a
+        spooled temp file and appended to the output page by page, stamped
+        with its position in the report. Only one batch is ever held in
+        memory, and the first bytes go out as soon as the summary is done.
         
-        story.append(PageBreak())
+        Args:
+            candidate_summaries: Every candidate in the report; only
+                candidate_profile.name and application_summary are read
+            candidate_batches: Iterable of lists of full candidate dictionaries,
+                in report order (may be a generator loading them lazily)
+        """
+        writer = PdfStreamWriter()
+        yield from self._append_part(writer, self._create_summary_pages(candidate_summaries))
         
-        # Add each candidate's detailed report
-        for idx, candidate in enumerate(candidates_data, 1):
-            story.extend(self._create_candidate_report(candidate, idx))
-            if idx < len(candidates_data):
-                story.append(PageBreak())
+        candidate_number = 0
+        try:
+            for batch in candidate_batches:
+                charts = self._render_batch_charts(batch)
+                for candidate in batch:
+                    candidate_number += 1
+                    with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_BYTES) as fragment:
+                        self._render_part(self._create_candidate_report(candidate, charts), fragment)
+                        yield from writer.add_document(fragment, stamp=f"CANDIDATE #{candidate_number}")
+        finally:
+            # Release a lazily loading generator (and its session) on errors or disconnects
+            if hasattr(candidate_batches, "close"):
+                candidate_batches.close()
+        
+        yield writer.finish()
+    
+    def stream_cached_master_report(self, candidate_summaries, fragment_hashes, load_batches) -> Iterator[bytes]:
+        """
+        Generate the master report from cached candidate sections where possible
         
-        # Build PDF
-        doc.build(story)
+        Like stream_master_report, but each candidate's section comes from
+        the fragment cache when their data is unchanged (same hash). Only
+        the candidates with a missing or outdated fragment are loaded and
+        rendered, REPORT_BATCH_SIZE at a time, and stored for the next
+        report. The title page and executive summary are always fresh.
         
-        if isinstance(output_path, BytesIO):
-            output_path.seek(0)
+        Args:
+            candidate_summaries: Every candidate in the report, in order
+            fragment_hashes: candidate id -> hash of their rows
+                (master_report_data.fragment_hashes); candidates without one
+                no longer exist and are left out
+            load_batches: Callable taking a list of candidate ids and
+                returning an iterable of lists of full candidate dictionaries
+        """
+        writer = PdfStreamWriter()
+        yield from self._append_part(writer, self._create_summary_pages(candidate_summaries))
         
-        return output_path
+        candidate_ids = [
+            summary['candidate_profile']['candidate_id'] for summary in candidate_summaries
+            if summary['candidate_profile']['candidate_id'] in fragment_hashes
+        ]
+        candidate_number = 0
+        for start in range(0, len(candidate_ids), REPORT_BATCH_SIZE):
+            window = candidate_ids[start:start + REPORT_BATCH_SIZE]
+            keys = {candidate_id: fragment_cache.key(fragment_hashes[candidate_id]) for candidate_id in window}
+            fragments = {candidate_id: fragment_cache.open(candidate_id, keys[candidate_id]) for candidate_id in window}
+            try:
+                missing = [candidate_id for candidate_id in window if fragments[candidate_id] is None]
+                if missing:
+                    self._render_fragments(load_batches(missing), keys, fragments)
+                
+                for candidate_id in window:
+                    if fragments[candidate_id] is None:
+                        continue  # deleted while the report was being built
+                    candidate_number += 1
+                    yield from writer.add_document(fragments[candidate_id], stamp=f"CANDIDATE #{candidate_number}")
+            finally:
+                for fragment in fragments.values():
+                    if fragment is not None:
+                        fragment.close()
+        
+        yield writer.finish()
+    
+    def _render_fragments(self, candidate_batches, keys, fragments):
+        """Render and cache the sections of freshly loaded candidates into `fragments`"""
+        try:
+            for batch in candidate_batches:
+                charts = self._render_batch_charts(batch)
+                for candidate in batch:
+                    candidate_id = candidate['candidate_profile']['candidate_id']
+                    story = self._create_candidate_report(candidate, charts)
+                    fragments[candidate_id] = fragment_cache.store(
+                        candidate_id, keys[candidate_id], lambda output, story=story: self._render_part(story, output)
+                    )
+        finally:
+            if hasattr(candidate_batches, "close"):
+                candidate_batches.close()
+    
+    def _create_summary_pages(self, candidate_summaries):
+        """Title page and executive summary"""
+        story = self._create_title_page(len(candidate_summaries))
+        story.extend(self._create_executive_summary(candidate_summaries))
+        return story
+    
+    def _render_batch_charts(self, batch):
+        """Render the score charts of a whole batch at once, in parallel across the renderer's workers"""
+        if REPORT_CHART_RENDERER != "matplotlib":
+            return {}  # vector charts are drawn inline, nothing to pre-render
+        keys = [
+            score_key(app['scores'])
+            for candidate in batch
+            for app in candidate['applications'][:APPLICATIONS_PER_CANDIDATE]
+            if app.get('scores')
+        ]
+        try:
+            return chart_renderer.render_many(keys)
+        except Exception as e:
+            print(f"Error rendering score charts: {e}")
+            return {}
+    
+    def _append_part(self, writer, story) -> Iterator[bytes]:
+        """Render a story and copy its pages into the output stream"""
+        with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_BYTES) as part:
+            self._render_part(story, part)
+            yield from writer.add_document(part)
+    
+    def _render_part(self, story, part):
+        """Build one story into `part` (a spooled temp file or a fragment cache file) and rewind it"""
+        doc = SimpleDocTemplate(
+            part,
+            pagesize=letter,
+            rightMargin=0.5*inch,
+            leftMargin=0.5*inch,
+            topMargin=0.75*inch,
+            bottomMargin=0.5*inch
+        )
+        doc.build(story)
+        part.seek(0)
     
     def _create_title_page(self, total_candidates):
         """Create title page"""
@@ -259,8 +391,14 @@ class MasterReportGenerator:
         
         return elements
     
-    def _create_candidate_report(self, candidate, candidate_number):
-        """Create detailed report for a single candidate"""
+    def _create_candidate_report(self, candidate, charts=None):
+        """
+        Create detailed report for a single candidate (charts: pre-rendered PNGs by score key)
+        
+        Independent of the candidate's position in the report, so the
+        rendered section can be cached; the number is stamped on when the
+        report is assembled.
+        """
         elements = []
         
         profile = candidate['candidate_profile']
@@ -268,7 +406,7 @@ class MasterReportGenerator:
         applications = candidate['applications']
         
         # Candidate header
-        header_text = f"CANDIDATE #{candidate_number}: {profile['name']}"
+        header_text = f"CANDIDATE: {profile['name']}"
         elements.append(Paragraph(header_text, self.heading1_style))
         elements.append(Spacer(1, 0.1*inch))
         
@@ -276,11 +414,11 @@ class MasterReportGenerator:
         elements.append(Paragraph("PROFILE INFORMATION", self.heading2_style))
         profile_data = [
             ['Email:', profile['email']],
-            ['Mobile:', profile.get('mobile', 'N/A')],
-            ['LinkedIn:', profile.get('linkedin', 'N/A')[:50]],
-            ['GitHub:', profile.get('github', 'N/A')[:50]],
+            ['Mobile:', profile.get('mobile') or 'N/A'],
+            ['LinkedIn:', (profile.get('linkedin') or 'N/A')[:50]],
+            ['GitHub:', (profile.get('github') or 'N/A')[:50]],
             ['Experience:', f"{profile['years_of_experience']} years"],
-            ['Profile Created:', profile.get('profile_created_at', 'N/A')[:10]],
+            ['Profile Created:', (profile.get('profile_created_at') or 'N/A')[:10]],
         ]
         
         profile_table = Table(profile_data, colWidths=[1.5*inch, 5*inch])
@@ -352,15 +490,15 @@ class MasterReportGenerator:
             elements.append(Paragraph(f"DETAILED APPLICATION ANALYSIS - {profile['name']}", self.heading2_style))
             elements.append(Spacer(1, 0.1*inch))
             
-            for app_idx, app in enumerate(applications[:3], 1):  # Show top 3 applications
-                elements.extend(self._create_application_detail(app, app_idx))
+            for app_idx, app in enumerate(applications[:APPLICATIONS_PER_CANDIDATE], 1):
+                elements.extend(self._create_application_detail(app, app_idx, charts))
                 
-                if app_idx < min(3, len(applications)):
+                if app_idx < min(APPLICATIONS_PER_CANDIDATE, len(applications)):
                     elements.append(Spacer(1, 0.2*inch))
         
         return elements
     
-    def _create_application_detail(self, app, app_number):
+    def _create_application_detail(self, app, app_number, charts=None):
         """Create detailed analysis for a single application"""
         elements = []
         
@@ -377,7 +515,7 @@ class MasterReportGenerator:
         
         # Scores visualization
         if scores:
-            score_chart = self._create_score_chart(scores)
+            score_chart = self._create_score_chart(scores, charts)
             if score_chart:
                 elements.append(score_chart)
                 elements.append(Spacer(1, 0.1*inch))
@@ -448,50 +586,18 @@ class MasterReportGenerator:
         
         return elements
     
-    def _create_score_chart(self, scores):
-        """Create a bar chart for scores"""
+    def _create_score_chart(self, scores, charts=None):
+        """Create a bar chart for scores (PNG charts come from `charts` when already rendered)"""
         try:
-            # Extract scores
-            score_names = ['RFS', 'DCS', 'ELC', 'Composite']
-            score_values = [
-                scores.get('role_fit_score', 0) * 100,
-                scores.get('domain_competency_score', 0) * 100,
-                scores.get('experience_level_compatibility', 0) * 100,
-                scores.get('composite_score', 0) * 100,
-            ]
-            
-            # Create figure
-            fig, ax = plt.subplots(figsize=(6, 2.5))
-            
-            # Colors
-            colors_list = ['#3498db', '#2ecc71', '#f39c12', '#e74c3c']
-            
-            # Create bars
-            bars = ax.barh(score_names, score_values, color=colors_list)
-            
-            # Add value labels
-            for bar in bars:
-                width = bar.get_width()
-                ax.text(width, bar.get_y() + bar.get_height()/2, 
-                       f'{width:.1f}%',
-                       ha='left', va='center', fontsize=9, fontweight='bold')
-            
-            ax.set_xlim(0, 100)
-            ax.set_xlabel('Score (%)', fontsize=10, fontweight='bold')
-            ax.set_title('Score Breakdown', fontsize=11, fontweight='bold')
-            ax.grid(axis='x', alpha=0.3)
-            
-            # Save to BytesIO
-            img_buffer = BytesIO()
-            plt.tight_layout()
-            plt.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-            plt.close()
+            key = score_key(scores)
+            if REPORT_CHART_RENDERER != "matplotlib":
+                return draw_score_chart(key)
             
-            img_buffer.seek(0)
+            png = charts.get(key) if charts else None
+            if png is None:
+                png = chart_renderer.render(key)
             
-            # Create Image object
-            img = Image(img_buffer, width=5*inch, height=2*inch)
-            return img
+            return Image(BytesIO(png), width=5*inch, height=2*inch)
             
         except Exception as e:
             print(f"Error creating score chart: {e}")
@@ -0,0 +1,150 @@
+"""
+Report Fragments - Disk cache of rendered candidate sections
+
+Each candidate's section of the master report is rendered as its own small
+PDF and kept in REPORT_FRAGMENT_DIR as <candidate id>-<key>.pdf. The key
+hashes the candidate's database rows (see master_report_data.fragment_hashes)
+together with the chart renderer and FRAGMENT_VERSION, so a section is
+rendered again only when something it shows has changed. The report is then
+assembled from the cached fragments page by page.
+
+The cache is shared by every worker process on the host. Writes go to a
+temporary file and are renamed into place. The least recently used
+fragments are pruned once the directory grows past REPORT_FRAGMENT_CACHE_MB.
+"""
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+from typing import BinaryIO, Callable, Dict, Optional
+
+from ..config import REPORT_CHART_RENDERER, REPORT_FRAGMENT_CACHE_MB, REPORT_FRAGMENT_DIR
+
+# Bump when the layout of a candidate section changes, to retire old fragments
+FRAGMENT_VERSION = 1
+
+# Spooled in memory up to this size when the cache is disabled
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+class FragmentCache:
+    """Rendered candidate sections on disk, keyed by candidate id and a hash of their data"""
+
+    def __init__(self, directory: str = REPORT_FRAGMENT_DIR, max_mb: int = REPORT_FRAGMENT_CACHE_MB):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+
+        self._lock = threading.Lock()
+        self._written_since_prune = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key(self, data_hash: str) -> str:
+        """Cache key for a candidate whose rows hash to data_hash"""
+        return hashlib.sha256(f"{FRAGMENT_VERSION}:{REPORT_CHART_RENDERER}:{data_hash}".encode()).hexdigest()[:32]
+
+    def _path(self, candidate_id: int, key: str) -> str:
+        return os.path.join(self.directory, f"{candidate_id}-{key}.pdf")
+
+    def open(self, candidate_id: int, key: str) -> Optional[BinaryIO]:
+        """The cached fragment opened for reading, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(candidate_id, key)
+        try:
+            fragment = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # recently used: pruned last
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return fragment
+
+    def store(self, candidate_id: int, key: str, render: Callable[[BinaryIO], None]) -> BinaryIO:
+        """
+        Render a fragment with render(file), cache it and return it opened for reading
+
+        Older fragments of the same candidate are removed. With the cache
+        disabled the fragment is only spooled for the current report.
+        """
+        if not self.enabled:
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            render(spool)
+            spool.seek(0)
+            return spool
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(candidate_id, key)
+        handle, partial = tempfile.mkstemp(dir=self.directory, suffix=".partial")
+        try:
+            with os.fdopen(handle, "wb") as output:
+                render(output)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+        # Opened before anything else can prune it
+        fragment = open(path, "rb")
+        for stale in glob.glob(os.path.join(self.directory, f"{candidate_id}-*.pdf")):
+            if stale != path:
+                self._remove(stale)
+
+        with self._lock:
+            self._written_since_prune += os.path.getsize(path)
+            prune = self._written_since_prune > self.max_bytes // 10
+            if prune:
+                self._written_since_prune = 0
+        if prune:
+            self.prune()
+        return fragment
+
+    def prune(self) -> int:
+        """Delete least recently used fragments until the cache fits in max_bytes; returns files removed"""
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.pdf")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"[Reports] Pruned {removed} cached report fragments")
+        return removed
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"enabled": self.enabled, "hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+fragment_cache = FragmentCache()
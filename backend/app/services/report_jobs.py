@@ -0,0 +1,261 @@
+"""
+Report Jobs - Master PDF reports generated in the background
+
+POST /analytics/reports records a ReportJob and hands it to a small thread
+pool (REPORT_JOB_WORKERS per process). The report is streamed to
+REPORT_STORAGE_DIR/<job id>.pdf and later served from disk by
+GET /analytics/reports/{id}/file, so no request waits on rendering and
+nothing sits behind a proxy timeout.
+
+Requests are deduplicated on the normalized parameters plus a fingerprint
+of the data the report reads. While neither changes, every request gets
+the same job and artifact. Once the data changes the next request renders
+a fresh report; when it completes, the older artifacts for the same
+parameters are deleted and their jobs marked expired.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from ..config import REPORT_JOB_STALE_SECONDS, REPORT_JOB_WORKERS, REPORT_MAX_CANDIDATES, REPORT_STORAGE_DIR
+from ..database import SessionLocal
+from ..models.application import Application
+from ..models.application_detail import ApplicationDetail
+from ..models.candidate import Candidate
+from ..models.candidate_summary import CandidateSummary
+from ..models.company import Company
+from ..models.job import Job
+from ..models.report_job import ReportJob
+from .master_report_data import fragment_hashes, load_report_page, report_batches, report_summaries
+
+ACTIVE_STATUSES = ("queued", "running")
+REUSABLE_STATUSES = ACTIVE_STATUSES + ("completed",)
+
+# (model, primary key) for every table a master report is built from
+FINGERPRINT_TABLES = (
+    (Candidate, Candidate.id),
+    (Application, Application.id),
+    (ApplicationDetail, ApplicationDetail.application_id),
+    (Job, Job.id),
+    (Company, Company.id),
+    (CandidateSummary, CandidateSummary.candidate_id),
+)
+
+
+def normalize_params(limit: int = 50, skip: int = 0, cursor: Optional[str] = None) -> Dict:
+    """Report parameters as stored and hashed (limit capped like the streaming route)"""
+    return {"limit": min(limit, REPORT_MAX_CANDIDATES), "skip": skip, "cursor": cursor or None}
+
+
+def params_hash(params: Dict) -> str:
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def data_fingerprint(db: Session) -> str:
+    """
+    Changes whenever the data behind a master report does
+
+    For every table the report reads, the row count and max id catch
+    inserts and deletes and max(updated_at) catches edits: a job's role, a
+    company's name, an application's rank or its detail payloads.
+    """
+    columns = []
+    for model, key in FINGERPRINT_TABLES:
+        columns += [
+            select(func.count()).select_from(model).scalar_subquery(),
+            select(func.max(key)).scalar_subquery(),
+            select(func.max(model.updated_at)).scalar_subquery(),
+        ]
+    state = db.execute(select(*columns)).one()
+    return hashlib.sha256(json.dumps([str(value) for value in state]).encode()).hexdigest()
+
+
+class ReportJobRunner:
+    """Creates, deduplicates and runs background report jobs"""
+
+    def __init__(
+        self,
+        workers: int = REPORT_JOB_WORKERS,
+        storage_dir: str = REPORT_STORAGE_DIR,
+        stale_after: int = REPORT_JOB_STALE_SECONDS
+    ):
+        self.workers = workers
+        self.storage_dir = storage_dir
+        self.stale_after = stale_after
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, db: Session, params: Dict) -> Tuple[ReportJob, bool]:
+        """
+        The job for these parameters against the current data; (job, created)
+
+        A transaction-level advisory lock on the parameter hash makes
+        concurrent identical requests queue up here, so only the first one
+        creates a job.
+        """
+        digest = params_hash(params)
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": int(digest[:15], 16)})
+        fingerprint = data_fingerprint(db)
+
+        existing = db.query(ReportJob).filter(
+            ReportJob.params_hash == digest,
+            ReportJob.data_fingerprint == fingerprint,
+            ReportJob.status.in_(REUSABLE_STATUSES)
+        ).order_by(ReportJob.created_at.desc())
+        for job in existing:
+            if self._reusable(job):
+                db.commit()
+                return job, False
+
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            report_type="master",
+            params=params,
+            params_hash=digest,
+            data_fingerprint=fingerprint,
+            status="queued"
+        )
+        db.add(job)
+        db.commit()
+
+        self._enqueue(job.id)
+        print(f"[Reports] Queued report job {job.id} ({params})")
+        return job, True
+
+    def _reusable(self, job: ReportJob) -> bool:
+        if job.status == "completed":
+            return bool(job.file_path) and os.path.exists(job.file_path)
+        # Jobs left unfinished by a process that went away are not waited on forever
+        return job.created_at >= datetime.utcnow() - timedelta(seconds=self.stale_after)
+
+    def _enqueue(self, job_id: str):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report-job")
+            future = self._executor.submit(self.run, job_id)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def pending(self) -> int:
+        """Jobs queued or running in this process"""
+        with self._lock:
+            return len(self._futures)
+
+    def run(self, job_id: str):
+        """Render the report for one job into REPORT_STORAGE_DIR"""
+        from .pdf_report_service import master_report_generator
+
+        db = SessionLocal()
+        path = os.path.join(self.storage_dir, f"{job_id}.pdf")
+        partial = f"{path}.partial"
+        try:
+            job = db.get(ReportJob, job_id)
+            if job is None or job.status != "queued":
+                return
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            params = job.params
+            candidates, next_cursor = load_report_page(db, params["limit"], skip=params["skip"], cursor=params["cursor"])
+            if not candidates:
+                raise ValueError("No candidates found")
+            summaries = report_summaries(db, candidates)
+            hashes = fragment_hashes(db, [candidate.id for candidate in candidates])
+            db.commit()  # nothing held open while rendering
+
+            os.makedirs(self.storage_dir, exist_ok=True)
+            chunks = master_report_generator.stream_cached_master_report(summaries, hashes, report_batches)
+            with open(partial, "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            os.replace(partial, path)
+
+            job.status = "completed"
+            job.file_path = path
+            job.file_size = os.path.getsize(path)
+            job.candidate_count = len(candidates)
+            job.next_cursor = next_cursor
+            job.completed_at = datetime.utcnow()
+            db.commit()
+            print(f"[Reports] Completed report job {job_id} ({len(candidates)} candidates, {job.file_size} bytes)")
+
+            self._expire_superseded(db, job)
+
+        except Exception as e:
+            db.rollback()
+            if os.path.exists(partial):
+                os.remove(partial)
+            job = db.get(ReportJob, job_id)
+            if job is not None:
+                job.status = "failed"
+                job.error = str(e)[:1000]
+                job.completed_at = datetime.utcnow()
+                db.commit()
+            print(f"[Reports] Report job {job_id} failed: {e}")
+        finally:
+            db.close()
+
+    def _expire_superseded(self, db: Session, job: ReportJob):
+        """Delete the artifacts of older reports for the same parameters (built from older data)"""
+        older = db.query(ReportJob).filter(
+            ReportJob.params_hash == job.params_hash,
+            ReportJob.id != job.id,
+            ReportJob.status == "completed",
+            ReportJob.created_at <= job.created_at
+        ).all()
+        for old in older:
+            if old.file_path and os.path.exists(old.file_path):
+                os.remove(old.file_path)
+            old.status = "expired"
+            old.file_path = None
+        db.commit()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until every job submitted so far has finished"""
+        with self._lock:
+            futures = list(self._futures.values())
+        for future in futures:
+            future.result(timeout=timeout)
+
+    def shutdown(self):
+        """Cancel jobs that have not started and wait for running ones"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            cancelled = [job_id for job_id, future in self._futures.items() if future.cancel()]
+        if executor is None:
+            return
+        executor.shutdown(wait=True)
+
+        if cancelled:
+            db = SessionLocal()
+            try:
+                db.query(ReportJob).filter(
+                    ReportJob.id.in_(cancelled), ReportJob.status == "queued"
+                ).update({"status": "failed", "error": "Interrupted by shutdown"}, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+            print(f"[Reports] {len(cancelled)} queued report jobs cancelled at shutdown")
+
+
+# Global instance
+report_job_runner = ReportJobRunner()
+
+
+def shutdown_report_jobs():
+    report_job_runner.shutdown()
@@ -1,4 +1,3 @@
-import PyPDF2
 from io import BytesIO
 from typing import Dict, Any
 import re
@@ -14,6 +13,8 @@ def parse_resume_pdf(pdf_content: bytes) -> Dict[str, Any]:
     Returns:
         Dictionary containing parsed resume information
     """
+    import PyPDF2
+    
     try:
         pdf_file = BytesIO(pdf_content)
         pdf_reader = PyPDF2.PdfReader(pdf_file)
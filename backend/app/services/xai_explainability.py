@@ -3,7 +3,13 @@ XAI (Explainable AI) Service
 Provides detailed, transparent explanations for hiring decisions
 """
 from typing import Dict, List, Any
-import json
+from .explanation_context import ExplanationContext, build_explanation_context
+
+FRAUD_CHECKS_PERFORMED = [
+    "Resume duplication analysis",
+    "Email pattern analysis",
+    "Content similarity check"
+]
 
 
 def generate_xai_explanation(
@@ -23,39 +29,73 @@ def generate_xai_explanation(
     - What could be improved
     - Transparency into the algorithm
     """
+    context = build_explanation_context(
+        decision, scores, skill_match, experience_details, fraud_analysis, skill_gap
+    )
+    return compose_xai_explanation(context.to_dict(), render_xai_explanation(context), skill_gap)
+
+
+def render_xai_explanation(context: ExplanationContext) -> Dict[str, Any]:
+    """
+    Render the sections only the XAI explanation has
     
-    explanation = {
-        "decision": decision,
-        "confidence_level": _calculate_confidence(scores, fraud_analysis),
-        "key_factors": _identify_key_factors(scores, skill_match, experience_details, fraud_analysis),
-        "strengths": _identify_strengths(scores, skill_match, experience_details),
-        "areas_for_improvement": _identify_weaknesses(scores, skill_match, experience_details, skill_gap),
+    Strengths, weaknesses, key factors and the skill, experience and fraud
+    analyses keep the XAI format's own shape and thresholds, which differ from
+    the basic explanation's. The decision and confidence come from the shared
+    context and are merged back by compose_xai_explanation().
+    """
+    scores = context.scores
+    skill_match = context.skill_match
+    exp_details = context.experience_details
+    fraud = context.fraud_analysis
+    return {
+        "key_factors": _identify_key_factors(scores, skill_match, exp_details, fraud),
+        "strengths": _identify_strengths(scores, skill_match, exp_details),
+        "areas_for_improvement": _identify_weaknesses(scores, skill_match, exp_details, context.skill_gap),
         "score_breakdown": _detailed_score_breakdown(scores),
-        "skill_analysis": _skill_analysis_explanation(skill_match, skill_gap),
-        "experience_analysis": _experience_explanation(experience_details),
-        "fraud_check_explanation": _fraud_explanation(fraud_analysis),
-        "decision_rationale": _generate_decision_rationale(decision, scores, skill_match, experience_details, fraud_analysis),
-        "recommendations": _generate_recommendations(decision, scores, skill_match, experience_details)
+        # skill_gap is stored once beside the context and added back on compose
+        "skill_analysis": _skill_analysis_explanation(skill_match),
+        "experience_analysis": _experience_explanation(exp_details),
+        "fraud_check_explanation": _fraud_explanation(fraud),
+        "decision_rationale": _generate_decision_rationale(
+            context.decision, context.scores, context.skill_match,
+            context.experience_details, context.fraud_analysis
+        ),
+        "recommendations": _generate_recommendations(
+            context.decision, context.scores, context.skill_match, context.experience_details
+        )
     }
-    
-    return explanation
 
 
-def _calculate_confidence(scores: Dict, fraud_analysis: Dict) -> str:
-    """Calculate confidence level in the decision"""
-    composite = scores.get("composite_score", 0)
-    fraud_flag = fraud_analysis.get("fraud_flag", False)
+def compose_xai_explanation(shared: Dict, specific: Dict, skill_gap: Dict = None) -> Dict[str, Any]:
+    """
+    Assemble the full XAI explanation from shared context and rendered sections
     
-    if fraud_flag:
-        return "High - Fraud Detected"
-    elif composite >= 0.85:
-        return "Very High - Strong Match"
-    elif composite >= 0.70:
-        return "High - Good Match"
-    elif composite >= 0.50:
-        return "Medium - Moderate Match"
-    else:
-        return "High - Clear Mismatch"
+    Payloads stored before the XAI sections were rendered separately only have
+    the shared versions; those are used instead.
+    """
+    skill_analysis = dict(specific.get("skill_analysis") or shared.get("skill_analysis", {}))
+    if skill_gap:
+        skill_analysis["skill_gap_details"] = skill_gap
+    
+    fraud_check = specific.get("fraud_check_explanation")
+    if fraud_check is None:
+        fraud_check = dict(shared.get("fraud_assessment", {}))
+        fraud_check["checks_performed"] = FRAUD_CHECKS_PERFORMED
+    
+    return {
+        "decision": shared.get("decision"),
+        "confidence_level": shared.get("confidence", {}).get("label"),
+        "key_factors": specific.get("key_factors", shared.get("key_factors", [])),
+        "strengths": specific.get("strengths", shared.get("strengths", [])),
+        "areas_for_improvement": specific.get("areas_for_improvement", shared.get("weaknesses", [])),
+        "score_breakdown": specific.get("score_breakdown", {}),
+        "skill_analysis": skill_analysis,
+        "experience_analysis": specific.get("experience_analysis", shared.get("experience_analysis", {})),
+        "fraud_check_explanation": fraud_check,
+        "decision_rationale": specific.get("decision_rationale"),
+        "recommendations": specific.get("recommendations", [])
+    }
 
 
 def _identify_key_factors(scores: Dict, skill_match: Dict, exp_details: Dict, fraud: Dict) -> List[Dict]:
@@ -299,11 +339,7 @@ def _fraud_explanation(fraud_analysis: Dict) -> Dict:
         "fraud_detected": fraud_flag,
         "similarity_to_existing": f"{similarity:.1%}",
         "status": "FRAUD DETECTED - Application Flagged" if fraud_flag else "Clean - No fraud detected",
-        "checks_performed": [
-            "Resume duplication analysis",
-            "Email pattern analysis",
-            "Content similarity check"
-        ],
+        "checks_performed": FRAUD_CHECKS_PERFORMED,
         "explanation": fraud_analysis.get("fraud_explanation", "Standard fraud checks passed") if fraud_flag 
                       else "Application passed all fraud detection checks"
     }
@@ -0,0 +1,186 @@
+"""
+Streaming PDF concatenation
+
+Joins complete PDF documents (e.g. reportlab renders of consecutive report
+batches) into one PDF while emitting bytes as each part is copied. Objects of
+every part are renumbered and written straight through; only their byte
+offsets and the page ids are kept until the closing page tree, xref table and
+trailer are written, so memory does not grow with the size of the output.
+
+A short text can be stamped onto the first page of a part (e.g. the
+position of a cached section within the report), so parts that are reused
+across documents do not need to be rendered again when it changes.
+
+Usage:
+    writer = PdfStreamWriter()
+    for part in parts:
+        yield from writer.add_document(part)
+    yield writer.finish()
+"""
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+CHUNK_SIZE = 64 * 1024
+
+# Fixed ids for the objects written by finish()
+CATALOG_ID = 1
+PAGES_ID = 2
+
+# Stamps: right-aligned in the top margin
+STAMP_FONT = "Helvetica-Bold"
+STAMP_FONT_SIZE = 9
+STAMP_MARGIN = 36  # points from the top and right edges
+
+
+class PdfStreamWriter:
+    """Concatenate PDFs page by page into a stream of bytes"""
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._offset = 0
+        self._offsets: Dict[int, int] = {}
+        self._page_ids: List[int] = []
+        self._next_id = PAGES_ID + 1
+        self._buffer = BytesIO()
+        self._started = False
+        self._stamp_font_id: Optional[int] = None
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def add_document(self, source: BinaryIO, stamp: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Append every page of the PDF in `source`, yielding output as it is produced
+
+        stamp: text drawn in the top-right margin of the part's first page
+        """
+        if not self._started:
+            self._started = True
+            self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+        reader = PdfReader(source)
+        mapping: Dict[int, int] = {}
+        pending: List[int] = []
+
+        def renumber(value):
+            if isinstance(value, IndirectObject):
+                if value.idnum not in mapping:
+                    mapping[value.idnum] = self._allocate()
+                    pending.append(value.idnum)
+                return IndirectObject(mapping[value.idnum], 0, None)
+            if isinstance(value, DictionaryObject):
+                # items() gives the raw values; value[key] would resolve references and inline them
+                for key, item in list(value.items()):
+                    value[key] = renumber(item)
+            elif isinstance(value, ArrayObject):
+                for index, item in enumerate(value):
+                    value[index] = renumber(item)
+            return value
+
+        for index, page in enumerate(reader.pages):
+            page_id = self._allocate()
+            self._page_ids.append(page_id)
+
+            # Inherited attributes are already copied onto the page by PdfReader;
+            # the old page tree and annotations (links into it) are not carried over
+            page.pop(NameObject("/Parent"), None)
+            page.pop(NameObject("/Annots"), None)
+            if stamp and index == 0:
+                self._stamp_page(page, stamp, renumber)
+            else:
+                renumber(page)
+            page[NameObject("/Parent")] = IndirectObject(PAGES_ID, 0, None)
+            self._write_object(page_id, page)
+
+            # Everything the page references (contents, fonts, images, ...)
+            while pending:
+                old_id = pending.pop()
+                obj = reader.get_object(old_id)
+                self._write_object(mapping[old_id], renumber(obj))
+
+            yield from self._drain()
+
+        yield from self._drain(force=True)
+
+    def finish(self) -> bytes:
+        """Page tree, catalog, cross-reference table and trailer"""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_raw_object(PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode())
+        self._write_raw_object(CATALOG_ID, f"<< /Type /Catalog /Pages {PAGES_ID} 0 R >>".encode())
+
+        xref_offset = self._offset
+        size = self._next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        lines.extend(f"{self._offsets[object_id]:010d} 00000 n \n" for object_id in range(1, size))
+        lines.append(f"trailer\n<< /Size {size} /Root {CATALOG_ID} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._write("".join(lines).encode())
+
+        return b"".join(self._drain(force=True))
+
+    def _stamp_page(self, page, text: str, renumber):
+        """Renumber `page` with an extra content stream drawing `text`"""
+        # Private copies of the (possibly shared) resource dictionaries, so only this page gets the font
+        resources = DictionaryObject(page.get("/Resources", DictionaryObject()).get_object())
+        fonts = DictionaryObject(resources.get("/Font", DictionaryObject()).get_object())
+        resources[NameObject("/Font")] = fonts
+        page[NameObject("/Resources")] = resources
+        renumber(page)
+
+        if self._stamp_font_id is None:
+            self._stamp_font_id = self._allocate()
+            self._write_raw_object(
+                self._stamp_font_id,
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{STAMP_FONT} /Encoding /WinAnsiEncoding >>".encode()
+            )
+        fonts[NameObject("/FStamp")] = IndirectObject(self._stamp_font_id, 0, None)
+
+        box = page.mediabox
+        x = float(box.right) - STAMP_MARGIN - stringWidth(text, STAMP_FONT, STAMP_FONT_SIZE)
+        y = float(box.top) - STAMP_MARGIN
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        operators = f"q BT /FStamp {STAMP_FONT_SIZE} Tf 0.4 g {x:.2f} {y:.2f} Td ({escaped}) Tj ET Q".encode("latin-1", "replace")
+
+        stamp_id = self._allocate()
+        self._write_raw_object(
+            stamp_id, f"<< /Length {len(operators)} >>\nstream\n".encode() + operators + b"\nendstream"
+        )
+
+        existing = page.get("/Contents")
+        if isinstance(existing, ArrayObject):
+            streams = ArrayObject(existing)
+        else:
+            streams = ArrayObject([existing] if existing is not None else [])
+        streams.append(IndirectObject(stamp_id, 0, None))
+        page[NameObject("/Contents")] = streams
+
+    def _allocate(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _write(self, data: bytes):
+        self._buffer.write(data)
+        self._offset += len(data)
+
+    def _write_object(self, object_id: int, obj):
+        self._offsets[object_id] = self._offset
+        self._write(f"{object_id} 0 obj\n".encode())
+        start = self._buffer.tell()
+        obj.write_to_stream(self._buffer, None)
+        self._offset += self._buffer.tell() - start
+        self._write(b"\nendobj\n")
+
+    def _write_raw_object(self, object_id: int, body: bytes):
+        self._offsets[object_id] = self._offset
+        self._write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _drain(self, force: bool = False) -> Iterator[bytes]:
+        if self._buffer.tell() and (force or self._buffer.tell() >= self.chunk_size):
+            data = self._buffer.getvalue()
+            self._buffer = BytesIO()
+            yield data
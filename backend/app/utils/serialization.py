@@ -0,0 +1,55 @@
+"""
+Compact binary serialization for large JSON-like payloads
+Values are packed with msgpack and compressed with zstd before storage
+"""
+from datetime import date, datetime
+from typing import Any, Optional
+
+import msgpack
+import zstandard
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+ZSTD_LEVEL = 3
+
+
+def _default(value: Any) -> Any:
+    """Convert values msgpack cannot encode natively (numpy arrays and scalars, sets, dates)"""
+    # tolist() before item(): item() raises on arrays with more than one element
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize object of type {type(value).__name__}")
+
+
+def pack(value: Any) -> bytes:
+    """Serialize a JSON-like value to compressed msgpack bytes"""
+    packed = msgpack.packb(value, use_bin_type=True, default=_default)
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(packed)
+
+
+def unpack(data: bytes) -> Any:
+    """Inverse of pack()"""
+    packed = zstandard.ZstdDecompressor().decompress(data)
+    return msgpack.unpackb(packed, raw=False, strict_map_key=False)
+
+
+class CompressedMsgPack(TypeDecorator):
+    """Column type storing JSON-like values as zstd-compressed msgpack (bytea)"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return pack(value)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        return unpack(bytes(value))
@@ -1,6 +1,6 @@
-import numpy as np
-
 def cosine_similarity(a, b):
+    import numpy as np  # deferred: keeps numpy out of app startup
+    
     a = np.array(a)
     b = np.array(b)
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
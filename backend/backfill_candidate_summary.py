@@ -0,0 +1,21 @@
+"""
+Rebuild the candidate_summary rollup from existing applications
+The table is created and backfilled by migration 0003 and kept current by the
+pipeline; run this only to repair it after manual data changes
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.database import SessionLocal
+from app.models import candidate, company, job  # noqa: F401 - register mapped classes
+from app.services.candidate_summary_service import rebuild_candidate_summaries
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        written = rebuild_candidate_summaries(db)
+        print(f"✓ Rebuilt {written} candidate summaries")
+    finally:
+        db.close()
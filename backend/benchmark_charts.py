@@ -0,0 +1,111 @@
+"""
+Benchmark the master report's score charts: matplotlib PNG vs reportlab vector
+
+Renders the same synthetic report (no database needed) once per chart
+renderer and prints chart time, total report time and PDF size. The
+matplotlib path runs in-process unless --workers is given, so the numbers
+compare the cost of a single chart rather than the pool.
+
+Usage:
+    python benchmark_charts.py
+    python benchmark_charts.py --candidates 200 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from io import BytesIO
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--candidates", type=int, default=50)
+parser.add_argument("--applications", type=int, default=3, help="Applications per candidate (3 get charts)")
+parser.add_argument("--workers", type=int, default=1, help="matplotlib renderer processes")
+parser.add_argument("--seed", type=int, default=7)
+args = parser.parse_args()
+
+# The app reads its configuration at import time; nothing here connects
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+os.environ.setdefault("HF_API_KEY", "benchmark-charts")
+os.environ["CHART_RENDER_WORKERS"] = str(args.workers)
+
+from app.services import pdf_report_service
+from app.services.chart_renderer import chart_renderer, draw_score_chart, render_score_chart, score_key
+from app.services.pdf_report_service import MasterReportGenerator
+
+
+def synthetic_candidates(count, applications, rng):
+    candidates = []
+    for i in range(count):
+        apps = []
+        for j in range(applications):
+            scores = {
+                "role_fit_score": rng.random(),
+                "domain_competency_score": rng.random(),
+                "experience_level_compatibility": rng.random(),
+            }
+            scores["composite_score"] = sum(scores.values()) / 3
+            apps.append({
+                "job_details": {"role": f"Role {j}"},
+                "scores": {**scores, "rank_description": f"#{j + 1}"},
+                "decision": {"status": rng.choice(["Selected", "Rejected"]), "reason": "Benchmark"},
+                "fraud_detection": {},
+                "skill_analysis": {"skill_match": {"matched_skills": ["python"], "missing_skills": ["go"]}},
+            })
+        apps.sort(key=lambda app: app["scores"]["composite_score"], reverse=True)
+        best = apps[0]
+        candidates.append({
+            "candidate_profile": {"candidate_id": i, "name": f"Candidate {i}", "email": f"c{i}@example.com",
+                                  "years_of_experience": rng.randint(0, 15), "skills": ["python", "sql"]},
+            "application_summary": {
+                "total_applications": len(apps), "selected": 0, "rejected": 0, "pending": len(apps),
+                "average_composite_score": sum(a["scores"]["composite_score"] for a in apps) / len(apps),
+                "best_application": {"job_role": best["job_details"]["role"],
+                                     "composite_score": best["scores"]["composite_score"],
+                                     "rank": 1, "decision": best["decision"]["status"]},
+            },
+            "applications": apps,
+        })
+    return candidates
+
+
+def bench_report(renderer, candidates):
+    pdf_report_service.REPORT_CHART_RENDERER = renderer
+    chart_renderer._cache.clear()  # every run starts cold
+    start = time.perf_counter()
+    output = MasterReportGenerator().generate_master_report(candidates, BytesIO())
+    return time.perf_counter() - start, len(output.getvalue())
+
+
+def main():
+    rng = random.Random(args.seed)
+    candidates = synthetic_candidates(args.candidates, args.applications, rng)
+    keys = list(dict.fromkeys(
+        score_key(app["scores"]) for candidate in candidates for app in candidate["applications"][:3]
+    ))
+
+    print(f"{args.candidates} candidates, {len(keys)} distinct score charts\n")
+
+    start = time.perf_counter()
+    for key in keys:
+        render_score_chart(key)
+    png_ms = (time.perf_counter() - start) * 1000 / len(keys)
+
+    start = time.perf_counter()
+    for key in keys:
+        draw_score_chart(key)
+    vector_ms = (time.perf_counter() - start) * 1000 / len(keys)
+
+    print(f"{'':12} {'ms/chart':>10} {'report s':>10} {'PDF KB':>10}")
+    results = {}
+    for renderer, per_chart in (("matplotlib", png_ms), ("vector", vector_ms)):
+        seconds, size = bench_report(renderer, candidates)
+        results[renderer] = (seconds, size)
+        print(f"{renderer:12} {per_chart:10.2f} {seconds:10.2f} {size / 1024:10.0f}")
+
+    chart_renderer.shutdown()
+    (png_s, png_size), (vec_s, vec_size) = results["matplotlib"], results["vector"]
+    print(f"\n✓ vector: {png_s / vec_s:.1f}x faster report, {png_size / vec_size:.1f}x smaller PDF")
+
+
+if __name__ == "__main__":
+    main()
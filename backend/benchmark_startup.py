@@ -0,0 +1,97 @@
+"""
+Measure worker startup: import time of app.main and time to the first healthy response
+
+Each run starts a fresh interpreter, so nothing is cached between runs
+(beyond the OS file cache):
+
+- import: `import app.main` in a new Python process
+- healthy: from launching `uvicorn app.main:app` until GET /health answers 200,
+  i.e. interpreter start + imports + lifespan startup + prewarm
+
+Also lists heavy modules (reportlab, matplotlib, huggingface_hub, ...) that
+importing the app pulled in; they should only load on first use.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 10 --skip-server
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+HEAVY_MODULES = ["reportlab", "matplotlib", "huggingface_hub", "PyPDF2", "numpy", "requests"]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_healthy(timeout: float = 60.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-server", action="store_true", help="Only measure import time")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    import_times = [run["seconds"] for run in imports]
+    print(f"import app.main      median {statistics.median(import_times):.3f}s  "
+          f"min {min(import_times):.3f}s  max {max(import_times):.3f}s")
+    heavy = sorted({module for run in imports for module in run["heavy"]})
+    print(f"heavy modules loaded {', '.join(heavy) if heavy else 'none'}")
+
+    if not args.skip_server:
+        healthy = [measure_first_healthy() for _ in range(args.runs)]
+        print(f"first /health 200    median {statistics.median(healthy):.3f}s  "
+              f"min {min(healthy):.3f}s  max {max(healthy):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Run EXPLAIN ANALYZE on the queries behind each hot route and report index usage
+
+Seeds a synthetic dataset into a scratch database, calls every route through
+the real application, captures the SELECT statements it issues (sync and async
+engines) and re-runs each one under EXPLAIN (ANALYZE, BUFFERS). The report
+lists execution time, the indexes each plan used and any sequential scans.
+
+The target database is wiped and recreated; never point this at production.
+
+Usage:
+    python explain_queries.py --database-url postgresql://localhost/explain_scratch
+    python explain_queries.py --candidates 50000 --jobs 500 --skip-seed
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--database-url", default=os.getenv("EXPLAIN_DATABASE_URL"),
+                    help="Scratch database (default: $EXPLAIN_DATABASE_URL)")
+parser.add_argument("--candidates", type=int, default=20000)
+parser.add_argument("--jobs", type=int, default=200)
+parser.add_argument("--applications-per-candidate", type=int, default=3)
+parser.add_argument("--skip-seed", action="store_true", help="Reuse the data from a previous run")
+args = parser.parse_args()
+
+if not args.database_url:
+    parser.error("--database-url or EXPLAIN_DATABASE_URL is required")
+
+# The app reads its configuration at import time
+os.environ["DATABASE_URL"] = args.database_url
+os.environ.setdefault("HF_API_KEY", "explain-queries")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.main import app
+from app.database import Base, engine, async_engine
+from app.utils.serialization import pack
+
+ROUTES = [
+    "/job/?limit=50",
+    "/job/{job_id}",
+    "/job/{company_id}/applications?sort_by=composite_score",
+    "/apply/?limit=50",
+    "/candidate/?limit=50",
+    "/candidate/{candidate_id}/applications",
+    "/candidate/{candidate_id}/master",
+    "/candidate/master/all?limit=20",
+    "/analytics/job/{job_id}/rankings?limit=50",
+    "/analytics/job/{job_id}/top-candidates",
+    "/analytics/job/{job_id}/statistics",
+    "/analytics/candidate/{candidate_id}/applications",
+    "/analytics/candidates/dashboard?limit=50",
+    "/apply/{application_id}/history",
+]
+
+SAMPLE_PAYLOAD = pack({"summary": "synthetic", "items": list(range(50))})
+
+
+def seed():
+    """Create the schema and bulk-load a synthetic dataset with generate_series"""
+    print(f"Seeding {args.candidates} candidates, {args.jobs} jobs, "
+          f"{args.candidates * args.applications_per_candidate} applications...")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    embedding = "[" + ",".join(["0.1"] * 384) + "]"
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO companies (name, description, created_at)
+            SELECT 'Company ' || i, 'Synthetic company', now() - i * interval '1 minute'
+            FROM generate_series(1, greatest(:jobs / 4, 1)) i
+        """), {"jobs": args.jobs})
+        conn.execute(text("""
+            INSERT INTO jobs (company_id, role, location, salary, employment_type,
+                              required_experience, jd_text, jd_embedding, skills_extracted, created_at)
+            SELECT 1 + (i % greatest(:jobs / 4, 1)), 'Engineer ' || i, 'Remote', '100k', 'Full-time',
+                   i % 8, repeat('Python SQL Docker ', 200), CAST(:embedding AS JSONB),
+                   '{"all_skills": ["python", "sql"], "technical_skills": ["python", "sql"]}',
+                   now() - i * interval '1 hour'
+            FROM generate_series(1, :jobs) i
+        """), {"jobs": args.jobs, "embedding": embedding})
+        conn.execute(text("""
+            INSERT INTO candidates (name, email, experience, resume_text, resume_embedding,
+                                    skills_extracted, created_at)
+            SELECT 'Candidate ' || i, 'candidate' || i || '@example.com', i % 12,
+                   repeat('Experienced Python developer. ', 100), CAST(:embedding AS JSONB),
+                   '{"all_skills": ["python"], "technical_skills": ["python"]}',
+                   now() - i * interval '1 minute'
+            FROM generate_series(1, :candidates) i
+        """), {"candidates": args.candidates, "embedding": embedding})
+        conn.execute(text("""
+            INSERT INTO applications (job_id, candidate_id, rfs, dcs, elc, composite_score,
+                                      similarity_index, fraud_flag, decision, decision_reason,
+                                      status, created_at)
+            SELECT 1 + ((c * 7 + a * 13) % :jobs), c, s, s, s, s, 0.1, (c % 97 = 0),
+                   CASE WHEN s >= 0.85 THEN 'Fast-Track Selected'
+                        WHEN s >= 0.7 THEN 'Selected'
+                        WHEN s >= 0.55 THEN 'Hire-Pooled'
+                        ELSE 'Rejected' END,
+                   'Synthetic', 'evaluated', now() - (c + a) * interval '1 minute'
+            FROM generate_series(1, :candidates) c,
+                 generate_series(1, :per_candidate) a,
+                 LATERAL (SELECT round((0.3 + ((c * 31 + a * 17) % 70) / 100.0)::numeric, 4)::float AS s) score
+        """), {"jobs": args.jobs, "candidates": args.candidates, "per_candidate": args.applications_per_candidate})
+        conn.execute(text("""
+            UPDATE applications a SET rank = ranked.position
+            FROM (
+                SELECT id, row_number() OVER (PARTITION BY job_id ORDER BY composite_score DESC) AS position
+                FROM applications
+            ) ranked
+            WHERE a.id = ranked.id
+        """))
+        conn.execute(text("""
+            INSERT INTO application_details (application_id, explanation, fraud_details, skill_match, experience_details)
+            SELECT id, :payload, :payload, :payload, :payload FROM applications
+        """), {"payload": SAMPLE_PAYLOAD})
+        conn.execute(text("""
+            INSERT INTO audit_logs (event_type, entity_type, entity_id, action, details, timestamp)
+            SELECT 'application_evaluation', 'application', id, 'evaluate', '{}', created_at
+            FROM applications
+        """))
+
+    from app.database import SessionLocal
+    from app.services.candidate_summary_service import rebuild_candidate_summaries
+    db = SessionLocal()
+    try:
+        rebuild_candidate_summaries(db)
+    finally:
+        db.close()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+
+
+def sample_ids():
+    """Pick ids in the middle of the data so lookups are representative"""
+    with engine.connect() as conn:
+        job_id, company_id = conn.execute(text(
+            "SELECT id, company_id FROM jobs ORDER BY id OFFSET (SELECT count(*) / 2 FROM jobs) LIMIT 1"
+        )).one()
+        candidate_id = conn.execute(text(
+            "SELECT id FROM candidates ORDER BY id OFFSET (SELECT count(*) / 2 FROM candidates) LIMIT 1"
+        )).scalar()
+        application_id = conn.execute(text(
+            "SELECT id FROM applications WHERE candidate_id = :c LIMIT 1"
+        ), {"c": candidate_id}).scalar()
+    return {"job_id": job_id, "company_id": company_id,
+            "candidate_id": candidate_id, "application_id": application_id}
+
+
+def capture_statements(client, url):
+    """Call a route and return the SELECT statements it executed, with parameters"""
+    captured = []
+
+    def on_sync(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    def on_async(conn, cursor, statement, parameters, context, executemany):
+        # asyncpg uses $n placeholders; rewrite them for psycopg2
+        statement = statement.replace("%", "%%")
+        params = {f"p{i + 1}": value for i, value in enumerate(parameters or ())}
+        captured.append((re.sub(r"\$(\d+)", r"%(p\1)s", statement), params))
+
+    event.listen(engine, "before_cursor_execute", on_sync)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_async)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_sync)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_async)
+
+    if response.status_code != 200:
+        print(f"  ! {url} returned {response.status_code}")
+
+    return [(s, p) for s, p in captured if s.lstrip().upper().startswith("SELECT")]
+
+
+def walk_plan(node, found):
+    """Collect scan nodes from an EXPLAIN (FORMAT JSON) plan tree"""
+    node_type = node.get("Node Type", "")
+    if "Index" in node_type or node_type == "Bitmap Index Scan":
+        found["indexes"].add(node.get("Index Name"))
+    if node_type == "Seq Scan":
+        found["seq_scans"].add(f"{node.get('Relation Name')} ({node.get('Actual Rows', 0) * node.get('Actual Loops', 1)} rows)")
+    for child in node.get("Plans", []):
+        walk_plan(child, found)
+    return found
+
+
+def explain(statement, parameters):
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+        plan = cursor.fetchone()[0][0]
+        raw.rollback()
+    finally:
+        raw.close()
+
+    found = walk_plan(plan["Plan"], {"indexes": set(), "seq_scans": set()})
+    found["time_ms"] = plan["Execution Time"]
+    return found
+
+
+def main():
+    if not args.skip_seed:
+        start = time.perf_counter()
+        seed()
+        print(f"✓ Seeded in {time.perf_counter() - start:.1f}s\n")
+
+    ids = sample_ids()
+    seq_scan_routes = []
+
+    with TestClient(app) as client:
+        for route in ROUTES:
+            url = route.format(**ids)
+            statements = capture_statements(client, url)
+            print(f"GET {url}  ({len(statements)} SELECT statements)")
+
+            for number, (statement, parameters) in enumerate(statements, 1):
+                result = explain(statement, parameters)
+                first_line = " ".join(statement.split())[:90]
+                print(f"  [{number}] {result['time_ms']:8.2f} ms  {first_line}...")
+                if result["indexes"]:
+                    print(f"      indexes:    {', '.join(sorted(i for i in result['indexes'] if i))}")
+                if result["seq_scans"]:
+                    print(f"      seq scans:  {', '.join(sorted(result['seq_scans']))}")
+                    seq_scan_routes.append(url)
+            print()
+
+        client.portal.call(async_engine.dispose)
+
+    if seq_scan_routes:
+        print("Routes with sequential scans (fine for tiny tables, worth a look otherwise):")
+        for url in dict.fromkeys(seq_scan_routes):
+            print(f"  - {url}")
+    else:
+        print("✅ No sequential scans")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Maintain the monthly audit_logs partitions
+
+    python manage_audit_partitions.py list
+    python manage_audit_partitions.py ensure [--months-ahead 3]
+    python manage_audit_partitions.py archive [--retention-months 12] [--archive-dir audit_archive] [--dry-run]
+
+`archive` detaches partitions older than the retention period, exports each
+to <archive-dir>/audit_logs_YYYY_MM.jsonl.zst and drops it. Schedule it
+monthly (cron / Render job) after `ensure`.
+
+Read an archive back with:
+    zstd -dc audit_archive/audit_logs_2025_01.jsonl.zst | head
+"""
+import argparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.config import AUDIT_ARCHIVE_DIR, AUDIT_PARTITION_MONTHS_AHEAD, AUDIT_RETENTION_MONTHS
+from app.database import engine
+from app.services.audit_partitions import apply_retention, ensure_partitions, list_partitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the monthly audit_logs partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="Show attached monthly partitions")
+
+    ensure = commands.add_parser("ensure", help="Create partitions for the coming months")
+    ensure.add_argument("--months-ahead", type=int, default=AUDIT_PARTITION_MONTHS_AHEAD)
+
+    archive = commands.add_parser("archive", help="Archive and drop partitions past retention")
+    archive.add_argument("--retention-months", type=int, default=AUDIT_RETENTION_MONTHS)
+    archive.add_argument("--archive-dir", default=AUDIT_ARCHIVE_DIR)
+    archive.add_argument("--dry-run", action="store_true", help="Only list what would be archived")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        with engine.connect() as conn:
+            partitions = list_partitions(conn)
+        for partition in partitions:
+            print(f"  {partition['name']}  {partition['start']:%Y-%m-%d} .. {partition['end']:%Y-%m-%d}  "
+                  f"~{partition['rows_estimate']} rows")
+        print(f"✓ {len(partitions)} monthly partitions")
+
+    elif args.command == "ensure":
+        created = ensure_partitions(months_ahead=args.months_ahead)
+        print(f"✓ Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+
+    elif args.command == "archive":
+        results = apply_retention(
+            retention_months=args.retention_months,
+            archive_dir=args.archive_dir,
+            dry_run=args.dry_run
+        )
+        if args.dry_run:
+            for result in results:
+                print(f"  would archive {result['partition']}")
+            print(f"✓ {len(results)} partitions past {args.retention_months} months retention")
+        else:
+            total = sum(result["rows"] for result in results)
+            print(f"✓ Archived {len(results)} partitions ({total} rows) to {args.archive_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Alembic environment
+
+Runs migrations against DATABASE_URL using the application's models as the
+target metadata, so `alembic revision --autogenerate` diffs against app/models.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.config import DATABASE_URL
+from app.database import Base
+from app.models import application, application_detail, audit_log, candidate, candidate_summary, company, job, report_job  # noqa: F401 - register tables
+from app.services.audit_partitions import is_partition_table
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Leave audit_logs partitions (managed at runtime) out of autogenerate"""
+    if type_ == "table":
+        return not is_partition_table(name)
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of running it"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on a live connection"""
+    connectable = config.attributes.get("connection")
+
+    if connectable is None:
+        engine = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+        with engine.connect() as connection:
+            _run(connection)
+    else:
+        _run(connectable)
+
+
+def _run(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,143 @@
+"""baseline schema
+
+Tables as created by Base.metadata.create_all before migrations were introduced
+(including the columns previously added by migrate_db.py and the add_*.py
+scripts). Databases created that way should be marked with
+`alembic stamp 0001` before running `alembic upgrade head`.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 06:05:50.877847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(), nullable=True),
+    sa.Column('entity_type', sa.String(), nullable=True),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('ip_address', sa.String(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_logs_timestamp'), 'audit_logs', ['timestamp'], unique=False)
+    op.create_table('candidates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('mobile', sa.String(), nullable=True),
+    sa.Column('linkedin', sa.String(), nullable=True),
+    sa.Column('github', sa.String(), nullable=True),
+    sa.Column('experience', sa.Integer(), nullable=True),
+    sa.Column('resume_text', sa.Text(), nullable=False),
+    sa.Column('resume_embedding', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('skills_extracted', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_candidates_created_at'), 'candidates', ['created_at'], unique=False)
+    op.create_index(op.f('ix_candidates_email'), 'candidates', ['email'], unique=False)
+    op.create_index(op.f('ix_candidates_id'), 'candidates', ['id'], unique=False)
+    op.create_table('companies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_companies_id'), 'companies', ['id'], unique=False)
+    op.create_index(op.f('ix_companies_name'), 'companies', ['name'], unique=False)
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('salary', sa.String(), nullable=True),
+    sa.Column('employment_type', sa.String(), nullable=True),
+    sa.Column('required_experience', sa.Integer(), nullable=True),
+    sa.Column('jd_text', sa.Text(), nullable=False),
+    sa.Column('jd_embedding', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('skills_extracted', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_company_id'), 'jobs', ['company_id'], unique=False)
+    op.create_index(op.f('ix_jobs_created_at'), 'jobs', ['created_at'], unique=False)
+    op.create_index(op.f('ix_jobs_id'), 'jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_jobs_role'), 'jobs', ['role'], unique=False)
+    op.create_table('applications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('candidate_id', sa.Integer(), nullable=False),
+    sa.Column('rfs', sa.Float(), nullable=True),
+    sa.Column('dcs', sa.Float(), nullable=True),
+    sa.Column('elc', sa.Float(), nullable=True),
+    sa.Column('composite_score', sa.Float(), nullable=True),
+    sa.Column('rank', sa.Integer(), nullable=True),
+    sa.Column('similarity_index', sa.Float(), nullable=True),
+    sa.Column('fraud_flag', sa.Boolean(), nullable=True),
+    sa.Column('fraud_details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('decision', sa.String(), nullable=True),
+    sa.Column('decision_reason', sa.Text(), nullable=True),
+    sa.Column('explanation', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('skill_match', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('experience_details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_applications_candidate_id'), 'applications', ['candidate_id'], unique=False)
+    op.create_index(op.f('ix_applications_composite_score'), 'applications', ['composite_score'], unique=False)
+    op.create_index(op.f('ix_applications_created_at'), 'applications', ['created_at'], unique=False)
+    op.create_index(op.f('ix_applications_decision'), 'applications', ['decision'], unique=False)
+    op.create_index(op.f('ix_applications_fraud_flag'), 'applications', ['fraud_flag'], unique=False)
+    op.create_index(op.f('ix_applications_id'), 'applications', ['id'], unique=False)
+    op.create_index(op.f('ix_applications_job_id'), 'applications', ['job_id'], unique=False)
+    op.create_index(op.f('ix_applications_rank'), 'applications', ['rank'], unique=False)
+    op.create_index(op.f('ix_applications_status'), 'applications', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_applications_status'), table_name='applications')
+    op.drop_index(op.f('ix_applications_rank'), table_name='applications')
+    op.drop_index(op.f('ix_applications_job_id'), table_name='applications')
+    op.drop_index(op.f('ix_applications_id'), table_name='applications')
+    op.drop_index(op.f('ix_applications_fraud_flag'), table_name='applications')
+    op.drop_index(op.f('ix_applications_decision'), table_name='applications')
+    op.drop_index(op.f('ix_applications_created_at'), table_name='applications')
+    op.drop_index(op.f('ix_applications_composite_score'), table_name='applications')
+    op.drop_index(op.f('ix_applications_candidate_id'), table_name='applications')
+    op.drop_table('applications')
+    op.drop_index(op.f('ix_jobs_role'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_id'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_created_at'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_company_id'), table_name='jobs')
+    op.drop_table('jobs')
+    op.drop_index(op.f('ix_companies_name'), table_name='companies')
+    op.drop_index(op.f('ix_companies_id'), table_name='companies')
+    op.drop_table('companies')
+    op.drop_index(op.f('ix_candidates_id'), table_name='candidates')
+    op.drop_index(op.f('ix_candidates_email'), table_name='candidates')
+    op.drop_index(op.f('ix_candidates_created_at'), table_name='candidates')
+    op.drop_table('candidates')
+    op.drop_index(op.f('ix_audit_logs_timestamp'), table_name='audit_logs')
+    op.drop_table('audit_logs')
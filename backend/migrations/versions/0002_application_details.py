@@ -0,0 +1,95 @@
+"""move heavy application payloads to application_details
+
+Explanation, fraud details, skill match and experience details are stored as
+zstd-compressed msgpack in a side table keyed by application id.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 06:10:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.serialization import pack, unpack
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PAYLOAD_COLUMNS = ["explanation", "fraud_details", "skill_match", "experience_details"]
+BATCH_SIZE = 500
+
+
+def _copy_in_batches(select_sql: str, write_sql: str, convert) -> None:
+    """Page through rows by application id, converting each payload column"""
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(select_sql), {"last_id": last_id, "batch": BATCH_SIZE}
+        ).mappings().all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            values = {c: convert(row[c]) if row[c] is not None else None for c in PAYLOAD_COLUMNS}
+            params.append({"application_id": row["id"], **values})
+        conn.execute(sa.text(write_sql), params)
+
+        last_id = rows[-1]["id"]
+
+
+def upgrade() -> None:
+    op.create_table('application_details',
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('explanation', sa.LargeBinary(), nullable=True),
+    sa.Column('fraud_details', sa.LargeBinary(), nullable=True),
+    sa.Column('skill_match', sa.LargeBinary(), nullable=True),
+    sa.Column('experience_details', sa.LargeBinary(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('application_id')
+    )
+
+    _copy_in_batches(
+        f"""
+        SELECT id, {', '.join(PAYLOAD_COLUMNS)} FROM applications
+        WHERE id > :last_id ORDER BY id LIMIT :batch
+        """,
+        """
+        INSERT INTO application_details
+            (application_id, explanation, fraud_details, skill_match, experience_details)
+        VALUES
+            (:application_id, :explanation, :fraud_details, :skill_match, :experience_details)
+        """,
+        pack
+    )
+
+    for column in PAYLOAD_COLUMNS:
+        op.drop_column('applications', column)
+
+
+def downgrade() -> None:
+    for column in PAYLOAD_COLUMNS:
+        op.add_column('applications', sa.Column(column, postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    _copy_in_batches(
+        f"""
+        SELECT application_id AS id, {', '.join(PAYLOAD_COLUMNS)} FROM application_details
+        WHERE application_id > :last_id ORDER BY application_id LIMIT :batch
+        """,
+        f"""
+        UPDATE applications SET {', '.join(f'{c} = CAST(:{c} AS JSONB)' for c in PAYLOAD_COLUMNS)}
+        WHERE id = :application_id
+        """,
+        lambda payload: json.dumps(unpack(payload), default=str)
+    )
+
+    op.drop_table('application_details')
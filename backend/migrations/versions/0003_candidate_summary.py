@@ -0,0 +1,86 @@
+"""candidate_summary rollup for the candidates dashboard
+
+One row per candidate with their best application, tier, status and
+application count; maintained by the pipeline after this backfill.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 06:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('candidate_summary',
+    sa.Column('candidate_id', sa.Integer(), nullable=False),
+    sa.Column('best_application_id', sa.Integer(), nullable=True),
+    sa.Column('best_score', sa.Float(), nullable=True),
+    sa.Column('decision', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('tier', sa.String(), nullable=True),
+    sa.Column('total_applications', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['best_application_id'], ['applications.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('candidate_id')
+    )
+    op.create_index(op.f('ix_candidate_summary_best_score'), 'candidate_summary', ['best_score'], unique=False)
+    op.create_index(op.f('ix_candidate_summary_decision'), 'candidate_summary', ['decision'], unique=False)
+    op.create_index(op.f('ix_candidate_summary_status'), 'candidate_summary', ['status'], unique=False)
+    op.create_index(op.f('ix_candidate_summary_tier'), 'candidate_summary', ['tier'], unique=False)
+
+    # Backfill: best application per candidate (same rules as candidate_summary_service)
+    op.execute("""
+        INSERT INTO candidate_summary
+            (candidate_id, best_application_id, best_score, decision, status, tier, total_applications, updated_at)
+        SELECT
+            candidate_id,
+            id,
+            score,
+            decision,
+            CASE
+                WHEN decision IN ('Fast-Track Selected', 'Selected') THEN 'Selected'
+                WHEN decision = 'Rejected' THEN 'Rejected'
+                ELSE 'Pending'
+            END,
+            CASE
+                WHEN score >= 0.85 THEN 'Excellent'
+                WHEN score >= 0.70 THEN 'Good'
+                WHEN score >= 0.50 THEN 'Average'
+                ELSE 'Poor'
+            END,
+            total_applications,
+            timezone('utc', now())
+        FROM (
+            SELECT
+                candidate_id,
+                id,
+                decision,
+                coalesce(composite_score, 0.0) AS score,
+                count(*) OVER (PARTITION BY candidate_id) AS total_applications,
+                row_number() OVER (
+                    PARTITION BY candidate_id
+                    ORDER BY coalesce(composite_score, 0.0) DESC, id ASC
+                ) AS position
+            FROM applications
+        ) ranked
+        WHERE position = 1
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_candidate_summary_tier'), table_name='candidate_summary')
+    op.drop_index(op.f('ix_candidate_summary_status'), table_name='candidate_summary')
+    op.drop_index(op.f('ix_candidate_summary_decision'), table_name='candidate_summary')
+    op.drop_index(op.f('ix_candidate_summary_best_score'), table_name='candidate_summary')
+    op.drop_table('candidate_summary')
@@ -0,0 +1,79 @@
+"""audit_logs.details as JSONB with promoted job_id / decision columns
+
+details was a Text column of json.dumps output, so every report had to load
+and parse each row in Python. It becomes JSONB (with a jsonb_path_ops GIN
+index for containment searches), and the two fields the reports filter and
+group on are promoted to real columns and backfilled from the payload.
+
+The type change rewrites the table under an exclusive lock; on a large
+audit_logs run it in a maintenance window. Payloads that are not valid JSON
+are kept as a JSON string rather than failing the migration.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE FUNCTION pg_temp.audit_details_to_jsonb(value text) RETURNS jsonb AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN to_jsonb(value);
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+    op.alter_column(
+        'audit_logs', 'details',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using='pg_temp.audit_details_to_jsonb(details)'
+    )
+
+    op.add_column('audit_logs', sa.Column('job_id', sa.Integer(), nullable=True))
+    op.add_column('audit_logs', sa.Column('decision', sa.String(), nullable=True))
+    op.execute("""
+        UPDATE audit_logs
+        SET job_id = (details->>'job_id')::integer,
+            decision = details->>'decision'
+        WHERE event_type = 'application_evaluation'
+          AND jsonb_typeof(details) = 'object'
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_audit_logs_job_id_timestamp', 'audit_logs', ['job_id', 'timestamp'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_audit_logs_details', 'audit_logs', ['details'],
+            postgresql_using='gin', postgresql_ops={'details': 'jsonb_path_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_audit_logs_details', table_name='audit_logs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_audit_logs_job_id_timestamp', table_name='audit_logs', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('audit_logs', 'decision')
+    op.drop_column('audit_logs', 'job_id')
+    op.alter_column(
+        'audit_logs', 'details',
+        type_=sa.Text(),
+        postgresql_using='details::text'
+    )
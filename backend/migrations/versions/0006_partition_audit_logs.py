@@ -0,0 +1,120 @@
+"""audit_logs range-partitioned by month on timestamp
+
+The existing table is renamed aside, a partitioned audit_logs is created with
+a default partition and one partition per month from the oldest event to
+AUDIT_PARTITION_MONTHS_AHEAD months ahead, the rows are copied across and the
+old table is dropped. The primary key becomes (id, timestamp) because every
+unique constraint on a partitioned table must include the partition key.
+
+This copies the whole audit trail; on a large table stop the app (or at
+least the audit writer) and run it in a maintenance window. Later months
+are created at startup and by manage_audit_partitions.py.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import os
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, event_type, entity_type, entity_id, user_id, action, details, job_id, decision, ip_address, timestamp"
+
+INDEXES = [
+    ('ix_audit_logs_timestamp', ['timestamp'], {}),
+    ('ix_audit_logs_event_type_timestamp', ['event_type', 'timestamp'], {}),
+    ('ix_audit_logs_job_id_timestamp', ['job_id', 'timestamp'], {}),
+    ('ix_audit_logs_details', ['details'], {'postgresql_using': 'gin', 'postgresql_ops': {'details': 'jsonb_path_ops'}}),
+]
+
+
+def _columns():
+    return [
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('event_type', sa.String(), nullable=True),
+        sa.Column('entity_type', sa.String(), nullable=True),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.Column('decision', sa.String(), nullable=True),
+        sa.Column('ip_address', sa.String(), nullable=True),
+    ]
+
+
+def _rename_aside(suffix: str, indexes) -> None:
+    op.rename_table('audit_logs', f'audit_logs_{suffix}')
+    op.execute(f"ALTER SEQUENCE audit_logs_id_seq RENAME TO audit_logs_{suffix}_id_seq")
+    op.execute(f"ALTER INDEX audit_logs_pkey RENAME TO audit_logs_{suffix}_pkey")
+    for name in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _month(year: int, month: int) -> datetime:
+    return datetime(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    _rename_aside('legacy', [name for name, _, _ in INDEXES])
+
+    op.create_table('audit_logs',
+    *_columns(),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'timestamp'),
+    postgresql_partition_by='RANGE (timestamp)'
+    )
+    for name, columns, kwargs in INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False, **kwargs)
+    op.create_index('ix_audit_logs_entity', 'audit_logs', ['entity_type', 'entity_id', 'timestamp'], unique=False)
+
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(timestamp) FROM audit_logs_legacy")).scalar()
+    now = datetime.utcnow()
+    first = oldest or now
+    months_ahead = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", 2))
+    total = (now.year - first.year) * 12 + now.month - first.month + months_ahead + 1
+    for offset in range(total):
+        start = _month(first.year, first.month + offset)
+        end = _month(first.year, first.month + offset + 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_{start.year:04d}_{start.month:02d} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+    op.execute(f"""
+        INSERT INTO audit_logs ({COLUMNS})
+        SELECT {COLUMNS.replace('timestamp', "coalesce(timestamp, now() AT TIME ZONE 'utc')")}
+        FROM audit_logs_legacy
+    """)
+    op.execute("SELECT setval('audit_logs_id_seq', coalesce((SELECT max(id) FROM audit_logs), 0) + 1, false)")
+    op.drop_table('audit_logs_legacy')
+
+
+def downgrade() -> None:
+    _rename_aside('partitioned', [name for name, _, _ in INDEXES] + ['ix_audit_logs_entity'])
+
+    op.create_table('audit_logs',
+    *_columns(),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    for name, columns, kwargs in INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False, **kwargs)
+
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned")
+    op.execute("SELECT setval('audit_logs_id_seq', coalesce((SELECT max(id) FROM audit_logs), 0) + 1, false)")
+    # Drops every partition with it
+    op.drop_table('audit_logs_partitioned')
@@ -0,0 +1,37 @@
+"""updated_at on the tables the master report reads
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('candidates', 'applications', 'application_details', 'jobs', 'companies')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows count as last changed when they were created
+    for table in ('candidates', 'applications', 'jobs', 'companies'):
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+    op.execute(
+        "UPDATE application_details d SET updated_at = a.created_at "
+        "FROM applications a WHERE a.id = d.application_id"
+    )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
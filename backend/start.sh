@@ -11,10 +11,9 @@ python --version
 echo "Installed packages:"
 pip list
 
-# Run database migrations (if needed)
-# Uncomment if you're using Alembic migrations
-# echo "Running database migrations..."
-# alembic upgrade head
+# Run database migrations
+echo "Running database migrations..."
+alembic upgrade head || exit 1
 
 # Start the FastAPI application
 echo "Starting FastAPI server..."
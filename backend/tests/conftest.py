@@ -0,0 +1,226 @@
+"""
+Shared pytest configuration
+
+app.config refuses to import without DATABASE_URL / HF_API_KEY, so placeholders
+are provided for tests that never touch the database or the embedding API.
+The startup prewarm never calls the embedding API during tests, and the audit
+spool lives in a temporary directory.
+
+Database tests run against the PostgreSQL database named by TEST_DATABASE_URL
+(its tables are dropped and recreated) and are skipped when it is not set.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+if os.getenv("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+else:
+    os.environ.setdefault("DATABASE_URL", "postgresql://localhost/agentic_test")
+os.environ.setdefault("HF_API_KEY", "test-key")
+os.environ.setdefault("PREWARM_EMBEDDING_REQUEST", "false")
+# Spooled audit events and the spool lock never land in the working directory
+os.environ["AUDIT_SPOOL_PATH"] = os.path.join(tempfile.mkdtemp(prefix="audit-spool-"), "audit_spool.jsonl")
+
+
+@pytest.fixture(autouse=True)
+def fragment_cache_dir(tmp_path, monkeypatch):
+    """Report fragments are cached per test, never in the working directory"""
+    from app.services.report_fragments import fragment_cache
+
+    directory = tmp_path / "fragments"
+    monkeypatch.setattr(fragment_cache, "directory", str(directory))
+    return directory
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Engine bound to a freshly created test schema"""
+    if not os.getenv("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    from app.main import app  # noqa: F401 - registers every model
+    from app.database import Base, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db(db_engine):
+    """Session whose data is wiped after each test"""
+    from app.database import Base, SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+@pytest.fixture
+def client(db):
+    """TestClient whose requests share the test session"""
+    from fastapi.testclient import TestClient
+    from app.database import async_engine
+    from app.dependencies import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as test_client:
+        yield test_client
+        # asyncpg connections belong to this client's event loop
+        test_client.portal.call(async_engine.dispose)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def count_queries(db_engine):
+    """Context manager yielding a list that collects every statement executed inside it"""
+    from sqlalchemy import event
+    from app.database import async_engine
+
+    engines = (db_engine, async_engine.sync_engine)
+
+    @contextmanager
+    def _count():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Check a response's X-DB-Query-Count (statements run by that request only) against a budget"""
+    def _check(response, limit):
+        count = int(response.headers["x-db-query-count"])
+        assert count <= limit, (
+            f"{response.request.method} {response.request.url.path} ran {count} SQL statements (budget {limit})"
+        )
+        return count
+
+    return _check
+
+
+@pytest.fixture
+def bytes_loaded(db_engine):
+    """Context manager yielding a one-item list with the size of all ORM column data loaded inside it"""
+    from sqlalchemy import event, inspect
+    from app.database import Base
+
+    def _size(value):
+        return len(value) if isinstance(value, (str, bytes)) else len(repr(value))
+
+    @contextmanager
+    def _measure():
+        total = [0]
+
+        def on_load(target, *args):
+            state = inspect(target)
+            total[0] += sum(
+                _size(state.dict[attr.key])
+                for attr in state.mapper.column_attrs
+                if attr.key in state.dict
+            )
+
+        event.listen(Base, "load", on_load, propagate=True)
+        event.listen(Base, "refresh", on_load, propagate=True)
+        try:
+            yield total
+        finally:
+            event.remove(Base, "load", on_load)
+            event.remove(Base, "refresh", on_load)
+
+    return _measure
+
+
+@pytest.fixture
+def seed(db):
+    """Factory creating companies, jobs, candidates and evaluated applications"""
+    from app.models.application import Application
+    from app.models.candidate import Candidate
+    from app.models.company import Company
+    from app.models.job import Job
+    from app.services.candidate_summary_service import update_candidate_summary
+
+    def _seed(candidates=3, jobs=2, resume_text="Python developer with SQL experience"):
+        company_rows = [Company(name=f"Company {i}", description="Test company") for i in range(jobs)]
+        db.add_all(company_rows)
+        db.flush()
+
+        job_rows = [
+            Job(
+                company_id=company.id,
+                role=f"Engineer {i}",
+                required_experience=2,
+                jd_text="Python, SQL and Docker required",
+                jd_embedding=[0.1] * 384,
+                skills_extracted={"all_skills": ["python", "sql"], "technical_skills": ["python", "sql"]},
+            )
+            for i, company in enumerate(company_rows)
+        ]
+        db.add_all(job_rows)
+        db.flush()
+
+        candidate_rows = []
+        for i in range(candidates):
+            candidate = Candidate(
+                name=f"Candidate {i}",
+                email=f"candidate{i}@example.com",
+                experience=3,
+                resume_text=resume_text,
+                resume_embedding=[0.2] * 384,
+                skills_extracted={"all_skills": ["python"], "technical_skills": ["python"]},
+            )
+            candidate_rows.append(candidate)
+            db.add(candidate)
+            db.flush()
+
+            for job in job_rows:
+                score = round(0.4 + ((i * 7 + job.id) % 50) / 100, 4)
+                db.add(Application(
+                    job_id=job.id,
+                    candidate_id=candidate.id,
+                    rfs=score,
+                    dcs=score,
+                    elc=1.0,
+                    composite_score=score,
+                    rank=i + 1,
+                    similarity_index=0.1,
+                    fraud_flag=False,
+                    fraud_details={"fraud_flag": False},
+                    decision="Selected" if score >= 0.65 else "Rejected",
+                    decision_reason="Test decision",
+                    explanation={"skill_gap_analysis": {"summary": {}}},
+                    skill_match={"matched_skills": ["python"], "missing_skills": ["sql"], "match_score": 0.5},
+                    experience_details={"required": 2, "candidate": 3},
+                    status="evaluated",
+                ))
+        db.flush()
+
+        # Maintain the dashboard rollup the same way the pipeline does
+        for application in db.query(Application).filter(
+            Application.candidate_id.in_([c.id for c in candidate_rows])
+        ).order_by(Application.id):
+            update_candidate_summary(db, application)
+        db.commit()
+        return {"companies": company_rows, "jobs": job_rows, "candidates": candidate_rows}
+
+    return _seed
@@ -0,0 +1,24 @@
+"""
+The payloads moved to application_details are still part of list responses
+"""
+import pytest
+
+PAYLOADS = ("explanation", "fraud_details", "skill_match", "experience_details")
+
+
+@pytest.mark.parametrize("route", ["/apply/", "/candidate/{candidate_id}/applications"])
+def test_application_lists_include_detail_payloads(client, seed, route):
+    data = seed(candidates=2, jobs=2)
+
+    response = client.get(route.format(candidate_id=data["candidates"][0].id))
+    assert response.status_code == 200
+
+    applications = response.json()["applications"]
+    assert applications
+    for application in applications:
+        assert set(PAYLOADS) <= set(application)
+        assert application["composite_score"] is not None
+        assert application["fraud_details"] == {"fraud_flag": False}
+        assert application["skill_match"]["matched_skills"] == ["python"]
+        assert application["experience_details"] == {"required": 2, "candidate": 3}
+        assert "skill_gap_analysis" in application["explanation"]
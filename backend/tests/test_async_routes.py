@@ -0,0 +1,73 @@
+"""
+Tests for the routes served through the async (asyncpg) session
+
+PDF parsing and the embedding API are replaced with canned results; the
+database work and the hiring pipeline run for real.
+"""
+from app.models.application import Application
+from app.models.audit_log import AuditLog
+from app.models.job import Job
+from app.routes import application_routes, job_routes
+from app.services.audit_writer import flush_audit_events
+
+RESUME = "Senior Python developer with 5 years of SQL, Docker and FastAPI experience"
+JD = "We need a Python engineer with SQL and Docker skills"
+PDF = ("doc.pdf", b"%PDF-1.4 test", "application/pdf")
+
+
+def _fake_parsing(monkeypatch, module, key, text):
+    monkeypatch.setattr(module, "get_embedding", lambda text: [0.3] * 384)
+    parser = "parse_resume_pdf" if key == "resume_text" else "parse_jd_pdf"
+    monkeypatch.setattr(module, parser, lambda content: {"success": True, key: text, "page_count": 1})
+
+
+def test_create_job_with_company(client, db, monkeypatch):
+    _fake_parsing(monkeypatch, job_routes, "jd_text", JD)
+
+    response = client.post("/job/create-with-company", data={
+        "company_name": "Acme",
+        "company_description": "Widgets",
+        "role": "Backend Engineer",
+        "required_experience": 2,
+    }, files={"jd_pdf": PDF})
+
+    assert response.status_code == 200
+    job_id = response.json()["job"]["id"]
+    assert db.query(Job).filter(Job.id == job_id).one().jd_text == JD
+    flush_audit_events()
+    assert db.query(AuditLog).filter(AuditLog.event_type == "job_creation").count() == 1
+
+
+def test_apply_runs_pipeline(client, db, seed, monkeypatch):
+    company = seed(candidates=2, jobs=1)["companies"][0]
+    _fake_parsing(monkeypatch, application_routes, "resume_text", RESUME)
+
+    response = client.post(f"/apply/{company.id}", data={
+        "name": "New Candidate",
+        "email": "new@example.com",
+        "mobile": "123",
+        "experience": 5,
+    }, files={"resume_pdf": PDF})
+
+    assert response.status_code == 200
+    data = response.json()
+    application = db.query(Application).filter(Application.id == data["application_id"]).one()
+    assert application.decision == data["decision"]
+    assert "basic_explanation" in data["explanation"]
+
+    duplicate = client.post(f"/apply/{company.id}", data={
+        "name": "New Candidate",
+        "email": "new@example.com",
+        "mobile": "123",
+        "experience": 5,
+    }, files={"resume_pdf": PDF})
+    assert duplicate.status_code == 400
+
+
+def test_rankings(client, seed):
+    job_id = seed(candidates=4, jobs=1)["jobs"][0].id
+
+    data = client.get(f"/analytics/job/{job_id}/rankings").json()
+
+    assert [entry["rank"] for entry in data["rankings"]] == [1, 2, 3, 4]
+    assert client.get("/analytics/job/999999/rankings").status_code == 404
@@ -0,0 +1,119 @@
+"""
+Tests for monthly audit_logs partitioning, retention and archiving
+"""
+import json
+from datetime import datetime
+
+import pytest
+import zstandard
+from sqlalchemy import text
+
+from app.models.audit_log import AuditLog
+from app.services.audit_partitions import (
+    add_months, apply_retention, create_partition, ensure_partitions, list_partitions, month_start
+)
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _insert(db, timestamp, entity_id=1):
+    db.add(AuditLog(
+        event_type="job_creation", entity_type="job", entity_id=entity_id,
+        action="create", details={"role": "Engineer"}, timestamp=timestamp
+    ))
+    db.commit()
+
+
+def _partition_of(db, entity_id):
+    partition = db.execute(
+        text("SELECT tableoid::regclass::text FROM audit_logs WHERE entity_id = :id"), {"id": entity_id}
+    ).scalar()
+    db.commit()  # release the lock so partitions can be created / dropped
+    return partition
+
+
+def _relations(node):
+    """Tables scanned anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    found = {node["Relation Name"]} if "Relation Name" in node else set()
+    for child in node.get("Plans", []):
+        found |= _relations(child)
+    return found
+
+
+@pytest.fixture
+def partitions(db, db_engine):
+    """Start and finish with only the default partition (the app lifespan creates monthly ones)"""
+    def drop_monthly():
+        db.rollback()
+        with db_engine.begin() as conn:
+            for partition in list_partitions(conn):
+                conn.execute(text(f"DROP TABLE {partition['name']}"))
+
+    drop_monthly()
+    yield
+    drop_monthly()
+
+
+def test_months_roll_over_years():
+    assert add_months(datetime(2026, 11, 5), 2) == datetime(2027, 1, 1)
+    assert add_months(datetime(2026, 1, 31), -13) == datetime(2024, 12, 1)
+    assert month_start(NOW) == datetime(2026, 10, 1)
+
+
+def test_events_are_routed_to_their_month(db, db_engine, partitions):
+    assert ensure_partitions(months_ahead=1, now=NOW) == ["audit_logs_2026_10", "audit_logs_2026_11"]
+    assert ensure_partitions(months_ahead=1, now=NOW) == []
+
+    _insert(db, datetime(2026, 10, 20), entity_id=1)
+    _insert(db, datetime(2026, 11, 2), entity_id=2)
+    _insert(db, datetime(2027, 6, 1), entity_id=3)
+
+    assert _partition_of(db, 1) == "audit_logs_2026_10"
+    assert _partition_of(db, 2) == "audit_logs_2026_11"
+    assert _partition_of(db, 3) == "audit_logs_default"
+
+
+def test_new_partition_takes_over_rows_from_default(db, db_engine, partitions):
+    _insert(db, datetime(2026, 12, 24), entity_id=7)
+    assert _partition_of(db, 7) == "audit_logs_default"
+
+    with db_engine.begin() as conn:
+        assert create_partition(conn, datetime(2026, 12, 1))
+
+    assert _partition_of(db, 7) == "audit_logs_2026_12"
+
+
+def test_range_queries_only_scan_matching_partitions(db, db_engine, partitions):
+    ensure_partitions(months_ahead=2, now=NOW)
+    plan = db.execute(text("""
+        EXPLAIN (FORMAT JSON)
+        SELECT count(*) FROM audit_logs
+        WHERE timestamp >= '2026-11-01' AND timestamp < '2026-11-15'
+    """)).scalar()
+    db.commit()
+    assert _relations(plan[0]["Plan"]) == {"audit_logs_2026_11"}
+
+
+def test_retention_archives_and_drops_old_months(db, db_engine, partitions, tmp_path):
+    ensure_partitions(months_ahead=0, now=datetime(2025, 3, 1))
+    ensure_partitions(months_ahead=0, now=NOW)
+    for i in range(3):
+        _insert(db, datetime(2025, 3, 10 + i), entity_id=100 + i)
+    _insert(db, datetime(2026, 10, 1), entity_id=200)
+
+    assert [r["partition"] for r in apply_retention(12, str(tmp_path), now=NOW, dry_run=True)] == ["audit_logs_2025_03"]
+
+    results = apply_retention(12, str(tmp_path), now=NOW)
+
+    assert [(r["partition"], r["rows"]) for r in results] == [("audit_logs_2025_03", 3)]
+    with db_engine.connect() as conn:
+        assert [p["name"] for p in list_partitions(conn)] == ["audit_logs_2026_10"]
+        assert conn.execute(text("SELECT to_regclass('audit_logs_2025_03')")).scalar() is None
+
+    with open(results[0]["archive"], "rb") as archive:
+        lines = zstandard.ZstdDecompressor().stream_reader(archive).read().decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["entity_id"] for row in rows] == [100, 101, 102]
+    assert rows[0]["details"] == {"role": "Engineer"}
+    assert db.query(AuditLog).count() == 1
+    db.commit()
@@ -0,0 +1,62 @@
+"""
+Audit reports are answered by aggregate queries over the promoted columns
+"""
+from datetime import datetime, timedelta
+
+from app.models.audit_log import AuditLog
+from app.services.audit_service import AuditService
+from app.services.audit_writer import audit_writer
+
+
+def _evaluate(db, application_id, job_id, decision, fraud=False):
+    AuditService.log_application_evaluation(
+        db, application_id, job_id, 1,
+        {"composite": 0.7}, {"fraud_flag": fraud}, decision, "Test", {"summary": "ok"}
+    )
+
+
+def _log_events(db):
+    try:
+        _evaluate(db, 1, 10, "Selected")
+        _evaluate(db, 2, 10, "Rejected")
+        _evaluate(db, 3, 10, "Selected")
+        _evaluate(db, 4, 20, "Selected", fraud=True)
+        AuditService.log_job_creation(db, 10, 1, "Engineer")
+        AuditService.log_fraud_detection(db, 1, {"fraud_flag": True})
+    finally:
+        audit_writer.stop()
+
+
+def test_evaluations_fill_promoted_columns(db):
+    _log_events(db)
+
+    row = db.query(AuditLog).filter(AuditLog.entity_id == 2, AuditLog.event_type == "application_evaluation").one()
+    assert (row.job_id, row.decision) == (10, "Rejected")
+    assert row.details["decision_reason"] == "Test"
+
+
+def test_audit_report_is_one_aggregate_query(db, count_queries):
+    _log_events(db)
+    now = datetime.utcnow()
+
+    with count_queries() as statements:
+        report = AuditService.generate_audit_report(db, now - timedelta(hours=1), now + timedelta(hours=1))
+
+    assert len(statements) == 1
+    assert report["total_events"] == 6
+    assert report["decision_distribution"] == {"Selected": 3, "Rejected": 1}
+    assert report["applications_processed"] == 4
+    assert report["jobs_created"] == 1
+    assert report["fraud_flags"] == 1
+
+
+def test_job_audit_and_containment_search(db):
+    _log_events(db)
+
+    job_logs = AuditService.get_job_applications_audit(db, 10)
+    assert sorted(log.entity_id for log in job_logs) == [1, 2, 3]
+
+    flagged = AuditService.search_events(
+        db, {"fraud_analysis": {"fraud_flag": True}}, event_type="application_evaluation"
+    )
+    assert [log.entity_id for log in flagged] == [4]
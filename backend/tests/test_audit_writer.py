@@ -0,0 +1,193 @@
+"""
+Tests for the batched audit writer
+"""
+import fcntl
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy.exc import OperationalError
+
+from app.models.audit_log import AuditLog
+from app.services.audit_service import AuditService
+from app.services.audit_writer import AuditWriter, audit_writer
+
+
+def _event(i):
+    return {
+        "event_type": "job_creation", "entity_type": "job", "entity_id": i, "user_id": None, "action": "create",
+        "details": {"role": f"Engineer {i}"}, "ip_address": None, "job_id": None, "decision": None,
+    }
+
+
+def _submit(writer, count):
+    for i in range(count):
+        writer.submit("job_creation", "job", i, "create", {"role": f"Engineer {i}"})
+
+
+def test_flush_writes_one_multi_row_insert(db, count_queries, tmp_path):
+    writer = AuditWriter(batch_size=100, flush_interval=60, spool_path=str(tmp_path / "spool.jsonl"))
+    try:
+        _submit(writer, 25)
+        assert writer.pending() == 25
+
+        with count_queries() as statements:
+            assert writer.flush()
+    finally:
+        writer.stop()
+
+    inserts = [s for s in statements if s.startswith("INSERT INTO audit_logs")]
+    assert len(inserts) == 1
+    assert db.query(AuditLog).count() == 25
+    assert db.query(AuditLog).first().details["role"].startswith("Engineer")
+
+
+def test_background_thread_flushes_on_interval(db, tmp_path):
+    writer = AuditWriter(batch_size=100, flush_interval=0.05, spool_path=str(tmp_path / "spool.jsonl"))
+    try:
+        _submit(writer, 3)
+        deadline = time.time() + 5
+        while writer.events_written < 3 and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        writer.stop()
+
+    assert db.query(AuditLog).count() == 3
+
+
+def test_unwritten_events_are_spooled_and_replayed(db, tmp_path, monkeypatch):
+    spool = tmp_path / "spool.jsonl"
+    writer = AuditWriter(batch_size=100, flush_interval=60, spool_path=str(spool))
+
+    def database_down(batch):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(writer, "_insert", database_down)
+    _submit(writer, 4)
+    writer.stop()
+
+    assert len(spool.read_text().splitlines()) == 4
+    assert db.query(AuditLog).count() == 0
+
+    monkeypatch.undo()
+    writer.start()
+    writer.stop()
+
+    assert not spool.exists()
+    assert db.query(AuditLog).count() == 4
+
+
+def test_log_methods_do_no_database_work(db, count_queries):
+    try:
+        with count_queries() as statements:
+            AuditService.log_job_creation(db, 1, 1, "Engineer")
+            AuditService.log_fraud_detection(db, 1, {"fraud_flag": True})
+        assert statements == []
+    finally:
+        audit_writer.stop()
+
+    assert db.query(AuditLog).count() == 2
+
+
+def test_concurrent_replays_insert_each_event_once(db, tmp_path):
+    spool = tmp_path / "spool.jsonl"
+    spooler = AuditWriter(spool_path=str(spool))
+    spooler._spool([{**_event(i), "timestamp": datetime.utcnow()} for i in range(6)])
+
+    # Separate writers stand in for worker processes sharing one spool
+    writers = [AuditWriter(batch_size=2, spool_path=str(spool)) for _ in range(4)]
+    with ThreadPoolExecutor(len(writers)) as pool:
+        replayed = list(pool.map(lambda writer: writer.replay_spool(), writers))
+
+    assert sorted(replayed) == [0, 0, 0, 6]
+    assert not spool.exists()
+    assert not list(tmp_path.glob("*.replay"))
+    assert db.query(AuditLog).count() == 6
+
+
+def test_submit_leaves_spool_replay_to_the_writer_thread(db, tmp_path, monkeypatch):
+    writer = AuditWriter(batch_size=100, flush_interval=60, spool_path=str(tmp_path / "spool.jsonl"))
+    submitting = threading.get_ident()
+    replayed_on = []
+    monkeypatch.setattr(writer, "_retry_spool", lambda: replayed_on.append(threading.get_ident()))
+    try:
+        _submit(writer, 1)
+    finally:
+        writer.stop()
+
+    assert replayed_on and submitting not in replayed_on
+
+
+def test_spool_is_retried_with_backoff_while_running(db, tmp_path, monkeypatch):
+    spool = tmp_path / "spool.jsonl"
+    writer = AuditWriter(flush_interval=0.02, spool_path=str(spool), replay_backoff=0.05, replay_max_backoff=0.1)
+    insert = writer._insert
+    failures = []
+
+    def flaky_insert(batch):
+        if len(failures) < 3:
+            failures.append(len(batch))
+            raise OperationalError("INSERT", {}, ConnectionError("database unavailable"))
+        insert(batch)
+
+    monkeypatch.setattr(writer, "_insert", flaky_insert)
+    writer._spool([{**_event(i), "timestamp": datetime.utcnow()} for i in range(3)])
+    writer.start()
+    try:
+        deadline = time.time() + 5
+        while writer.events_written < 3 and time.time() < deadline:
+            time.sleep(0.02)
+        assert writer._replay_delay == 0
+    finally:
+        writer.stop()
+
+    assert failures == [3, 3, 3]
+    assert db.query(AuditLog).count() == 3
+    assert not spool.exists()
+
+
+def test_rejected_batches_move_to_dead_letter(db, tmp_path, monkeypatch):
+    spool = tmp_path / "spool.jsonl"
+    writer = AuditWriter(batch_size=2, spool_path=str(spool), replay_max_attempts=3)
+    insert = writer._insert
+
+    def reject_entity_zero(batch):
+        if any(event["entity_id"] == 0 for event in batch):
+            raise ValueError("bad event")
+        insert(batch)
+
+    monkeypatch.setattr(writer, "_insert", reject_entity_zero)
+    writer._spool([{**_event(i), "timestamp": datetime.utcnow()} for i in range(4)])
+
+    assert writer.replay_spool() == 2
+    assert writer.replay_spool() == 0
+    assert len(spool.read_text().splitlines()) == 2
+    assert writer.replay_spool() == 0
+
+    assert not spool.exists()
+    dead = [json.loads(line) for line in (tmp_path / "spool.jsonl.dead").read_text().splitlines()]
+    assert sorted(event["entity_id"] for event in dead) == [0, 1]
+    assert {event["attempts"] for event in dead} == {3}
+    assert db.query(AuditLog).count() == 2
+
+
+def test_orphaned_replay_files_are_claimed_unless_locked(db, tmp_path):
+    spool = tmp_path / "spool.jsonl"
+    writer = AuditWriter(spool_path=str(spool))
+    writer._spool([{**_event(i), "timestamp": datetime.utcnow()} for i in range(2)])
+    orphan = tmp_path / "spool.jsonl.4242.dead0.replay"
+    spool.rename(orphan)
+    writer._spool([{**_event(i), "timestamp": datetime.utcnow()} for i in range(2, 5)])
+    busy = tmp_path / "spool.jsonl.4343.busy.replay"
+    spool.rename(busy)
+
+    with open(busy) as held:
+        fcntl.flock(held, fcntl.LOCK_EX)  # another worker is replaying this one
+        assert writer.replay_spool() == 2
+
+    assert not orphan.exists() and busy.exists()
+    assert writer.replay_spool() == 3
+    assert not busy.exists()
+    assert db.query(AuditLog).count() == 5
@@ -0,0 +1,53 @@
+"""
+Tests for the candidate master endpoints
+"""
+
+
+def test_master_all_query_count_is_constant(client, seed, count_queries):
+    seed(candidates=12, jobs=3)
+
+    with count_queries() as small_page:
+        response = client.get("/candidate/master/all", params={"limit": 2})
+    assert response.status_code == 200
+    assert response.json()["showing"] == 2
+
+    with count_queries() as large_page:
+        response = client.get("/candidate/master/all", params={"limit": 12})
+    assert response.status_code == 200
+    assert response.json()["showing"] == 12
+
+    assert len(large_page) == len(small_page)
+
+
+def test_master_all_payload(client, seed):
+    seed(candidates=2, jobs=2)
+
+    data = client.get("/candidate/master/all").json()
+    candidate = data["candidates"][0]
+
+    assert data["global_statistics"]["total_applications"] == 4
+    assert candidate["application_summary"]["total_applications"] == 2
+    assert candidate["application_summary"]["best_application"]["job_role"].startswith("Engineer")
+    application = candidate["applications"][0]
+    assert application["company_details"]["company_name"].startswith("Company")
+    assert application["skill_analysis"]["skill_match"]["matched_skills"] == ["python"]
+
+
+def test_candidate_master_query_count_is_independent_of_applications(client, seed, count_queries):
+    data = seed(candidates=2, jobs=1)
+    few_id = data["candidates"][0].id
+    data = seed(candidates=1, jobs=6)
+    many_id = data["candidates"][0].id
+
+    with count_queries() as few:
+        assert client.get(f"/candidate/{few_id}/master").status_code == 200
+    with count_queries() as many:
+        response = client.get(f"/candidate/{many_id}/master")
+    assert response.status_code == 200
+    assert response.json()["application_summary"]["total_applications"] == 6
+
+    assert len(many) == len(few)
+
+
+def test_candidate_master_not_found(client, db_engine):
+    assert client.get("/candidate/999/master").status_code == 404
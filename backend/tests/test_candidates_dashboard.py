@@ -0,0 +1,63 @@
+"""
+Tests for the candidate_summary rollup and the dashboard served from it
+"""
+from app.models.candidate_summary import CandidateSummary
+from app.services.candidate_summary_service import get_tier, rebuild_candidate_summaries
+
+
+def _summaries(db):
+    return {
+        row.candidate_id: (row.best_application_id, row.best_score, row.tier, row.status, row.total_applications)
+        for row in db.query(CandidateSummary).all()
+    }
+
+
+def test_incremental_summary_matches_rebuild(db, seed):
+    seed(candidates=6, jobs=3)
+    incremental = _summaries(db)
+
+    rebuild_candidate_summaries(db)
+
+    assert _summaries(db) == incremental
+    assert all(total == 3 for *_, total in incremental.values())
+
+
+def test_dashboard_statistics_and_order(client, seed):
+    seed(candidates=8, jobs=2)
+
+    data = client.get("/analytics/candidates/dashboard").json()
+    candidates = data["candidates"]
+    stats = data["statistics"]
+
+    assert stats["total_candidates"] == 8
+    assert sum(stats["by_status"].values()) == 8
+    assert sum(stats["by_tier"].values()) == 8
+    scores = [c["scores"]["composite_score"] for c in candidates]
+    assert scores == sorted(scores, reverse=True)
+    assert all(c["tier"] == get_tier(c["scores"]["composite_score"]) for c in candidates)
+    assert candidates[0]["best_application"]["company_name"].startswith("Company")
+
+
+def test_dashboard_filters_and_pagination(client, seed):
+    seed(candidates=8, jobs=2)
+
+    everything = client.get("/analytics/candidates/dashboard").json()
+    selected = client.get("/analytics/candidates/dashboard", params={"status_filter": "Selected"}).json()
+    page = client.get("/analytics/candidates/dashboard", params={"skip": 2, "limit": 3}).json()
+
+    assert selected["pagination"]["total"] == everything["statistics"]["by_status"]["selected"]
+    assert all(c["status"] == "Selected" for c in selected["candidates"])
+    assert page["pagination"]["showing"] == 3
+    assert page["candidates"] == everything["candidates"][2:5]
+
+
+def test_dashboard_query_count_is_constant(client, seed, count_queries):
+    seed(candidates=3, jobs=1)
+    with count_queries() as few:
+        client.get("/analytics/candidates/dashboard")
+
+    seed(candidates=20, jobs=4)
+    with count_queries() as many:
+        client.get("/analytics/candidates/dashboard")
+
+    assert len(many) == len(few)
@@ -0,0 +1,81 @@
+"""
+Tests for the score chart renderers (pooled PNG and reportlab vector)
+"""
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+from reportlab.graphics.shapes import Rect
+from reportlab.platypus import SimpleDocTemplate
+
+from app.services.chart_renderer import ChartRenderer, draw_score_chart, score_key
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_score_key_rounds_to_displayed_precision():
+    scores = {"role_fit_score": 0.81234, "domain_competency_score": 0.5,
+              "experience_level_compatibility": None, "composite_score": 0.66666}
+    assert score_key(scores) == (81.2, 50.0, 0.0, 66.7)
+    assert score_key({**scores, "role_fit_score": 0.81199}) == score_key(scores)
+
+
+def test_shared_scores_render_once():
+    renderer = ChartRenderer(workers=1, cache_size=10)
+    keys = [(80.0, 70.0, 60.0, 75.0), (80.0, 70.0, 60.0, 75.0), (10.0, 20.0, 30.0, 40.0)]
+
+    charts = renderer.render_many(keys)
+    assert set(charts) == set(keys)
+    assert all(png.startswith(PNG_SIGNATURE) for png in charts.values())
+    assert renderer.charts_rendered == 2
+
+    renderer.render_many(keys)
+    assert renderer.charts_rendered == 2
+    assert renderer.cache_hits == 2
+
+
+def test_cache_evicts_least_recently_used():
+    renderer = ChartRenderer(workers=1, cache_size=2)
+    first, second, third = (1.0, 1.0, 1.0, 1.0), (2.0, 2.0, 2.0, 2.0), (3.0, 3.0, 3.0, 3.0)
+
+    renderer.render_many([first, second])
+    renderer.render(first)
+    renderer.render(third)
+
+    assert renderer.stats()["cached_charts"] == 2
+    renderer.render(first)
+    assert renderer.charts_rendered == 3  # still cached
+    renderer.render(second)
+    assert renderer.charts_rendered == 4  # was evicted
+
+
+def test_process_pool_matches_in_process_rendering():
+    keys = [(float(i), 50.0, 60.0, 70.0) for i in range(4)]
+    pooled = ChartRenderer(workers=2)
+    try:
+        charts = pooled.render_many(keys)
+    finally:
+        pooled.shutdown()
+
+    assert list(charts) == keys
+    assert charts == ChartRenderer(workers=1).render_many(keys)
+
+
+def test_vector_chart_bars_are_proportional_to_scores():
+    drawing = draw_score_chart((25.0, 50.0, 100.0, 0.0))
+
+    bars = [shape for shape in drawing.contents if isinstance(shape, Rect) and shape.fillColor is not None]
+    widths = [bar.width for bar in bars]
+    assert widths[0] * 2 == widths[1] and widths[0] * 4 == widths[2] and widths[3] == 0
+
+    labels = {shape.text for shape in drawing.contents if hasattr(shape, "text")}
+    assert {"Score Breakdown", "RFS", "Composite", "25.0%", "100.0%"} <= labels
+
+
+def test_vector_chart_embeds_no_image():
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer).build([draw_score_chart((81.2, 50.0, 70.0, 66.7))])
+
+    page = PdfReader(BytesIO(buffer.getvalue())).pages[0]
+    xobjects = page["/Resources"].get("/XObject", {})
+    assert not xobjects
+    assert "Score Breakdown" in page.extract_text()
@@ -0,0 +1,49 @@
+"""
+Tests for the company application breakdown endpoint
+"""
+from app.models.application import Application
+
+
+def test_statistics_and_sorted_page(client, db, seed):
+    rows = seed(candidates=10, jobs=1)
+    company = rows["companies"][0]
+    apps = db.query(Application).filter(Application.job_id == rows["jobs"][0].id).all()
+
+    data = client.get(
+        f"/job/{company.id}/applications",
+        params={"sort_by": "composite_score", "order": "desc", "skip": 1, "limit": 4}
+    ).json()
+
+    expected = sorted(apps, key=lambda app: (-app.composite_score, -app.id))[1:5]
+    assert [app["id"] for app in data["applications"]] == [app.id for app in expected]
+    assert data["total_applications"] == len(apps)
+    assert data["statistics"]["selected"] == sum(app.decision == "Selected" for app in apps)
+    assert data["applications"][0]["skill_match"]["matched_skills"] == ["python"]
+    assert "skill_gap_analysis" in data["applications"][0]["explanation"]
+
+
+def test_status_filter_total(client, seed):
+    company = seed(candidates=10, jobs=1)["companies"][0]
+
+    data = client.get(f"/job/{company.id}/applications", params={"status_filter": "Rejected"}).json()
+
+    assert data["total_applications"] == data["statistics"]["rejected"]
+    assert all(app["decision"] == "Rejected" for app in data["applications"])
+
+
+def test_query_count_is_constant(client, seed, count_queries):
+    company = seed(candidates=2, jobs=1)["companies"][0]
+    with count_queries() as few:
+        client.get(f"/job/{company.id}/applications")
+
+    company = seed(candidates=30, jobs=1)["companies"][0]
+    with count_queries() as many:
+        client.get(f"/job/{company.id}/applications")
+
+    assert len(many) == len(few)
+
+
+def test_invalid_sort_column(client, seed):
+    company = seed(candidates=1, jobs=1)["companies"][0]
+
+    assert client.get(f"/job/{company.id}/applications", params={"sort_by": "name"}).status_code == 400
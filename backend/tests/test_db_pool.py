@@ -0,0 +1,67 @@
+"""
+Tests for the instrumented connection pools and the pool-exhaustion guard
+"""
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import Session
+
+from app.core.db_pool import InstrumentedQueuePool, PoolStats, pool_status
+
+
+def _small_engine(db_engine, **options):
+    class TestPool(InstrumentedQueuePool):
+        stats = PoolStats("test")
+
+    settings = {"pool_size": 1, "max_overflow": 0, "pool_timeout": 0.1}
+    settings.update(options)
+    return create_engine(db_engine.url, poolclass=TestPool, **settings)
+
+
+def test_checkouts_and_overflow_are_counted(db_engine):
+    engine = _small_engine(db_engine, max_overflow=1)
+    first = engine.connect()
+    second = engine.connect()
+
+    status = pool_status(engine)
+    assert status["in_use"] == 2
+    assert status["checkouts"] == 2
+    assert status["overflow_events"] == 1
+
+    first.close()
+    second.close()
+    engine.dispose()
+
+
+def test_exhausted_pool_times_out(db_engine):
+    engine = _small_engine(db_engine)
+    held = engine.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    assert pool_status(engine)["timeouts"] == 1
+    held.close()
+    engine.dispose()
+
+
+def test_exhausted_pool_returns_503(client, db_engine):
+    from app.dependencies import get_db
+    from app.main import app
+
+    engine = _small_engine(db_engine)
+    held = engine.connect()
+    app.dependency_overrides[get_db] = lambda: Session(bind=engine)
+
+    response = client.get("/candidate/")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
+    held.close()
+    engine.dispose()
+
+
+def test_health_db_reports_both_pools(client):
+    pools = client.get("/health/db").json()["pools"]
+
+    assert [pool["pool"] for pool in pools] == ["sync", "async"]
+    assert all("checkout_ms_avg" in pool for pool in pools)
@@ -0,0 +1,41 @@
+"""
+Regression tests for the bytes fetched by endpoints that only need ids and names
+
+Each endpoint is measured twice, over resumes of very different sizes: with the
+bulky columns deferred, the amount of data loaded must not grow with them.
+"""
+import pytest
+
+SHORT_RESUME = "Python developer"
+LONG_RESUME = "Python developer with SQL experience. " * 2000
+
+
+def _measure(client, seed, bytes_loaded, resume_text, path):
+    rows = seed(candidates=5, jobs=1, resume_text=resume_text)
+    url = path.format(job_id=rows["jobs"][0].id, candidate_id=rows["candidates"][0].id)
+    with bytes_loaded() as loaded:
+        assert client.get(url).status_code == 200
+    return loaded[0]
+
+
+@pytest.mark.parametrize("path", [
+    "/analytics/job/{job_id}/rankings",
+    "/analytics/job/{job_id}/top-candidates",
+    "/analytics/job/{job_id}/statistics",
+    "/analytics/candidate/{candidate_id}/applications",
+    "/job/",
+])
+def test_bytes_fetched_independent_of_resume_size(client, db, seed, bytes_loaded, path):
+    short = _measure(client, seed, bytes_loaded, SHORT_RESUME, path)
+    long = _measure(client, seed, bytes_loaded, LONG_RESUME, path)
+
+    assert long - short < 1000
+
+
+def test_candidate_detail_still_returns_resume(client, seed):
+    candidate_id = seed(candidates=1, jobs=1, resume_text=LONG_RESUME)["candidates"][0].id
+
+    data = client.get(f"/candidate/{candidate_id}").json()
+
+    assert data["resume_text"] == LONG_RESUME
+    assert len(data["resume_embedding"]) == 384
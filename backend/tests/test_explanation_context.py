@@ -0,0 +1,96 @@
+"""
+Tests for the shared explanation context and the two formats rendered from it
+"""
+import json
+
+from app.services.explanation_agent import explanation_agent, explain_decision
+from app.services.explanation_context import build_explanation_context, expand_explanation
+from app.services.xai_explainability import render_xai_explanation, generate_xai_explanation
+
+
+SCORES = {"rfs": 0.82, "dcs": 0.55, "elc": 0.8, "composite_score": 0.71, "breakdown": {}}
+SKILL_MATCH = {
+    "match_score": 0.55,
+    "match_percentage": 55.0,
+    "matched_skills": ["python", "sql"],
+    "missing_skills": ["django", "docker"],
+    "missing_required": ["django"],
+    "candidate_extras": ["pandas"],
+}
+EXPERIENCE = {"required": 3, "candidate": 3, "gap": 0, "percentage_match": 100.0}
+FRAUD = {"fraud_flag": False, "similarity_index": 0.31}
+SKILL_GAP = {"summary": {"skills_missing": 2}, "gap_breakdown": {"critical_missing": {"skills": ["django"]}}}
+
+
+def _stored_payload():
+    context = build_explanation_context("Selected", SCORES, SKILL_MATCH, EXPERIENCE, FRAUD, SKILL_GAP)
+    return {
+        "context": context.to_dict(),
+        "basic_explanation": explanation_agent.render(context),
+        "xai_explanation": render_xai_explanation(context),
+        "skill_gap_analysis": SKILL_GAP,
+    }
+
+
+def test_expanded_payload_matches_direct_rendering():
+    expanded = expand_explanation(_stored_payload())
+
+    assert expanded["basic_explanation"] == explain_decision("Selected", SCORES, SKILL_MATCH, EXPERIENCE, FRAUD)
+    assert expanded["xai_explanation"] == generate_xai_explanation(
+        "Selected", SCORES, SKILL_MATCH, EXPERIENCE, FRAUD, SKILL_GAP
+    )
+
+
+def test_both_formats_share_decision_and_confidence():
+    expanded = expand_explanation(_stored_payload())
+    basic, xai = expanded["basic_explanation"], expanded["xai_explanation"]
+
+    assert basic["confidence_level"]["label"] == xai["confidence_level"]
+    assert xai["decision"] == "Selected"
+    assert xai["skill_analysis"]["skill_gap_details"] == SKILL_GAP
+
+
+def test_xai_sections_keep_their_own_shape_and_thresholds():
+    xai = expand_explanation(_stored_payload())["xai_explanation"]
+
+    skills = xai["skill_analysis"]
+    assert skills["matched_skills"] == {
+        "count": 2, "skills": ["python", "sql"], "impact": "These skills directly align with job requirements"
+    }
+    assert skills["missing_skills"]["count"] == 2 and "criticality" in skills["missing_skills"]
+    assert skills["additional_skills"]["skills"] == ["pandas"]
+
+    # XAI thresholds: rfs >= 0.75 is a strength, dcs < 0.60 a weakness
+    assert xai["strengths"] == ["Strong resume-role alignment (82.0%)", "Meets experience requirement (3 years)"]
+    assert xai["areas_for_improvement"] == ["Skill gap in technical requirements (55.0%)"]
+    assert [factor["factor"] for factor in xai["key_factors"]] == ["Experience Match", "Strong Semantic Alignment"]
+    assert xai["experience_analysis"]["status"] == "Meets Requirement"
+    assert xai["fraud_check_explanation"]["status"] == "Clean - No fraud detected"
+
+
+def test_payload_without_xai_sections_falls_back_to_shared_ones():
+    stored = _stored_payload()
+    for section in ("key_factors", "strengths", "areas_for_improvement", "skill_analysis",
+                    "experience_analysis", "fraud_check_explanation"):
+        del stored["xai_explanation"][section]
+
+    xai = expand_explanation(stored)["xai_explanation"]
+
+    assert xai["strengths"] == stored["context"]["strengths"]
+    assert xai["skill_analysis"]["matched_skills"] == ["python", "sql"]
+    assert xai["fraud_check_explanation"]["checks_performed"]
+
+
+def test_stored_payload_is_smaller_than_expanded():
+    stored = _stored_payload()
+    expanded = expand_explanation(stored)
+
+    # Only the decision and confidence are shared; each format keeps its own analyses
+    assert len(json.dumps(stored)) < len(json.dumps(expanded))
+
+
+def test_legacy_payload_passes_through():
+    legacy = {"basic_explanation": {"summary": "old"}, "xai_explanation": {"decision": "Selected"}}
+
+    assert expand_explanation(legacy) is legacy
+    assert expand_explanation(None) == {}
@@ -0,0 +1,38 @@
+"""
+Tests for job listings with inline application counts
+"""
+
+
+def test_list_jobs_is_one_query(client, seed, count_queries):
+    seed(candidates=4, jobs=5)
+
+    with count_queries() as statements:
+        data = client.get("/job/", params={"count": "none"}).json()
+
+    assert len(statements) == 1
+    assert [job["application_count"] for job in data["jobs"]] == [4] * 5
+    assert all(job["company_name"].startswith("Company") for job in data["jobs"])
+
+
+def test_list_jobs_query_count_independent_of_page_size(client, seed, count_queries):
+    seed(candidates=2, jobs=2)
+    with count_queries() as few:
+        client.get("/job/")
+
+    seed(candidates=2, jobs=20)
+    with count_queries() as many:
+        client.get("/job/")
+
+    assert len(many) == len(few)
+
+
+def test_get_job_application_count(client, seed, count_queries):
+    job_id = seed(candidates=3, jobs=1)["jobs"][0].id
+    empty_job_id = seed(candidates=0, jobs=1)["jobs"][0].id
+
+    with count_queries() as statements:
+        data = client.get(f"/job/{job_id}").json()
+
+    assert len(statements) == 1
+    assert data["application_count"] == 3
+    assert client.get(f"/job/{empty_job_id}").json()["application_count"] == 0
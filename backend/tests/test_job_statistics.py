@@ -0,0 +1,46 @@
+"""
+Tests for the aggregate-backed job statistics endpoint
+"""
+import statistics
+
+from app.models.application import Application
+
+
+def test_statistics_match_python_aggregates(client, db, seed):
+    rows = seed(candidates=12, jobs=2)
+    job = rows["jobs"][0]
+    apps = db.query(Application).filter(Application.job_id == job.id).all()
+    apps[0].fraud_flag = True
+    db.commit()
+
+    data = client.get(f"/analytics/job/{job.id}/statistics").json()
+    scores = sorted(app.composite_score for app in apps)
+
+    assert data["total_applications"] == len(apps)
+    assert sum(data["decision_breakdown"].values()) == len(apps)
+    assert data["average_scores"]["composite"] == round(sum(scores) / len(scores), 4)
+    assert data["fraud_statistics"]["total_fraud"] == 1
+    assert data["score_percentiles"]["p50"] == round(statistics.median(scores), 4)
+    assert sum(bucket["count"] for bucket in data["score_histogram"]) == len(apps)
+    assert data["top_candidate"]["rank"] == 2
+
+
+def test_statistics_query_count_is_constant(client, seed, count_queries):
+    rows = seed(candidates=2, jobs=1)
+    with count_queries() as few:
+        client.get(f"/analytics/job/{rows['jobs'][0].id}/statistics")
+
+    rows = seed(candidates=25, jobs=1)
+    with count_queries() as many:
+        client.get(f"/analytics/job/{rows['jobs'][0].id}/statistics")
+
+    assert len(many) == len(few)
+
+
+def test_statistics_without_applications(client, seed):
+    job = seed(candidates=0, jobs=1)["jobs"][0]
+
+    assert client.get(f"/analytics/job/{job.id}/statistics").json() == {
+        "job_id": job.id,
+        "message": "No applications yet"
+    }
@@ -0,0 +1,66 @@
+"""
+Tests for the streamed master PDF report
+"""
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+
+from app.services import master_report_data
+from app.services.pdf_report_service import master_report_generator
+
+
+def _text(pdf_bytes):
+    return "\n".join(page.extract_text() for page in PdfReader(BytesIO(pdf_bytes)).pages)
+
+
+def test_master_report_renders_every_batch(client, seed, monkeypatch):
+    seed(candidates=7, jobs=2)
+    monkeypatch.setattr(master_report_data, "REPORT_BATCH_SIZE", 3)
+
+    response = client.get("/analytics/master-report/pdf?limit=7")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    text = _text(response.content)
+    assert "EXECUTIVE SUMMARY" in text
+    for i in range(7):
+        assert f"Candidate {i}" in text
+    # Numbering continues across batches
+    assert "CANDIDATE #7" in text
+
+
+def test_master_report_pages_with_cursor(client, seed):
+    seed(candidates=3, jobs=1)
+
+    first = client.get("/analytics/master-report/pdf?limit=2")
+    assert first.status_code == 200
+    second = client.get(f"/analytics/master-report/pdf?limit=2&cursor={first.headers['x-next-cursor']}")
+
+    assert second.status_code == 200
+    assert "x-next-cursor" not in second.headers
+    assert "Total Candidates: 1" in _text(second.content).replace(":\n", ": ")
+
+
+def test_summary_is_sent_before_candidates_are_loaded():
+    candidate = {
+        "candidate_profile": {"candidate_id": 1, "name": "Streamed Candidate", "email": "s@example.com",
+                              "years_of_experience": 2, "skills": []},
+        "application_summary": {"total_applications": 0, "selected": 0, "rejected": 0, "pending": 0,
+                                "average_composite_score": None, "best_application": None},
+        "applications": []
+    }
+    loaded = []
+
+    def batches():
+        for _ in range(2):
+            loaded.append(True)
+            yield [candidate]
+
+    chunks = master_report_generator.stream_master_report([candidate, candidate], batches())
+    first = next(chunks)
+
+    assert first.startswith(b"%PDF")
+    assert loaded == []
+    pdf = first + b"".join(chunks)
+    assert len(loaded) == 2
+    assert _text(pdf).count("Streamed Candidate") >= 2
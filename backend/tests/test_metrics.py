@@ -0,0 +1,87 @@
+"""
+Tests for the in-process metrics and GET /metrics
+"""
+import pytest
+
+from app.core.metrics import (
+    EMBEDDING_ERRORS_TOTAL, EMBEDDING_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL, PIPELINE_STAGE_SECONDS, Registry
+)
+from app.routes import application_routes
+from app.services import embedding_service
+
+STAGES = ["parse", "skills", "embed", "scoring", "fraud", "explain", "persist", "rank", "audit"]
+
+
+def test_histogram_and_counter_rendering():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    errors = registry.counter("errors_total", "Errors", ("kind",))
+
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+    errors.inc(kind='quote " and \\ slash')
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+    assert 'errors_total{kind="quote \\" and \\\\ slash"} 1' in lines
+
+
+def test_requests_are_labelled_by_route_template(client):
+    labels = {"method": "GET", "route": "/analytics/job/{job_id}/rankings", "status": 404}
+    before = HTTP_REQUESTS_TOTAL.value(**labels)
+
+    assert client.get("/analytics/job/999999/rankings").status_code == 404
+    client.get("/no/such/path")
+
+    assert HTTP_REQUESTS_TOTAL.value(**labels) == before + 1
+    assert HTTP_REQUESTS_TOTAL.value(method="GET", route="<unmatched>", status=404) >= 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/analytics/job/{job_id}/rankings"}' in body
+    for family in ("db_pool_connections", "db_pool_timeouts_total", "audit_buffer_events",
+                   "report_jobs_in_flight", "cache_hit_ratio", "pipeline_stage_duration_seconds"):
+        assert f"# TYPE {family} " in body
+    assert 'db_pool_connections{pool="sync",state="idle"}' in body
+    assert 'cache_hits_total{cache="report_fragment"}' in body
+
+
+def test_pipeline_stages_are_timed(client, seed, monkeypatch):
+    company = seed(candidates=1, jobs=1)["companies"][0]
+    monkeypatch.setattr(application_routes, "get_embedding", lambda text: [0.3] * 384)
+    monkeypatch.setattr(application_routes, "parse_resume_pdf",
+                        lambda content: {"success": True, "resume_text": "Python and SQL developer"})
+    before = {stage: PIPELINE_STAGE_SECONDS.count(stage=stage) for stage in STAGES}
+
+    response = client.post(f"/apply/{company.id}", data={
+        "name": "Timed", "email": "timed@example.com", "mobile": "1", "experience": 3,
+    }, files={"resume_pdf": ("cv.pdf", b"%PDF-1.4", "application/pdf")})
+
+    assert response.status_code == 200
+    assert {stage: PIPELINE_STAGE_SECONDS.count(stage=stage) - before[stage] for stage in STAGES} == {
+        stage: 1 for stage in STAGES
+    }
+
+
+def test_embedding_provider_errors_are_counted(monkeypatch):
+    class FailingClient:
+        def feature_extraction(self, text, model):
+            raise ConnectionError("provider down")
+
+    monkeypatch.setattr(embedding_service, "get_client", lambda: FailingClient())
+    errors = EMBEDDING_ERRORS_TOTAL.value()
+    timed = EMBEDDING_REQUEST_SECONDS.count(outcome="error")
+
+    with pytest.raises(Exception, match="provider down"):
+        embedding_service.get_embedding("some text")
+
+    assert EMBEDDING_ERRORS_TOTAL.value() == errors + 1
+    assert EMBEDDING_REQUEST_SECONDS.count(outcome="error") == timed + 1
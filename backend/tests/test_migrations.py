@@ -0,0 +1,49 @@
+"""
+The Alembic history must build exactly the schema the models describe
+"""
+import os
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA = "migrations_check"
+
+
+def test_upgrade_head_matches_models(db_engine):
+    from app.database import Base
+    from app.services.audit_partitions import is_partition_table
+
+    engine = create_engine(db_engine.url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with db_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    try:
+        config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+        config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+
+        with engine.connect() as conn:
+            config.attributes["connection"] = conn
+            command.upgrade(config, "head")
+            conn.commit()
+
+        with engine.connect() as conn:
+            context = MigrationContext.configure(conn, opts={
+                "include_name": lambda name, type_, parents: not (type_ == "table" and is_partition_table(name))
+            })
+            diff = compare_metadata(context, Base.metadata)
+
+        assert diff == []
+
+        with engine.connect() as conn:
+            config.attributes["connection"] = conn
+            command.downgrade(config, "base")
+            conn.commit()
+    finally:
+        engine.dispose()
+        with db_engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
@@ -0,0 +1,67 @@
+"""
+Tests for keyset (cursor) pagination on the list endpoints
+"""
+import pytest
+
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def _walk(client, url, key, limit):
+    """Follow next_cursor until the last page and return every row served"""
+    rows, cursor = [], None
+    while True:
+        params = {"limit": limit, "count": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get(url, params=params).json()
+        rows.extend(data[key])
+        cursor = data["next_cursor"]
+        if not cursor:
+            return rows
+
+
+def test_cursor_round_trip():
+    from datetime import datetime
+
+    position = (datetime(2024, 5, 1, 12, 30, 15, 123456), 42)
+    assert decode_cursor(encode_cursor(*position)) == position
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.parametrize("url,key", [
+    ("/candidate/", "candidates"),
+    ("/apply/", "applications"),
+    ("/job/", "jobs"),
+    ("/candidate/master/all", "candidates"),
+])
+def test_cursor_walk_matches_offset_order(client, seed, url, key):
+    seed(candidates=7, jobs=3)
+
+    everything = client.get(url, params={"limit": 100}).json()[key]
+    walked = _walk(client, url, key, limit=2)
+
+    assert walked == everything
+
+
+def test_deep_page_uses_keyset_filter(client, seed, count_queries):
+    seed(candidates=6, jobs=1)
+    first = client.get("/candidate/", params={"limit": 2, "count": "none"}).json()
+
+    with count_queries() as statements:
+        client.get("/candidate/", params={"limit": 2, "count": "none", "cursor": first["next_cursor"]})
+
+    page_query = statements[-1]
+    assert "OFFSET" not in page_query
+    assert "(candidates.created_at, candidates.id) <" in page_query
+
+
+def test_count_modes(client, seed):
+    seed(candidates=5, jobs=1)
+
+    assert client.get("/candidate/", params={"count": "exact"}).json()["total"] == 5
+    assert isinstance(client.get("/candidate/", params={"count": "approximate"}).json()["total"], int)
+    assert client.get("/candidate/", params={"count": "none"}).json()["total"] is None
+    assert client.get("/candidate/", params={"count": "bogus"}).status_code == 400
+    assert client.get("/candidate/", params={"cursor": "bogus"}).status_code == 400
@@ -0,0 +1,67 @@
+"""
+Tests for the startup prewarm and /health readiness
+"""
+import asyncio
+import time
+
+from app.config import PREWARM_DB_CONNECTIONS
+from app.core.db_pool import pool_status
+from app.core.prewarm import Prewarmer, prewarmer
+from app.database import engine
+from app.services.inference_engine import compile_skill_matchers, extract_skills_from_text
+
+
+def _wait_until_healthy(client, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/health")
+        if response.status_code == 200 or time.monotonic() > deadline:
+            return response
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+        time.sleep(0.05)
+
+
+def test_health_reports_ready_once_warm(client, monkeypatch):
+    response = _wait_until_healthy(client)
+    assert response.status_code == 200
+    steps = response.json()["prewarm"]["steps"]
+    assert list(steps) == ["skill_matchers", "similarity", "db_pool", "embedding_provider"]
+    assert all(step["status"] == "done" for step in steps.values())
+
+    status = pool_status(engine)
+    assert status["idle"] + status["in_use"] >= min(PREWARM_DB_CONNECTIONS, engine.pool.size())
+
+    monkeypatch.setattr(prewarmer, "ready", False)
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_steps_run_in_order_and_failures_do_not_block_readiness():
+    calls = []
+
+    async def failing():
+        calls.append("failing")
+        raise RuntimeError("provider unreachable")
+
+    warmer = Prewarmer(steps=[
+        ("first", lambda: calls.append("first")),
+        ("failing", failing),
+        ("last", lambda: calls.append("last")),
+    ], enabled=True)
+    assert not warmer.ready
+
+    asyncio.run(warmer.run())
+
+    assert calls == ["first", "failing", "last"]
+    assert warmer.ready
+    assert warmer.results["failing"] == {"status": "failed", "error": "provider unreachable"}
+    assert warmer.results["last"]["status"] == "done"
+    assert Prewarmer(steps=[], enabled=False).ready
+
+
+def test_skill_matchers_are_compiled_once():
+    assert compile_skill_matchers() is compile_skill_matchers()
+    skills = extract_skills_from_text("Built REST APIs in Python and PostgreSQL; strong communication")
+    assert {"python", "communication"} <= set(skills["all_skills"])
@@ -0,0 +1,118 @@
+"""
+Tests for the opt-in request profiler and the admin profile endpoints
+"""
+import re
+import threading
+import time
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.core.profiler import ProfileStore, ProfilerMiddleware, StackSampler, profile_store
+
+ADMIN = {"X-Admin-Token": "secret"}
+COLLAPSED_LINE = re.compile(r"^\S.*;.* \d+$")
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return total
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(dependencies, "ADMIN_TOKEN", "secret")
+
+
+def _profiled_app(tmp_path, sample_rate=0.0):
+    app = FastAPI()
+
+    @app.get("/slow")
+    def slow():
+        return {"total": busy_work(0.2)}
+
+    return TestClient(ProfilerMiddleware(app, sample_rate=sample_rate, store=ProfileStore(str(tmp_path))))
+
+
+def test_admin_header_profiles_one_request(tmp_path, admin_token):
+    client = _profiled_app(tmp_path)
+
+    assert "x-profile-id" not in client.get("/slow").headers
+    assert "x-profile-id" not in client.get("/slow", headers={"X-Profile": "1", "X-Admin-Token": "wrong"}).headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get("/slow", headers={"X-Profile": "1", **ADMIN})
+    profile_id = response.headers["x-profile-id"]
+
+    lines = (tmp_path / f"{profile_id}.collapsed").read_text().splitlines()
+    assert lines and all(COLLAPSED_LINE.match(line) for line in lines)
+    busy_samples = sum(int(line.rsplit(" ", 1)[1]) for line in lines if "busy_work (" in line)
+    assert busy_samples >= 10
+
+    [meta] = ProfileStore(str(tmp_path)).list()
+    assert meta["profile_id"] == profile_id
+    assert meta["path"] == "/slow" and meta["status"] == 200
+    assert meta["duration_ms"] >= 200 and meta["samples"] >= busy_samples
+
+
+def test_sample_rate_profiles_without_header(tmp_path):
+    client = _profiled_app(tmp_path, sample_rate=1.0)
+    assert client.get("/slow").headers["x-profile-id"]
+
+
+def test_idle_threads_are_not_sampled():
+    sampler = StackSampler()
+    sampler.sample()
+    assert not any(stack.endswith("wait (threading.py)") for stack in sampler.stacks)
+    assert any("test_idle_threads_are_not_sampled (" in stack for stack in sampler.stacks)
+
+
+def test_profiles_are_listed_and_downloaded_by_admins(client, tmp_path, monkeypatch, admin_token):
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    monkeypatch.setattr(profile_store, "max_files", 2)
+    for n, profile_id in enumerate(["a" * 32, "b" * 32, "c" * 32]):
+        profile_store.save(profile_id, Counter({f"MainThread;handler;step{n}": 3}),
+                           {"method": "GET", "path": "/x", "started_at": f"2026-01-0{n + 1}T00:00:00"})
+
+    assert client.get("/admin/profiles").status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    listing = client.get("/admin/profiles", headers=ADMIN).json()
+    assert [p["profile_id"] for p in listing["profiles"]] == ["c" * 32, "b" * 32]  # oldest pruned
+
+    download = client.get(f"/admin/profiles/{'c' * 32}", headers=ADMIN)
+    assert download.status_code == 200
+    assert download.text == "MainThread;handler;step2 3\n"
+    assert client.get(f"/admin/profiles/{'a' * 32}", headers=ADMIN).status_code == 404
+    assert client.get("/admin/profiles/..%2Fsecrets", headers=ADMIN).status_code == 404
+
+
+def test_middleware_is_not_installed_when_profiling_is_off():
+    from app.main import app
+    assert ProfilerMiddleware not in [middleware.cls for middleware in app.user_middleware]
+
+
+def test_sampler_join_and_save_run_off_the_event_loop(tmp_path, admin_token, monkeypatch):
+    client = _profiled_app(tmp_path)
+    middleware = client.app
+    request_threads, blocking_threads = [], []
+
+    @middleware.app.get("/thread")
+    async def thread_name():
+        request_threads.append(threading.get_ident())
+        return {}
+
+    save, stop = middleware.store.save, StackSampler.stop
+    monkeypatch.setattr(middleware.store, "save", lambda *args: blocking_threads.append(threading.get_ident()) or save(*args))
+    monkeypatch.setattr(StackSampler, "stop", lambda self: blocking_threads.append(threading.get_ident()) or stop(self))
+
+    response = client.get("/thread", headers={"X-Profile": "1", **ADMIN})
+
+    assert response.status_code == 200 and len(blocking_threads) == 2
+    assert request_threads[0] not in blocking_threads
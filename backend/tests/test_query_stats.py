@@ -0,0 +1,86 @@
+"""
+Tests for per-request query statistics, query budgets and the slow query log
+"""
+import pytest
+from sqlalchemy import text
+
+from app.core import query_stats
+from app.models.application import Application
+
+# Statement budgets per endpoint; seeded with enough candidates that an N+1
+# pattern would exceed them
+QUERY_BUDGETS = {
+    "/analytics/application/{application_id}/skill-gap": 4,
+    "/analytics/job/{job_id}/rankings": 2,
+    "/analytics/job/{job_id}/statistics": 5,
+    "/analytics/job/{job_id}/top-candidates": 3,
+    "/analytics/candidate/{candidate_id}/applications": 2,
+    "/analytics/candidates/dashboard": 2,
+    "/apply/{application_id}": 5,
+    "/apply/{application_id}/history": 2,
+    "/apply/": 3,
+    "/candidate/{candidate_id}": 1,
+    "/candidate/{candidate_id}/applications": 3,
+    "/candidate/{candidate_id}/history": 2,
+    "/candidate/{candidate_id}/master": 5,
+    "/candidate/master/all": 6,
+    "/candidate/": 2,
+    "/job/{job_id}": 1,
+    "/job/{company_id}/applications": 5,
+    "/job/": 2,
+}
+
+
+@pytest.fixture
+def seeded(db, seed):
+    data = seed(candidates=8, jobs=2)
+    candidate_id = data["candidates"][0].id
+    return {
+        "job_id": data["jobs"][0].id,
+        "company_id": data["companies"][0].id,
+        "candidate_id": candidate_id,
+        "application_id": db.query(Application.id).filter(Application.candidate_id == candidate_id).first()[0],
+    }
+
+
+@pytest.mark.parametrize("route,budget", QUERY_BUDGETS.items())
+def test_endpoint_query_budget(client, seeded, assert_max_queries, route, budget):
+    response = client.get(route.format(**seeded))
+    assert response.status_code == 200
+    assert_max_queries(response, budget)
+
+
+def test_headers_count_only_this_requests_statements(client, seed, count_queries):
+    seed(candidates=2, jobs=1)
+
+    with count_queries() as statements:
+        response = client.get("/job/")
+
+    assert int(response.headers["x-db-query-count"]) == len(statements) == 2
+    assert float(response.headers["x-db-time-ms"]) > 0
+    assert int(client.get("/health").headers["x-db-query-count"]) == 0
+
+    metrics = client.get("/metrics").text
+    assert 'db_queries_per_request_bucket{route="/job/",le="2.0"}' in metrics
+    assert 'db_time_per_request_seconds_count{route="/job/"}' in metrics
+
+
+def test_slow_queries_are_logged_without_parameter_values(client, db, seed, monkeypatch, capsys):
+    seed(candidates=1, jobs=1)
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+
+    db.execute(text("SELECT :secret"), {"secret": "hunter2"}).scalar()
+    client.get("/candidate/search/by-email", params={"email": "someone@example.com"})
+
+    log = capsys.readouterr().out
+    assert "[SQL] Slow query" in log
+    assert "SELECT %(secret)s | parameters: {'secret': 'str'}" in log
+    assert "in GET /candidate/search/by-email" in log
+    assert "hunter2" not in log and "someone@example.com" not in log
+
+
+def test_redact_parameters():
+    assert query_stats.redact_parameters({"id": 1, "name": "x"}) == "{'id': 'int', 'name': 'str'}"
+    assert query_stats.redact_parameters((1, None)) == "['int', 'NoneType']"
+    assert query_stats.redact_parameters([{"id": 1}, {"id": 2}], executemany=True) == "<2 parameter sets>"
+    assert query_stats.redact_parameters(None) == "none"
@@ -0,0 +1,102 @@
+"""
+Tests for the per-candidate report fragment cache
+"""
+import os
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+
+from app.routes import analytics_routes
+from app.services.master_report_data import fragment_hashes
+from app.services.report_fragments import FragmentCache, fragment_cache
+
+
+def _text(pdf_bytes):
+    return "\n".join(page.extract_text() for page in PdfReader(BytesIO(pdf_bytes)).pages)
+
+
+def _report(client):
+    response = client.get("/analytics/master-report/pdf?limit=10")
+    assert response.status_code == 200
+    return _text(response.content)
+
+
+def test_only_changed_candidates_are_rendered_again(client, db, seed, monkeypatch):
+    candidates = seed(candidates=3, jobs=1)["candidates"]
+    loaded = []
+    load = analytics_routes.report_batches
+
+    def recording_batches(candidate_ids):
+        loaded.append(list(candidate_ids))
+        return load(candidate_ids)
+
+    monkeypatch.setattr(analytics_routes, "report_batches", recording_batches)
+
+    first = _report(client)
+    assert sorted(loaded.pop()) == sorted(c.id for c in candidates)
+
+    assert _report(client) == first
+    assert loaded == []
+
+    changed = candidates[1]
+    for application in changed.applications:
+        application.decision = "Rejected"
+        application.decision_reason = "Changed"
+    db.commit()
+
+    third = _report(client)
+    assert loaded == [[changed.id]]
+    assert "Changed" in third and "Changed" not in first
+
+
+def test_positions_are_stamped_when_the_report_is_assembled(client, seed):
+    seed(candidates=2, jobs=1)
+    before = _report(client)
+    assert "CANDIDATE #1" in before and "CANDIDATE #2" in before and "CANDIDATE #3" not in before
+
+    seed(candidates=1, jobs=1)  # newest first: shifts the cached candidates down
+    after = _report(client)
+    assert "CANDIDATE #3" in after
+    assert fragment_cache.stats()["hits"] >= 2
+
+
+def test_hash_covers_related_rows(db, seed):
+    seeded = seed(candidates=2, jobs=1)
+    ids = [c.id for c in seeded["candidates"]]
+    before = fragment_hashes(db, ids)
+
+    seeded["companies"][0].name = "Renamed"
+    db.commit()
+    after = fragment_hashes(db, ids)
+
+    assert set(before) == set(ids)
+    assert all(before[i] != after[i] for i in ids)
+    assert fragment_hashes(db, [ids[0], -1]) == {ids[0]: after[ids[0]]}
+
+    application = seeded["candidates"][0].applications[0]
+    application.explanation = {"skill_gap_analysis": {"summary": {"changed": True}}}
+    db.commit()
+    edited = fragment_hashes(db, ids)
+    assert edited[ids[0]] != after[ids[0]]
+    assert edited[ids[1]] == after[ids[1]]
+
+
+def test_cache_replaces_old_versions_and_prunes_least_recently_used(tmp_path):
+    cache = FragmentCache(directory=str(tmp_path), max_mb=1)
+
+    def write(size):
+        return lambda output: output.write(b"%" * size)
+
+    cache.store(1, "old", write(10)).close()
+    cache.store(1, "new", write(10)).close()
+    assert sorted(os.listdir(tmp_path)) == ["1-new.pdf"]
+    assert cache.open(1, "old") is None
+
+    cache.store(2, "a", write(10)).close()
+    cache.store(3, "a", write(10)).close()
+    os.utime(tmp_path / "1-new.pdf", (0, 0))
+    cache.open(2, "a").close()  # touched: most recently used
+
+    cache.max_bytes = 20
+    assert cache.prune() == 1
+    assert sorted(os.listdir(tmp_path)) == ["2-a.pdf", "3-a.pdf"]
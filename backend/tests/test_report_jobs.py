@@ -0,0 +1,108 @@
+"""
+Tests for background master report jobs
+"""
+from io import BytesIO
+
+import pytest
+from PyPDF2 import PdfReader
+
+from app.services.report_jobs import data_fingerprint, report_job_runner
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_job_runner, "storage_dir", str(tmp_path))
+    return tmp_path
+
+
+def _run(client, **params):
+    response = client.post("/analytics/reports", json=params)
+    assert response.status_code == 202
+    report_job_runner.wait(timeout=60)
+    return response.json()
+
+
+def test_report_is_generated_and_downloaded(client, seed, storage):
+    seed(candidates=3, jobs=1)
+
+    job = _run(client, limit=2)
+    assert job["status"] == "queued" and not job["deduplicated"]
+
+    status = client.get(job["status_url"]).json()
+    assert status["status"] == "completed"
+    assert status["candidate_count"] == 2
+    assert status["file_url"] == f"/analytics/reports/{job['report_id']}/file"
+
+    download = client.get(status["file_url"])
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/pdf"
+    assert download.headers["x-next-cursor"] == status["next_cursor"]
+    assert int(download.headers["content-length"]) == status["file_size"]
+    text = "\n".join(page.extract_text() for page in PdfReader(BytesIO(download.content)).pages)
+    assert "Candidate 2" in text and "Candidate 1" in text
+    assert "Candidate 0" not in text
+
+
+def test_identical_requests_share_a_job_until_data_changes(client, seed, storage):
+    seed(candidates=2, jobs=1)
+    first = _run(client, limit=5)
+
+    again = client.post("/analytics/reports", json={"limit": 5})
+    assert again.json()["report_id"] == first["report_id"]
+    assert again.json()["deduplicated"] is True
+    assert again.json()["status"] == "completed"
+
+    other_params = _run(client, limit=1)
+    assert other_params["report_id"] != first["report_id"]
+
+    seed(candidates=1, jobs=1)
+    refreshed = _run(client, limit=5)
+    assert refreshed["report_id"] != first["report_id"]
+    assert client.get(f"/analytics/reports/{refreshed['report_id']}").json()["candidate_count"] == 3
+
+    # The artifact built from older data is gone once the new one exists
+    assert client.get(f"/analytics/reports/{first['report_id']}").json()["status"] == "expired"
+    assert client.get(f"/analytics/reports/{first['report_id']}/file").status_code == 410
+    assert client.get(f"/analytics/reports/{other_params['report_id']}/file").status_code == 200
+    assert sorted(path.name for path in storage.glob("*.pdf")) == sorted(
+        f"{job['report_id']}.pdf" for job in (other_params, refreshed)
+    )
+
+
+def test_edits_to_any_report_table_change_the_fingerprint(client, db, seed, storage):
+    rows = seed(candidates=2, jobs=1)
+    first = _run(client, limit=5)
+
+    rows["companies"][0].name = "Renamed Company"
+    db.commit()
+    renamed = _run(client, limit=5)
+    assert renamed["report_id"] != first["report_id"]
+    assert not renamed["deduplicated"]
+
+    before = data_fingerprint(db)
+    rows["jobs"][0].role = "Staff Engineer"
+    db.commit()
+    assert data_fingerprint(db) != before
+
+    before = data_fingerprint(db)
+    application = rows["candidates"][0].applications[0]
+    application.rank = 7
+    db.commit()
+    assert data_fingerprint(db) != before
+
+    before = data_fingerprint(db)
+    application.skill_match = {"matched_skills": [], "missing_skills": ["python"], "match_score": 0.0}
+    db.commit()
+    assert data_fingerprint(db) != before
+
+
+def test_failed_and_unknown_reports(client, db, storage):
+    job = _run(client, limit=5)  # no candidates at all
+
+    status = client.get(job["status_url"]).json()
+    assert status["status"] == "failed"
+    assert status["error"] == "No candidates found"
+    assert client.get(f"{job['status_url']}/file").status_code == 409
+
+    assert client.get("/analytics/reports/missing").status_code == 404
+    assert client.post("/analytics/reports", json={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,33 @@
+"""
+Tests for the compressed msgpack payload encoding
+"""
+from datetime import datetime
+
+import numpy as np
+
+from app.utils.serialization import pack, unpack
+
+
+def test_numpy_values_round_trip_as_plain_python():
+    payload = {
+        "embedding": np.array([0.25, 0.5, 0.75]),
+        "matrix": np.array([[1, 2], [3, 4]]),
+        "score": np.float64(0.8),
+        "count": np.int64(3),
+        "flag": np.bool_(True),
+    }
+
+    assert unpack(pack(payload)) == {
+        "embedding": [0.25, 0.5, 0.75],
+        "matrix": [[1, 2], [3, 4]],
+        "score": 0.8,
+        "count": 3,
+        "flag": True,
+    }
+
+
+def test_sets_tuples_and_dates():
+    when = datetime(2026, 1, 2, 3, 4, 5)
+    assert unpack(pack({"skills": {"python"}, "pair": (1, 2), "at": when})) == {
+        "skills": ["python"], "pair": [1, 2], "at": when.isoformat()
+    }
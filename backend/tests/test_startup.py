@@ -0,0 +1,41 @@
+"""
+Tests for worker startup cost
+
+Each check imports the app in a fresh interpreter, as a new worker would.
+STARTUP_IMPORT_BUDGET_SECONDS overrides the import time budget on slow machines.
+"""
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["reportlab", "matplotlib", "huggingface_hub", "PyPDF2", "numpy", "requests"]
+
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "3.0"))
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_app():
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import app.main\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BACKEND_DIR, env=os.environ.copy(),
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_load_on_first_use():
+    modules = _import_app()["modules"]
+    assert [m for m in HEAVY_MODULES if m in modules] == []
+
+
+def test_import_time_within_budget():
+    best = min(_import_app()["seconds"] for _ in range(2))
+    assert best < IMPORT_BUDGET_SECONDS, f"import app.main took {best:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"